@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark crawl frontier operations without any network I/O
+
+Usage:
+    python benchmarks/bench_frontier.py [--urls N]
+
+Measures URL normalization, push/pop throughput and memory of the seen-URL
+sets (plain set of strings, HashedSeenSet and BloomFilter).
+"""
+
+import argparse
+import pathlib
+import sys
+import time
+import tracemalloc
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+from src.frontier import BloomFilter, CrawlFrontier, HashedSeenSet, normalize_url
+
+
+def synthetic_urls(count: int):
+    """Generate URLs spread over a few hosts with some duplicates"""
+    for i in range(count):
+        yield f"https://host{i % 50}.example.com/category/{i % 1000}/item/{i}?page={i % 7}#reviews"
+
+
+def measure_memory(factory, count):
+    """Return bytes retained after filling a seen set with freshly built URLs"""
+    tracemalloc.start()
+    seen = factory()
+    for url in synthetic_urls(count):
+        seen.add(normalize_url(url))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--urls', type=int, default=200000, help='Number of synthetic URLs')
+    args = parser.parse_args()
+
+    urls = list(synthetic_urls(args.urls))
+
+    start = time.perf_counter()
+    for url in urls:
+        normalize_url(url)
+    elapsed = time.perf_counter() - start
+    print(f"normalize_url:      {len(urls) / elapsed:>12,.0f} URLs/s")
+
+    for name, factory in [('HashedSeenSet', HashedSeenSet),
+                          ('BloomFilter', lambda: BloomFilter(args.urls, 0.001))]:
+        frontier = CrawlFrontier(factory(), max_depth=10)
+
+        start = time.perf_counter()
+        for i, url in enumerate(urls):
+            frontier.push(url, depth=i % 5)
+        push_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        while frontier.pop() is not None:
+            pass
+        pop_elapsed = time.perf_counter() - start
+
+        print(f"push ({name}): {len(urls) / push_elapsed:>12,.0f} URLs/s")
+        print(f"pop  ({name}): {len(urls) / pop_elapsed:>12,.0f} URLs/s")
+
+    print()
+    for name, factory in [('set[str]', set),
+                          ('HashedSeenSet', HashedSeenSet),
+                          ('BloomFilter', lambda: BloomFilter(args.urls, 0.001))]:
+        size = measure_memory(factory, args.urls)
+        print(f"memory {name:<14} {size / 1024 / 1024:>8.1f} MB  ({size / args.urls:.1f} B/URL)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Measure package import time with `python -X importtime` against a budget
+
+Usage:
+    python benchmarks/bench_import.py [--runs N] [--light-budget-ms N] [--scraper-budget-ms N]
+
+Each statement runs in fresh interpreters; the reported time is the median of
+the summed top-level cumulative import times (interpreter startup itself is
+excluded). Also lists the slowest imports of the last run and which heavy
+dependencies got loaded. Exits with status 1 if a budget is exceeded or a
+statement loads a heavy module it does not need, so it can guard against
+regressions in CI.
+"""
+
+import argparse
+import pathlib
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = pathlib.Path(__file__).parent.parent
+
+_LINE_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+# Modules that should only be loaded when their feature is used
+HEAVY_MODULES = ('requests', 'bs4', 'soupsieve', 'lxml', 'aiohttp', 'asyncio', 'sqlite3', 'xml.etree', 'mmap')
+
+
+def measure(statement: str, startup: frozenset = frozenset()):
+    """
+    Import statement in a fresh interpreter
+
+    Args:
+        statement: Python statement to run
+        startup: Modules imported by interpreter startup, excluded from the result
+
+    Returns:
+        Tuple of (total microseconds, list of (cumulative us, module), loaded module names)
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            capture_output=True, text=True, cwd=ROOT, check=True)
+    total = 0
+    modules = []
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), len(match.group(3)), match.group(4)
+        if name in startup:
+            continue
+        modules.append((cumulative, name))
+        if indent == 1:
+            total += cumulative
+    return total, modules, {name for _, name in modules}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=7, help='Interpreters per statement')
+    parser.add_argument('--light-budget-ms', type=float, default=30,
+                        help='Budget for `from src import Config` / `ScraperLogger`')
+    parser.add_argument('--scraper-budget-ms', type=float, default=150,
+                        help='Budget for `from src import WebScraper`')
+    parser.add_argument('--top', type=int, default=8, help='Slowest imports to list')
+    args = parser.parse_args()
+
+    # Statement, budget, heavy modules it may load
+    targets = [
+        ('from src import Config', args.light_budget_ms, ()),
+        ('from src import ScraperLogger', args.light_budget_ms, ()),
+        ('from src import WebScraper', args.scraper_budget_ms, ('requests',)),
+    ]
+
+    _, _, startup = measure('pass')
+    startup = frozenset(startup)
+
+    failed = False
+    for statement, budget_ms, allowed in targets:
+        measure(statement)  # Warm the bytecode and filesystem caches
+        runs = [measure(statement, startup) for _ in range(args.runs)]
+        median_ms = statistics.median(total for total, _, _ in runs) / 1000
+        _, modules, loaded = runs[-1]
+
+        heavy = [name for name in HEAVY_MODULES if name in loaded]
+        unexpected = [name for name in heavy if name not in allowed]
+
+        status = 'ok' if median_ms <= budget_ms else 'OVER BUDGET'
+        if unexpected:
+            status += ', UNEXPECTED HEAVY IMPORTS'
+        failed |= median_ms > budget_ms or bool(unexpected)
+
+        print(f"{statement:<32} {median_ms:7.1f} ms  (budget {budget_ms:.0f} ms)  {status}")
+        print(f"    heavy dependencies loaded: {', '.join(heavy) or 'none'}")
+        if unexpected:
+            print(f"    should be deferred: {', '.join(unexpected)}")
+        for cumulative, name in sorted(modules, reverse=True)[:args.top]:
+            print(f"    {cumulative / 1000:7.1f} ms  {name}")
+        print()
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark log-call overhead under concurrent scraping
+
+Usage:
+    python benchmarks/bench_logging.py [--threads N] [--messages N]
+
+Compares a logger writing directly to a FileHandler (the old per-scraper
+setup) with ScraperLogger's shared QueueHandler pipeline. Reported times are
+what the calling (scraping) thread pays per log call.
+"""
+
+import argparse
+import json
+import logging
+import pathlib
+import sys
+import tempfile
+import threading
+import time
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+from src.config import Config
+from src.logger import ScraperLogger
+
+
+def run_threads(logger: logging.Logger, threads: int, messages: int) -> float:
+    """Log from several threads at once, return seconds per call"""
+    barrier = threading.Barrier(threads)
+    durations = []
+
+    def work():
+        barrier.wait()
+        start = time.perf_counter()
+        for i in range(messages):
+            logger.info(f"Attempt {i % 3 + 1}/3 for https://example.com/page/{i}")
+        durations.append(time.perf_counter() - start)
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return sum(durations) / (threads * messages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=16, help='Concurrent logging threads')
+    parser.add_argument('--messages', type=int, default=5000, help='Messages per thread')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        direct = logging.getLogger('bench_direct')
+        direct.setLevel(logging.INFO)
+        direct.propagate = False
+        handler = logging.FileHandler(f"{tmp}/direct.log", encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        direct.addHandler(handler)
+        direct_cost = run_threads(direct, args.threads, args.messages)
+        handler.close()
+
+        config_path = f"{tmp}/config.json"
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump({"logging": {"level": "INFO", "console_output": False,
+                                   "file_path": f"{tmp}/queued.log", "max_file_size_mb": 10}}, f)
+        queued = ScraperLogger('bench_queued', Config(config_path)).get_logger()
+        queued.propagate = False
+        queued_cost = run_threads(queued, args.threads, args.messages)
+
+        start = time.perf_counter()
+        ScraperLogger.shutdown()
+        drain = time.perf_counter() - start
+
+    print(f"{args.threads} threads x {args.messages} messages\n")
+    print(f"direct FileHandler:   {direct_cost * 1e6:8.2f} us/call")
+    print(f"QueueHandler:         {queued_cost * 1e6:8.2f} us/call")
+    print(f"listener drain time:  {drain * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
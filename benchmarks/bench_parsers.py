@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark title parser backends on a corpus of saved HTML pages
+
+Usage:
+    python benchmarks/bench_parsers.py [corpus_dir] [--repeat N]
+
+Without corpus_dir, a synthetic corpus of small, medium and large pages is used.
+"""
+
+import argparse
+import pathlib
+import sys
+import time
+from typing import Dict, List
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+from src.parsers import TITLE_PARSERS, resolve_title_parser
+
+
+def synthetic_corpus() -> Dict[str, str]:
+    """Build pages of increasing size with a title in the head"""
+    paragraph = '<div class="quote"><span class="text">“A quote &amp; more”</span>' \
+                '<a href="/author/x">author</a><a class="tag" href="/tag/y">tag</a></div>\n'
+    corpus = {}
+    for name, repeat in [('small', 20), ('medium', 500), ('large', 10000)]:
+        corpus[name] = ('<!DOCTYPE html><html><head><meta charset="utf-8">'
+                        f'<title>Synthetic {name} page</title>'
+                        '<link rel="stylesheet" href="/static/main.css"></head><body>'
+                        + paragraph * repeat + '</body></html>')
+    return corpus
+
+
+def load_corpus(directory: str) -> Dict[str, str]:
+    """Load all *.html files from a directory"""
+    corpus = {}
+    for path in sorted(pathlib.Path(directory).glob('*.html')):
+        corpus[path.name] = path.read_text(encoding='utf-8', errors='replace')
+    if not corpus:
+        raise SystemExit(f"No .html files found in {directory}")
+    return corpus
+
+
+def bench(corpus: Dict[str, str], repeat: int) -> List[dict]:
+    """Time every available backend on every page"""
+    results = []
+    reference = {name: resolve_title_parser('html.parser')[1](html) for name, html in corpus.items()}
+
+    for requested in TITLE_PARSERS:
+        name, parse = resolve_title_parser(requested)
+        if name != requested:
+            print(f"Skipping {requested}: not installed")
+            continue
+
+        mismatches = sum(1 for page, html in corpus.items() if parse(html) != reference[page])
+        total_bytes = sum(len(html) for html in corpus.values()) * repeat
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for html in corpus.values():
+                parse(html)
+        elapsed = time.perf_counter() - start
+
+        pages = len(corpus) * repeat
+        results.append({
+            'parser': name,
+            'ms_per_page': elapsed / pages * 1000,
+            'mb_per_sec': total_bytes / elapsed / 1e6,
+            'mismatches': mismatches,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus_dir', nargs='?', help='Directory with saved .html pages')
+    parser.add_argument('--repeat', type=int, default=5, help='Passes over the corpus')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus_dir) if args.corpus_dir else synthetic_corpus()
+    size_kb = sum(len(html) for html in corpus.values()) / 1024
+    print(f"Corpus: {len(corpus)} pages, {size_kb:.0f} KB, {args.repeat} passes\n")
+
+    results = bench(corpus, args.repeat)
+    baseline = next((r['ms_per_page'] for r in results if r['parser'] == 'html.parser'), None)
+
+    print(f"{'parser':<12} {'ms/page':>10} {'MB/s':>10} {'speedup':>9} {'mismatch':>9}")
+    for r in results:
+        speedup = f"{baseline / r['ms_per_page']:.1f}x" if baseline else '-'
+        print(f"{r['parser']:<12} {r['ms_per_page']:>10.3f} {r['mb_per_sec']:>10.1f} "
+              f"{speedup:>9} {r['mismatches']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+End-to-end WebScraper benchmark against a local HTTP server, fully offline
+
+Usage:
+    python benchmarks/bench_scraper.py [--pages N] [--workers N] [--latency-ms N]
+                                       [--page-kb N] [--error-rate F]
+                                       [--rate-limit-rate F] [--scenarios NAME ...]
+                                       [--output results.json] [--compare old.json]
+
+Drives the single (check_website), batch (check_many) and streaming
+(check_many with scraping.stream_title) paths against bench_server.py and
+reports pages/sec, p50/p99 latency per URL (including retries) and peak RSS.
+Each scenario runs in a fresh process so peak RSS is not carried over, and the
+server runs in its own process so it does not count against the client.
+Results are written as JSON; --compare prints the change against an earlier run.
+"""
+
+import argparse
+import json
+import multiprocessing
+import pathlib
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from typing import Dict, List, Optional
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+from bench_server import BenchServer, ServerOptions
+
+SCENARIOS = ('single', 'batch', 'streaming')
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of a list of values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_scenario(name: str, base_url: str, pages: int, workers: int) -> Dict[str, object]:
+    """
+    Run one scenario in the current process
+
+    Args:
+        name: Scenario name from SCENARIOS
+        base_url: Benchmark server URL
+        pages: Number of distinct pages to fetch
+        workers: Worker threads for the batch paths
+
+    Returns:
+        Result dictionary for the JSON report
+    """
+    from src import WebScraper
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = f"{tmp}/config.json"
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "logging": {"level": "WARNING", "console_output": False, "file_path": f"{tmp}/bench.log"},
+                "scraping": {"timeout": 10, "max_retries": 3, "retry_delay": 0.01, "max_retry_delay": 1,
+                             "pool_size": workers, "stream_title": name == 'streaming'},
+            }, f)
+
+        urls = [f"{base_url}/page/{i}" for i in range(pages)]
+        scraper = WebScraper(urls[0], config_file=config_path)
+
+        # Time every URL including its retries, whichever path calls _scrape
+        latencies = []
+        scrape = scraper._scrape
+
+        def timed_scrape(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return scrape(*args, **kwargs)
+            finally:
+                latencies.append(time.perf_counter() - start)
+
+        scraper._scrape = timed_scrape
+
+        start = time.perf_counter()
+        if name == 'single':
+            titles = []
+            for url in urls:
+                scraper.url = url
+                titles.append(scraper.check_website())
+        else:
+            titles = [title for _, title in scraper.check_many(urls, max_workers=workers)]
+        elapsed = time.perf_counter() - start
+        scraper.close()
+
+    return {
+        'scenario': name,
+        'pages': pages,
+        'workers': 1 if name == 'single' else workers,
+        'failed': sum(title is None for title in titles),
+        'seconds': round(elapsed, 3),
+        'pages_per_sec': round(pages / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),  # KB on Linux
+    }
+
+
+def git_revision() -> Optional[str]:
+    """Current commit of the repository, if available"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=pathlib.Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[dict], baseline_path: str) -> None:
+    """Print relative change of each metric against an earlier report"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {r['scenario']: r for r in json.load(f)['results']}
+
+    print(f"\nChange against {baseline_path}:")
+    for result in results:
+        old = baseline.get(result['scenario'])
+        if old is None:
+            continue
+        changes = []
+        for key in ('pages_per_sec', 'p50_ms', 'p99_ms', 'peak_rss_mb'):
+            if old.get(key):
+                changes.append(f"{key} {(result[key] - old[key]) / old[key] * 100:+.1f}%")
+        print(f"  {result['scenario']:<10} " + ", ".join(changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=500, help='Pages per scenario')
+    parser.add_argument('--single-pages', type=int, default=100, help='Pages for the sequential scenario')
+    parser.add_argument('--workers', type=int, default=32, help='Worker threads for batch scenarios')
+    parser.add_argument('--latency-ms', type=float, default=20, help='Server delay per response')
+    parser.add_argument('--page-kb', type=int, default=32, help='Approximate page size')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of 500 responses')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of 429 responses')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--output', default='bench_results.json', help='JSON report path')
+    parser.add_argument('--compare', help='Earlier JSON report to compare against')
+    args = parser.parse_args()
+
+    options = ServerOptions(args.latency_ms, args.page_kb, args.error_rate, args.rate_limit_rate)
+    context = multiprocessing.get_context('spawn')
+    results = []
+
+    with BenchServer(options) as server:
+        for name in args.scenarios:
+            pages = args.single_pages if name == 'single' else args.pages
+            # Fresh process per scenario keeps ru_maxrss (a lifetime peak) per scenario
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                result = executor.submit(run_scenario, name, server.base_url, pages, args.workers).result()
+            results.append(result)
+
+    print(f"{'scenario':<10} {'pages':>6} {'failed':>6} {'pages/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'RSS MB':>7}")
+    for r in results:
+        print(f"{r['scenario']:<10} {r['pages']:>6} {r['failed']:>6} {r['pages_per_sec']:>9.1f} "
+              f"{r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['peak_rss_mb']:>7.1f}")
+
+    report = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'server': asdict(options),
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for a real website, used by the benchmark suite
+
+Usage:
+    python benchmarks/bench_server.py [--port N] [--latency-ms N] [--page-kb N]
+                                      [--error-rate F] [--rate-limit-rate F]
+
+Every path returns an HTML page of the configured size with the path as its
+title, after the configured latency. Errors (500) and rate limits (429 with
+Retry-After) are decided by a hash of the path and its hit count, so repeated
+runs see the same failures in the same places.
+"""
+
+import argparse
+import multiprocessing
+import sys
+import threading
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+@dataclass
+class ServerOptions:
+    """Behavior of the benchmark server"""
+    latency_ms: float = 20
+    page_kb: int = 32
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: float = 0.05
+
+
+def _fraction(key: str) -> float:
+    """Deterministic value in [0, 1) for a key"""
+    return zlib.crc32(key.encode('utf-8')) / 2 ** 32
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serve generated pages with configurable latency and failures"""
+
+    protocol_version = 'HTTP/1.1'  # Keep-alive, so the client's connection pool is exercised
+
+    def do_GET(self):
+        server = self.server
+        options: ServerOptions = server.options
+        with server.hits_lock:
+            hit = server.hits.get(self.path, 0) + 1
+            server.hits[self.path] = hit
+
+        if options.latency_ms:
+            time.sleep(options.latency_ms / 1000)
+
+        roll = _fraction(f"{self.path}#{hit}")
+        if roll < options.rate_limit_rate:
+            self._send(429, b'Too Many Requests', {'Retry-After': str(options.retry_after)})
+        elif roll < options.rate_limit_rate + options.error_rate:
+            self._send(500, b'Internal Server Error')
+        else:
+            head = f'<html><head><title>{self.path}</title></head><body>'.encode('utf-8')
+            self._send(200, head + server.padding + b'</body></html>')
+
+    def _send(self, status: int, body: bytes, headers: Optional[dict] = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Keep benchmark output quiet"""
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # Listen backlog, the default of 5 stalls bursts of connections
+
+    def handle_error(self, request, client_address):
+        """Ignore clients dropping connections (streaming mode closes after </title>)"""
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def create_server(options: ServerOptions, port: int = 0) -> ThreadingHTTPServer:
+    """
+    Create (but do not start) a benchmark server
+
+    Args:
+        options: Server behavior
+        port: Port to listen on (0 picks a free one)
+
+    Returns:
+        ThreadingHTTPServer bound to localhost
+    """
+    httpd = _Server(('127.0.0.1', port), _Handler)
+    httpd.options = options
+    httpd.hits = {}
+    httpd.hits_lock = threading.Lock()
+    paragraph = b'<p>' + b'lorem ipsum dolor sit amet ' * 36 + b'</p>\n'  # ~1 KB
+    httpd.padding = paragraph * options.page_kb
+    return httpd
+
+
+def _serve(options: dict, port_queue) -> None:
+    httpd = create_server(ServerOptions(**options))
+    port_queue.put(httpd.server_address[1])
+    httpd.serve_forever()
+
+
+class BenchServer:
+    """Run the benchmark server in a child process so it does not skew client CPU and RSS"""
+
+    def __init__(self, options: ServerOptions):
+        self.options = options
+        self.port: Optional[int] = None
+        context = multiprocessing.get_context('spawn')
+        self._port_queue = context.Queue()
+        self._process = context.Process(target=_serve, args=(asdict(options), self._port_queue), daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self) -> "BenchServer":
+        self._process.start()
+        self.port = self._port_queue.get(timeout=30)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._process.terminate()
+        self._process.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8000, help='Port to listen on')
+    parser.add_argument('--latency-ms', type=float, default=20, help='Delay before each response')
+    parser.add_argument('--page-kb', type=int, default=32, help='Approximate page size')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of 500 responses')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of 429 responses')
+    args = parser.parse_args()
+
+    options = ServerOptions(args.latency_ms, args.page_kb, args.error_rate, args.rate_limit_rate)
+    httpd = create_server(options, args.port)
+    print(f"Serving on http://127.0.0.1:{httpd.server_address[1]} with {options}")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
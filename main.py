@@ -1,12 +1,265 @@
-from src import WebScraper
+#!/usr/bin/env python3
+"""
+Command-line entry point
 
-def main():
-    webscraper = WebScraper("https://quotes.toscrape.com/")
+Usage:
+    python main.py                              # Check the demo site
+    python main.py urls.txt [more.txt ...]      # Check URLs listed in files
+    zcat urls.txt.gz | python main.py -         # ... or read them from stdin
+    python main.py urls.txt -o output/titles.jsonl.gz --workers 64 --per-host 4
+    python main.py urls.txt --capture archive/run.arc  # Also store raw responses
+    python main.py --replay archive/run.arc     # Re-extract offline from a capture
+    python main.py --sitemap https://example.com --since 2025-01-01  # Seed from sitemaps
+
+Input files hold one URL per line (blank lines and lines starting with '#'
+are skipped) and are read lazily, so lists of any size stream through a
+bounded window of in-flight requests. Results go to stdout as tab separated
+lines or to an output sink; throughput and error rate are reported on stderr.
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import threading
+import time
+from typing import Iterable, Iterator, List, Optional, TextIO
+
+from src.config import Config, shared_config
+
+DEFAULT_URL = "https://quotes.toscrape.com/"
+
+
+def read_urls(paths: Iterable[str]) -> Iterator[str]:
+    """
+    Stream URLs from files ('-' reads stdin)
+
+    Args:
+        paths: Input file paths
+
+    Yields:
+        URLs in input order
+    """
+    for path in paths:
+        f = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')
+        try:
+            for line in f:
+                url = line.strip()
+                if url and not url.startswith('#'):
+                    yield url
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+
+class ProgressReporter:
+    """Periodically print throughput and error rate to a stream"""
+
+    def __init__(self, interval: float = 5, stream: Optional[TextIO] = None):
+        """
+        Initialize reporter
+
+        Args:
+            interval: Seconds between reports (0 disables periodic reports)
+            stream: Stream to write to (default stderr)
+        """
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.done = 0
+        self.failed = 0
+        self._started = time.monotonic()
+        self._last_time = self._started
+        self._last_done = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def record(self, ok: bool) -> None:
+        """Count one finished URL (called from a single consumer thread)"""
+        self.done += 1
+        if not ok:
+            self.failed += 1
+
+    def start(self) -> "ProgressReporter":
+        """Start periodic reports"""
+        self._started = self._last_time = time.monotonic()
+        if self.interval > 0:
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop periodic reports and print the summary"""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        elapsed = time.monotonic() - self._started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        self._print(f"done: {self.done} urls in {elapsed:.1f}s ({rate:.1f}/s), {self._errors()}")
+
+    def _errors(self) -> str:
+        error_rate = self.failed / self.done * 100 if self.done else 0.0
+        return f"failed: {self.failed} ({error_rate:.1f}%)"
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            now, done = time.monotonic(), self.done
+            current = (done - self._last_done) / (now - self._last_time)
+            average = done / (now - self._started)
+            self._last_time, self._last_done = now, done
+            self._print(f"{done} urls, {current:.1f}/s (avg {average:.1f}/s), {self._errors()}")
+
+    def _print(self, message: str) -> None:
+        print(message, file=self.stream, flush=True)
+
+
+def parse_date(value: str):
+    """Parse a --since date such as 2025-01-31 or 2025-01-31T10:00:00Z"""
+    from src.sitemap import parse_lastmod
+
+    parsed = parse_lastmod(value)
+    if parsed is None:
+        raise argparse.ArgumentTypeError(f"invalid date: {value!r}")
+    return parsed
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('inputs', nargs='*', help="Files with one URL per line, '-' for stdin")
+    parser.add_argument('-c', '--config', help='Configuration file (default: config.json)')
+    parser.add_argument('-w', '--workers', type=int, help='Concurrent requests overall')
+    parser.add_argument('--per-host', type=int, help='Concurrent requests per host')
+    parser.add_argument('--rps', type=float, help='Requests per second per host')
+    parser.add_argument('--timeout', type=float, help='Request timeout in seconds')
+    parser.add_argument('--retries', type=int, help='Attempts per URL')
+    parser.add_argument('--stream-title', action='store_true', help='Stop reading pages after </title>')
+    parser.add_argument('-o', '--output', help='Write records to this file instead of stdout')
+    parser.add_argument('-f', '--format', choices=['jsonl', 'jsonl.gz', 'csv'],
+                        help='Output format (default: inferred from the output path)')
+    existing = parser.add_mutually_exclusive_group()
+    existing.add_argument('--append', action='store_true', help='Append to an existing output file')
+    existing.add_argument('--overwrite', action='store_true', help='Replace an existing output file')
+    parser.add_argument('--cache-dir', help='Enable the on-disk HTTP cache in this directory')
+    parser.add_argument('--dedup', action='store_true', help='Reuse results of duplicate and near-duplicate pages')
+    parser.add_argument('--sitemap', action='append', metavar='SITE', default=[],
+                        help="Also check URLs from the site's sitemaps (repeatable)")
+    parser.add_argument('--since', type=parse_date, metavar='DATE',
+                        help='Skip sitemap pages last modified before this date')
+    parser.add_argument('--capture', metavar='ARCHIVE', help='Append raw responses to this archive')
+    parser.add_argument('--replay', metavar='ARCHIVE', help='Read pages from this archive instead of the network')
+    parser.add_argument('--stats-interval', type=float, default=5, help='Seconds between stats lines (0: summary only)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='Log to the log file only, not the console')
+    args = parser.parse_args(argv)
+    if args.since is not None and not args.sitemap:
+        parser.error("--since requires --sitemap")
+    return args
+
+
+def apply_overrides(config: Config, args: argparse.Namespace) -> None:
+    """Apply command-line flags on top of the config file (in memory only)"""
+    if args.workers is not None:
+        config.override('scraping', 'max_workers', args.workers)
+        config.override('scraping', 'pool_size', args.workers)
+    if args.per_host is not None:
+        config.override('politeness', 'max_concurrent_per_host', args.per_host)
+    if args.rps is not None:
+        config.override('politeness', 'requests_per_second', args.rps)
+    if args.timeout is not None:
+        config.override('scraping', 'timeout', args.timeout)
+    if args.retries is not None:
+        config.override('scraping', 'max_retries', args.retries)
+    if args.stream_title:
+        config.override('scraping', 'stream_title', True)
+    if args.quiet:
+        config.override('logging', 'console_output', False)
+    if args.append:
+        config.override('output', 'mode', 'a')
+    if args.overwrite:
+        config.override('output', 'mode', 'w')
+    if args.cache_dir:
+        config.override('http_cache', 'enabled', True)
+        config.override('http_cache', 'path', os.path.join(args.cache_dir, 'http_cache.sqlite'))
+    if args.dedup:
+        config.override('fingerprint', 'enabled', True)
+    if args.capture:
+        config.override('archive', 'enabled', True)
+        config.override('archive', 'path', args.capture)
+
+
+def run_single(config_file: Optional[str]) -> int:
+    """Check the demo site (no input given)"""
+    from src import WebScraper
+
+    webscraper = WebScraper(DEFAULT_URL, config_file=config_file)
     title = webscraper.check_website()
     if title:
         print(f"Website title: {title}")
+        return 0
+    print("Failed to scrape website")
+    return 1
+
+
+def run_batch(args: argparse.Namespace, config: Config) -> int:
+    """Check all input URLs (or replay an archive) concurrently and write the results"""
+    from src import WebScraper
+
+    sink = None
+    if args.output:
+        from src.sinks import sink_from_config
+        try:
+            sink = sink_from_config(config, args.output, args.format)
+        except FileExistsError as e:
+            print(f"{e}, use --append or --overwrite", file=sys.stderr)
+            return 2
+
+    scraper = WebScraper(DEFAULT_URL, config_file=args.config)
+    if args.replay:
+        results = scraper.replay(args.replay)
     else:
-        print("Failed to scrape website")
+        urls = read_urls(args.inputs)
+        if args.sitemap:
+            sitemap_urls = (entry.url for entry in scraper.sitemap_entries(args.sitemap, args.since))
+            urls = itertools.chain(urls, sitemap_urls)
+        results = scraper.check_many(urls)
+    progress = ProgressReporter(args.stats_interval).start()
+    failed_urls = []
+
+    try:
+        for url, title in results:
+            progress.record(title is not None)
+            if title is None and args.sitemap:
+                failed_urls.append(url)
+            if sink is not None:
+                sink.write({'url': url, 'title': title, 'ok': title is not None})
+            else:
+                print(f"{url}\t{title or ''}")
+        if args.sitemap:
+            # Only now were the sitemap pages checked, so the next run may skip them
+            scraper.commit_sitemap_state(failed_urls)
+    except KeyboardInterrupt:
+        print("Interrupted", file=sys.stderr)
+    finally:
+        if sink is not None:
+            sink.close()
+        scraper.close()
+        progress.stop()
+        if scraper.fingerprints is not None:
+            stats = scraper.fingerprints.stats()
+            print(f"duplicates: {stats['hit_rate'] * 100:.1f}% of {stats['lookups']} pages "
+                  f"({stats['exact_hits']} exact, {stats['near_hits']} near)", file=sys.stderr)
+
+    return 1 if progress.done and progress.failed == progress.done else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the CLI, returns the process exit code"""
+    args = parse_args(argv)
+    config = shared_config(args.config)
+    apply_overrides(config, args)
+
+    if not args.inputs and not args.replay and not args.sitemap:
+        return run_single(args.config)
+    return run_batch(args, config)
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
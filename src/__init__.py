@@ -4,12 +4,35 @@ Basic Web Scraper Package
 A simple web scraping tool with logging capabilities.
 """
 
-from .scraper import WebScraper
-from .logger import ScraperLogger
-from .config import Config
+import importlib
+from typing import TYPE_CHECKING
 
 __version__ = "1.0.0"
 __author__ = "Zdeněk Amler"
 __all__ = ["WebScraper", "ScraperLogger", "Config"]
 
-__all__ = ["WebScraper"]
+# Public names are imported on first access, so e.g. `from src import Config`
+# does not load requests and the HTML parsers
+_LAZY_ATTRIBUTES = {
+    "WebScraper": ".scraper",
+    "ScraperLogger": ".logger",
+    "Config": ".config",
+}
+
+if TYPE_CHECKING:
+    from .config import Config
+    from .logger import ScraperLogger
+    from .scraper import WebScraper
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+from typing import Dict, Optional
+
+try:
+    from .politeness import ASYNC_POLL_INTERVAL
+    from .registry import shared_instance
+except ImportError:
+    from politeness import ASYNC_POLL_INTERVAL
+    from registry import shared_instance
+
+# Failed attempts that signal an overloaded host, see is_congestion()
+CONGESTION_ERRORS = ('timeout', 'connection_error')
+
+
+def is_congestion(error: Optional[str], status: Optional[int] = None) -> bool:
+    """
+    Check whether an attempt outcome means the host is overloaded
+
+    Args:
+        error: Error kind of the attempt (None on success)
+        status: HTTP status code, if a response was received
+
+    Returns:
+        True for timeouts, connection errors, 429 and 5xx responses
+    """
+    if error in CONGESTION_ERRORS:
+        return True
+    return status is not None and (status == 429 or status >= 500)
+
+
+class _HostLimit:
+    """Adaptive concurrency state of a single host"""
+
+    def __init__(self, limit: float):
+        self.limit = limit
+        self.in_flight = 0
+        self.latency: Optional[float] = None  # EWMA of successful request latency
+        self.min_latency: Optional[float] = None
+        self.last_decrease = 0.0
+        self.successes = 0
+        self.congestions = 0
+
+
+class AdaptiveLimiter:
+    """
+    Per-host concurrency limits adjusted by additive increase / multiplicative decrease
+
+    Every healthy response grows the host's limit by increase/limit (about
+    `increase` per round of `limit` requests); responses slower than
+    latency_tolerance times the fastest seen hold the limit. Timeouts,
+    connection errors, 429 and 5xx responses multiply it by decrease_factor,
+    at most once per cooldown so one burst of failures only cuts once.
+    """
+
+    def __init__(self, initial: float = 4, minimum: float = 1, maximum: float = 64, increase: float = 1.0,
+                 decrease_factor: float = 0.5, latency_tolerance: float = 2.0, cooldown_seconds: float = 1.0):
+        """
+        Initialize limiter
+
+        Args:
+            initial: Starting concurrency of a new host
+            minimum: Lowest concurrency a host is cut back to
+            maximum: Highest concurrency a host can reach
+            increase: Additive increase per round of requests
+            decrease_factor: Multiplier applied on congestion
+            latency_tolerance: Latency ratio to the fastest response above which growth stops
+            cooldown_seconds: Minimum time between two decreases of the same host
+        """
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.cooldown_seconds = cooldown_seconds
+        self._hosts: Dict[str, _HostLimit] = {}
+        self._cond = threading.Condition()
+
+    def _host(self, host: str) -> _HostLimit:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostLimit(min(max(self.initial, self.minimum), self.maximum))
+        return state
+
+    def acquire(self, host: str) -> None:
+        """
+        Wait until host has a free slot under its current limit
+
+        Args:
+            host: Host the request goes to
+        """
+        with self._cond:
+            state = self._host(host)
+            while state.in_flight >= int(state.limit):
+                self._cond.wait()
+            state.in_flight += 1
+
+    async def acquire_async(self, host: str) -> None:
+        """
+        Asyncio version of acquire, sharing the same per-host limits
+
+        Waiting never blocks the event loop: a full host is polled every
+        ASYNC_POLL_INTERVAL seconds instead of waiting on the condition.
+
+        Args:
+            host: Host the request goes to
+        """
+        import asyncio
+
+        while True:
+            with self._cond:
+                state = self._host(host)
+                if state.in_flight < int(state.limit):
+                    state.in_flight += 1
+                    return
+            await asyncio.sleep(ASYNC_POLL_INTERVAL)
+
+    def release(self, host: str, latency: float, congested: bool) -> Optional[int]:
+        """
+        Free the slot and adjust the host's limit from the attempt outcome
+
+        Args:
+            host: Host the request went to
+            latency: Attempt duration in seconds
+            congested: Whether the outcome signals overload (see is_congestion)
+
+        Returns:
+            New whole-number limit if it changed, otherwise None
+        """
+        with self._cond:
+            state = self._host(host)
+            state.in_flight -= 1
+            before = int(state.limit)
+
+            if congested:
+                state.congestions += 1
+                now = time.monotonic()
+                if now - state.last_decrease >= self.cooldown_seconds:
+                    state.limit = max(self.minimum, state.limit * self.decrease_factor)
+                    state.last_decrease = now
+            else:
+                state.successes += 1
+                state.latency = latency if state.latency is None else 0.8 * state.latency + 0.2 * latency
+                state.min_latency = latency if state.min_latency is None else min(state.min_latency, latency)
+                if state.latency <= state.min_latency * self.latency_tolerance:
+                    state.limit = min(self.maximum, state.limit + self.increase / state.limit)
+
+            self._cond.notify_all()
+            after = int(state.limit)
+            return after if after != before else None
+
+    def limit(self, host: str) -> int:
+        """Current whole-number concurrency limit of host"""
+        with self._cond:
+            return int(self._host(host).limit)
+
+    def snapshot(self) -> Dict[str, dict]:
+        """
+        Get current state of all hosts
+
+        Returns:
+            Dictionary of host -> limit, in_flight, latency, successes and congestions
+        """
+        with self._cond:
+            return {
+                host: {
+                    'limit': int(state.limit),
+                    'in_flight': state.in_flight,
+                    'latency': round(state.latency, 6) if state.latency is not None else None,
+                    'successes': state.successes,
+                    'congestions': state.congestions,
+                }
+                for host, state in self._hosts.items()
+            }
+
+
+def shared_adaptive_limiter(**settings) -> AdaptiveLimiter:
+    """Process-wide AdaptiveLimiter per set of AdaptiveLimiter keyword arguments"""
+    return shared_instance('adaptive', tuple(sorted(settings.items())), lambda: AdaptiveLimiter(**settings))
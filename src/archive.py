@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+
+import atexit
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from .registry import shared_instance
+except ImportError:
+    from registry import shared_instance
+
+# Archive layout: MAGIC, then frames of <u32 length><zlib(header JSON + b'\n' + body)>.
+# The sidecar index (<archive>.idx) holds one <u64 offset><u64 length> entry per
+# frame, so readers can jump to any record and split the archive into ranges.
+MAGIC = b'SCRARC1\n'
+_FRAME = struct.Struct('<I')
+_ENTRY = struct.Struct('<QQ')
+
+
+@dataclass
+class ArchiveRecord:
+    """One captured HTTP response"""
+    url: str
+    status: int
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    encoding: Optional[str] = None
+    final_url: Optional[str] = None
+    fetched_at: float = 0.0
+
+    def encode(self) -> bytes:
+        """Serialize record to an uncompressed frame payload"""
+        header = {
+            'url': self.url,
+            'status': self.status,
+            'headers': self.headers,
+            'encoding': self.encoding,
+            'final_url': self.final_url,
+            'fetched_at': self.fetched_at,
+        }
+        return json.dumps(header, separators=(',', ':')).encode('utf-8') + b'\n' + self.body
+
+    @classmethod
+    def decode(cls, payload: bytes) -> "ArchiveRecord":
+        """Deserialize record from an uncompressed frame payload"""
+        newline = payload.index(b'\n')
+        header = json.loads(payload[:newline])
+        return cls(header['url'], header['status'], payload[newline + 1:], header.get('headers') or {},
+                   header.get('encoding'), header.get('final_url'), header.get('fetched_at', 0.0))
+
+
+def index_path(path: str) -> str:
+    """Path of the sidecar index of an archive"""
+    return path + '.idx'
+
+
+def _scan_frames(data, start: int) -> Iterator[Tuple[int, int]]:
+    """Yield (offset, length) of complete frames from start to the end of data"""
+    position, size = start, len(data)
+    while position + _FRAME.size <= size:
+        (length,) = _FRAME.unpack_from(data, position)
+        offset = position + _FRAME.size
+        if offset + length > size:
+            return  # Partial frame left by an interrupted write
+        yield offset, length
+        position = offset + length
+
+
+def _load_index(path: str, data) -> array:
+    """
+    Read the sidecar index, completing it from the archive if it lags behind
+
+    Args:
+        path: Archive path
+        data: Archive contents (bytes or mmap)
+
+    Returns:
+        Flat array of offset, length pairs of all complete frames
+    """
+    entries = array('Q')
+    try:
+        with open(index_path(path), 'rb') as f:
+            raw = f.read()
+    except FileNotFoundError:
+        raw = b''
+
+    entries.frombytes(raw[:len(raw) - len(raw) % _ENTRY.size])
+    if sys.byteorder == 'big':
+        entries.byteswap()
+    # Offsets only grow, so entries past the end of the archive are all at the tail
+    while entries and entries[-2] + entries[-1] > len(data):
+        del entries[-2:]
+
+    end = entries[-2] + entries[-1] if entries else len(MAGIC)
+    for offset, length in _scan_frames(data, end):
+        entries.extend((offset, length))
+    return entries
+
+
+class ArchiveWriter:
+    """Append-only writer of compressed response frames, safe to share between threads"""
+
+    def __init__(self, path: str, compression_level: int = 6):
+        """
+        Open archive for appending, creating it if needed
+
+        A frame cut short by an interrupted run is truncated away and the
+        index is rebuilt from the archive if it is missing entries.
+
+        Args:
+            path: Archive file path
+            compression_level: zlib level from 1 (fastest) to 9 (smallest)
+        """
+        self.path = path
+        self.compression_level = compression_level
+        self.records = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, 'wb') as f:
+                f.write(MAGIC)
+            with open(index_path(path), 'wb'):
+                pass
+
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a response archive")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                entries = _load_index(path, data)
+        end = entries[-2] + entries[-1] if entries else len(MAGIC)
+        self.records = len(entries) // 2
+
+        # Drop a partial trailing frame and rewrite the index to match the archive
+        with open(path, 'r+b') as f:
+            f.truncate(end)
+        if sys.byteorder == 'big':
+            entries.byteswap()
+        with open(index_path(path), 'wb') as f:
+            entries.tofile(f)
+
+        self._data = open(path, 'ab', buffering=1024 * 1024)
+        self._index = open(index_path(path), 'ab', buffering=64 * 1024)
+        self._position = end
+        self._lock = threading.Lock()
+
+    def write(self, record: ArchiveRecord) -> None:
+        """
+        Append one record
+
+        Args:
+            record: Response to store
+        """
+        # Compress outside the lock so threads only serialize on the file append
+        compressed = zlib.compress(record.encode(), self.compression_level)
+        with self._lock:
+            offset = self._position + _FRAME.size
+            self._data.write(_FRAME.pack(len(compressed)))
+            self._data.write(compressed)
+            self._index.write(_ENTRY.pack(offset, len(compressed)))
+            self._position = offset + len(compressed)
+            self.records += 1
+
+    def write_response(self, url: str, response) -> None:
+        """
+        Append a requests response
+
+        Args:
+            url: Requested URL
+            response: Response with its body read
+        """
+        self.write(ArchiveRecord(url, response.status_code, response.content, dict(response.headers),
+                                 response.encoding, response.url or url, time.time()))
+
+    def flush(self) -> None:
+        """Write buffered frames and index entries to disk"""
+        with self._lock:
+            if not self._data.closed:
+                # Archive first, so the index never points past its end
+                self._data.flush()
+                self._index.flush()
+
+    def close(self) -> None:
+        """Flush and close the archive"""
+        with self._lock:
+            if not self._data.closed:
+                self._data.close()
+                self._index.close()
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class ArchiveReader:
+    """Memory-mapped random access to the records of an archive"""
+
+    def __init__(self, path: str):
+        """
+        Open archive for reading
+
+        Args:
+            path: Archive file path
+
+        Raises:
+            ValueError: If the file is not a response archive
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a response archive")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._entries = _load_index(path, self._map)
+
+    def __len__(self) -> int:
+        return len(self._entries) // 2
+
+    def read(self, i: int) -> ArchiveRecord:
+        """
+        Read record by position
+
+        Args:
+            i: Zero-based record number
+
+        Returns:
+            Decoded ArchiveRecord
+        """
+        offset, length = self._entries[2 * i], self._entries[2 * i + 1]
+        return ArchiveRecord.decode(zlib.decompress(self._map[offset:offset + length]))
+
+    def iter_range(self, start: int = 0, stop: Optional[int] = None) -> Iterator[ArchiveRecord]:
+        """
+        Iterate over records in archive order
+
+        Args:
+            start: First record number
+            stop: Record number to stop before (None reads to the end)
+
+        Yields:
+            Decoded ArchiveRecord objects
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        for i in range(start, stop):
+            yield self.read(i)
+
+    def __iter__(self) -> Iterator[ArchiveRecord]:
+        return self.iter_range()
+
+    def close(self) -> None:
+        """Unmap the archive"""
+        self._map.close()
+
+    def __enter__(self) -> "ArchiveReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+# Readers and extraction rules are opened / compiled once per worker process
+_readers: Dict[str, ArchiveReader] = {}
+_compiled_rules: Dict[str, Any] = {}
+
+
+def _reader_for(path: str, records: int) -> ArchiveReader:
+    reader = _readers.get(path)
+    if reader is None or len(reader) < records:  # Reopen if the archive grew since
+        reader = _readers[path] = ArchiveReader(path)
+    return reader
+
+
+def _rules_for(extraction: Dict[str, Any]):
+    key = json.dumps(extraction, sort_keys=True)
+    rules = _compiled_rules.get(key)
+    if rules is None:
+        try:
+            from .extraction import ExtractionRules
+        except ImportError:
+            from extraction import ExtractionRules
+        rules = _compiled_rules[key] = ExtractionRules.from_config(extraction)
+    return rules
+
+
+def replay_range(path: str, start: int, stop: int, parser_name: str,
+                 extraction: Optional[Dict[str, Any]] = None) -> List[Tuple[str, Any]]:
+    """
+    Parse a range of archived responses (runs in a worker process)
+
+    Only the range's compressed frames are paged in from the mapped archive;
+    records are never pickled between processes.
+
+    Args:
+        path: Archive file path
+        start: First record number
+        stop: Record number to stop before
+        parser_name: Title parser backend name
+        extraction: `extraction` config section to extract records with
+            instead of titles
+
+    Returns:
+        List of (url, title) tuples, or (url, (records, next_url)) with extraction;
+        responses that were not successful give None
+    """
+    try:
+        from .pipeline import parse_page
+    except ImportError:
+        from pipeline import parse_page
+
+    results = []
+    for record in _reader_for(path, stop).iter_range(start, stop):
+        if not 200 <= record.status < 300:
+            results.append((record.url, None))
+        elif extraction is not None:
+            html = record.body.decode(record.encoding or 'utf-8', errors='replace')
+            results.append((record.url, _rules_for(extraction).extract(html, record.final_url or record.url)))
+        else:
+            results.append((record.url, parse_page(record.url, record.body, record.encoding, parser_name)[1]))
+    return results
+
+
+def _open_writer(path: str, compression_level: int) -> ArchiveWriter:
+    writer = ArchiveWriter(path, compression_level)
+    atexit.register(writer.close)
+    return writer
+
+
+def shared_archive_writer(path: str, compression_level: int = 6) -> ArchiveWriter:
+    """Process-wide ArchiveWriter per file, closed at exit (compression_level applies when it is opened)"""
+    return shared_instance('archive', os.path.abspath(path), lambda: _open_writer(path, compression_level))
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+
+try:
+    from .registry import shared_instance
+except ImportError:
+    from registry import shared_instance
+
+
+@dataclass
+class CacheEntry:
+    """Cached HTTP validators and extraction result for one URL"""
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    title: Optional[str]
+    stored_at: float
+
+
+class ValidatorCache:
+    """On-disk cache of HTTP validators (ETag / Last-Modified) keyed by URL"""
+
+    def __init__(self, path: str, max_entries: int = 100000, max_age_seconds: float = 30 * 24 * 3600):
+        """
+        Initialize validator cache
+
+        Args:
+            path: Path to SQLite cache file
+            max_entries: Maximum entries kept, least recently used are evicted
+            max_age_seconds: Entries older than this are ignored and evicted
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._puts_since_evict = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        import sqlite3  # Only the on-disk cache needs it, ResultCache is always loaded
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS validators ('
+            ' url TEXT PRIMARY KEY,'
+            ' etag TEXT,'
+            ' last_modified TEXT,'
+            ' title TEXT,'
+            ' stored_at REAL NOT NULL,'
+            ' accessed_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_validators_accessed ON validators (accessed_at)')
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """
+        Get cached entry for URL
+
+        Args:
+            url: Page URL
+
+        Returns:
+            CacheEntry or None if missing or expired
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT etag, last_modified, title, stored_at FROM validators WHERE url = ?', (url,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        etag, last_modified, title, stored_at = row
+        if time.time() - stored_at > self.max_age_seconds:
+            return None
+        return CacheEntry(url, etag, last_modified, title, stored_at)
+
+    def store(self, url: str, headers: Mapping[str, str], title: Optional[str]) -> None:
+        """
+        Store validators from response headers together with extracted title
+
+        Responses without ETag or Last-Modified are not cached.
+
+        Args:
+            url: Page URL
+            headers: Response headers
+            title: Extracted title
+        """
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO validators (url, etag, last_modified, title, stored_at, accessed_at)'
+                ' VALUES (?, ?, ?, ?, ?, ?)',
+                (url, etag, last_modified, title, now, now)
+            )
+            self._conn.commit()
+            self._puts_since_evict += 1
+            # Evict in batches instead of on every single insert
+            if self._puts_since_evict >= max(1, self.max_entries // 10):
+                self._evict_locked()
+
+    def touch(self, url: str) -> None:
+        """Mark entry as revalidated (304) so it stays fresh and is not evicted"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'UPDATE validators SET stored_at = ?, accessed_at = ? WHERE url = ?', (now, now, url)
+            )
+            self._conn.commit()
+
+    def evict(self) -> None:
+        """Remove expired entries and least recently used entries over max_entries"""
+        with self._lock:
+            self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        self._puts_since_evict = 0
+        self._conn.execute('DELETE FROM validators WHERE stored_at < ?', (time.time() - self.max_age_seconds,))
+        self._conn.execute(
+            'DELETE FROM validators WHERE url IN ('
+            ' SELECT url FROM validators ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,)
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CacheEntry]) -> Dict[str, str]:
+        """
+        Build conditional request headers for a cached entry
+
+        Args:
+            entry: Cached entry or None
+
+        Returns:
+            Dictionary with If-None-Match / If-Modified-Since headers
+        """
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def close(self) -> None:
+        """Close the underlying database"""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM validators').fetchone()[0]
+
+
+def shared_validator_cache(path: str, max_entries: int = 100000,
+                           max_age_seconds: float = 30 * 24 * 3600) -> ValidatorCache:
+    """Process-wide ValidatorCache per file (limits apply when it is opened)"""
+    return shared_instance('validator_cache', os.path.abspath(path),
+                           lambda: ValidatorCache(path, max_entries, max_age_seconds))
+
+
+class ResultCache:
+    """In-memory LRU cache with per-entry TTL and coalesced loading"""
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024,
+                 ttl_seconds: float = 300):
+        """
+        Initialize result cache
+
+        Args:
+            max_entries: Maximum number of entries
+            max_bytes: Maximum estimated size of keys and values in bytes
+            ttl_seconds: Default time to live of an entry
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'coalesced': 0}
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Get cached value
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (found, value)
+        """
+        with self._lock:
+            return self._get_locked(key)
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store value, evicting least recently used entries over the limits
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time to live in seconds (None uses the default)
+        """
+        with self._lock:
+            self._put_locked(key, value, ttl)
+
+    def get_or_load(self, key: str, loader: Callable[[], Any], ttl: Optional[float] = None,
+                    cache_none: bool = False) -> Any:
+        """
+        Get cached value or load it, coalescing concurrent loads of the same key
+
+        Only one caller runs the loader; others asking for the same key at the
+        same time wait for its result.
+
+        Args:
+            key: Cache key
+            loader: Callable producing the value on a miss
+            ttl: Time to live in seconds (None uses the default)
+            cache_none: Whether a None result should be cached
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        found, value, future, owner = self._claim(key)
+        if found:
+            return value
+        if not owner:
+            return future.result()
+
+        try:
+            value = loader()
+        except BaseException as e:
+            self._fail_load(key, future, e)
+            raise
+        self._finish_load(key, future, value, ttl, cache_none)
+        return value
+
+    async def get_or_load_async(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: Optional[float] = None,
+                                cache_none: bool = False) -> Any:
+        """
+        Asyncio version of get_or_load
+
+        Loads in flight are shared with get_or_load, so coroutines and threads
+        asking for the same key wait for one fetch.
+
+        Args:
+            key: Cache key
+            loader: Callable returning an awaitable producing the value on a miss
+            ttl: Time to live in seconds (None uses the default)
+            cache_none: Whether a None result should be cached
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        import asyncio
+
+        found, value, future, owner = self._claim(key)
+        if found:
+            return value
+        if not owner:
+            # Shielded, so a cancelled waiter does not cancel the shared load
+            return await asyncio.shield(asyncio.wrap_future(future))
+
+        try:
+            value = await loader()
+        except BaseException as e:
+            self._fail_load(key, future, e)
+            raise
+        self._finish_load(key, future, value, ttl, cache_none)
+        return value
+
+    def _claim(self, key: str) -> Tuple[bool, Any, Optional[Future], bool]:
+        """Look key up, joining or starting its load on a miss: (found, value, future, owner)"""
+        with self._lock:
+            found, value = self._get_locked(key)
+            if found:
+                return True, value, None, False
+
+            future = self._inflight.get(key)
+            if future is not None:
+                self._stats['coalesced'] += 1
+                return False, None, future, False
+            future = self._inflight[key] = Future()
+            return False, None, future, True
+
+    def _fail_load(self, key: str, future: Future, error: BaseException) -> None:
+        with self._lock:
+            del self._inflight[key]
+        future.set_exception(error)
+
+    def _finish_load(self, key: str, future: Future, value: Any, ttl: Optional[float], cache_none: bool) -> None:
+        with self._lock:
+            if value is not None or cache_none:
+                self._put_locked(key, value, ttl)
+            del self._inflight[key]
+        future.set_result(value)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters
+
+        Returns:
+            Dictionary with hits, misses, evictions, expirations, coalesced,
+            entries and bytes
+        """
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries), bytes=self._bytes)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _get_locked(self, key: str) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats['misses'] += 1
+            return False, None
+
+        value, expires_at, size = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._bytes -= size
+            self._stats['expirations'] += 1
+            self._stats['misses'] += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        self._stats['hits'] += 1
+        return True, value
+
+    def _put_locked(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        size = sys.getsizeof(key) + sys.getsizeof(value)
+        if size > self.max_bytes:
+            return
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[2]
+
+        expires_at = time.monotonic() + (self.ttl_seconds if ttl is None else ttl)
+        self._entries[key] = (value, expires_at, size)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self._stats['evictions'] += 1
+
+
+def shared_result_cache(max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024,
+                        ttl_seconds: float = 300) -> ResultCache:
+    """Process-wide ResultCache per set of limits"""
+    return shared_instance('result_cache', (max_entries, max_bytes, ttl_seconds),
+                           lambda: ResultCache(max_entries, max_bytes, ttl_seconds))
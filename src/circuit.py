@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+StateChangeCallback = Callable[[str, str, str], None]
+
+try:
+    from .registry import shared_instance
+except ImportError:
+    from registry import shared_instance
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+def is_host_failure(error: Optional[str], status: Optional[int] = None) -> bool:
+    """
+    Check whether an attempt outcome means the host itself is failing
+
+    Args:
+        error: Error kind of the attempt (None on success)
+        status: HTTP status code, if a response was received
+
+    Returns:
+        True for timeouts, connection errors and 5xx responses
+    """
+    if error in ('timeout', 'connection_error'):
+        return True
+    return status is not None and status >= 500
+
+
+class _Circuit:
+    """Breaker state of a single host"""
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trials = 0
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker
+
+    closed: requests pass, consecutive host failures are counted.
+    open: after failure_threshold consecutive failures requests are refused
+          for cooldown_seconds.
+    half_open: after the cool-down up to half_open_requests trial requests
+               pass; a success closes the circuit, a failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown_seconds: float = 30, half_open_requests: int = 1,
+                 on_state_change: Optional[StateChangeCallback] = None):
+        """
+        Initialize circuit breaker
+
+        Args:
+            failure_threshold: Consecutive failures that open a host's circuit
+            cooldown_seconds: Time an open circuit refuses requests
+            half_open_requests: Trial requests allowed at once while half-open
+            on_state_change: Called with (host, old state, new state) on every change
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.half_open_requests = half_open_requests
+        self.on_state_change = on_state_change
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, host: str) -> _Circuit:
+        circuit = self._circuits.get(host)
+        if circuit is None:
+            circuit = self._circuits[host] = _Circuit()
+        return circuit
+
+    def _set_state(self, host: str, circuit: _Circuit, state: str) -> tuple:
+        old, circuit.state = circuit.state, state
+        if state == OPEN:
+            circuit.opened_at = time.monotonic()
+        circuit.trials = 0
+        return (host, old, state)
+
+    def _notify(self, change: Optional[tuple], on_change: Optional[StateChangeCallback]) -> None:
+        # Called outside the lock so callbacks may log or query the breaker
+        if change is None:
+            return
+        if self.on_state_change is not None:
+            self.on_state_change(*change)
+        if on_change is not None:
+            on_change(*change)
+
+    def allow(self, host: str, on_change: Optional[StateChangeCallback] = None) -> bool:
+        """
+        Check whether a request to host may be sent now
+
+        Args:
+            host: Host the request goes to
+            on_change: Called with (host, old state, new state) if this call changes the state
+
+        Returns:
+            False while the host's circuit is open (or its trial slots are taken)
+        """
+        change = None
+        with self._lock:
+            circuit = self._circuit(host)
+            if circuit.state == OPEN:
+                if time.monotonic() - circuit.opened_at < self.cooldown_seconds:
+                    return False
+                change = self._set_state(host, circuit, HALF_OPEN)
+            if circuit.state == HALF_OPEN:
+                allowed = circuit.trials < self.half_open_requests
+                if allowed:
+                    circuit.trials += 1
+            else:
+                allowed = True
+        self._notify(change, on_change)
+        return allowed
+
+    def record(self, host: str, failed: bool, on_change: Optional[StateChangeCallback] = None) -> None:
+        """
+        Record the outcome of a request that allow() let through
+
+        Args:
+            host: Host the request went to
+            failed: Whether the host failed (see is_host_failure)
+            on_change: Called with (host, old state, new state) if this call changes the state
+        """
+        change = None
+        with self._lock:
+            circuit = self._circuit(host)
+            if circuit.state == HALF_OPEN:
+                circuit.trials = max(0, circuit.trials - 1)
+                change = self._set_state(host, circuit, OPEN if failed else CLOSED)
+                circuit.failures = 0
+            elif circuit.state == CLOSED:
+                circuit.failures = circuit.failures + 1 if failed else 0
+                if circuit.failures >= self.failure_threshold:
+                    change = self._set_state(host, circuit, OPEN)
+            # Late results of requests sent before the circuit opened are ignored
+        self._notify(change, on_change)
+
+    def retry_in(self, host: str) -> float:
+        """Seconds until an open circuit lets trial requests through (0 if not open)"""
+        with self._lock:
+            circuit = self._circuit(host)
+            if circuit.state != OPEN:
+                return 0.0
+            return max(0.0, circuit.opened_at + self.cooldown_seconds - time.monotonic())
+
+    def state(self, host: str) -> str:
+        """Current state of host's circuit"""
+        with self._lock:
+            return self._circuit(host).state
+
+    def snapshot(self) -> Dict[str, dict]:
+        """
+        Get state of all known hosts
+
+        Returns:
+            Dictionary of host -> state and consecutive failures
+        """
+        with self._lock:
+            return {host: {'state': c.state, 'failures': c.failures} for host, c in self._circuits.items()}
+
+
+def shared_circuit_breaker(failure_threshold: int, cooldown_seconds: float,
+                           half_open_requests: int = 1) -> CircuitBreaker:
+    """
+    Process-wide CircuitBreaker per set of limits
+
+    It has no on_state_change callback, which would keep the first user alive
+    and report every change to it; callers pass on_change to allow and record
+    to hear about the changes they cause.
+    """
+    return shared_instance('circuit', (failure_threshold, cooldown_seconds, half_open_requests),
+                           lambda: CircuitBreaker(failure_threshold, cooldown_seconds, half_open_requests))
@@ -1,25 +1,84 @@
 #!/usr/bin/env python3
 
+import copy
 import json
 import os
-from typing import Any, Dict, Optional
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    from .registry import shared_instance
+except ImportError:
+    from registry import shared_instance
 
 
 class Config:
     """Configuration manager for web scraper"""
 
-    def __init__(self, config_file: Optional[str] = 'config.json'):
+    def __init__(self, config_file: Optional[str] = 'config.json', reload_interval: float = 1.0):
         """
         Initialize configuration
 
         Args:
             config_file: Path to configuration JSON file (None uses default)
+            reload_interval: Minimum seconds between checks of the file's
+                modification time for hot reload (0 checks on every read)
         """
         if config_file is None:
             config_file = 'config.json'
         self.config_file = config_file
+        self.reload_interval = reload_interval
+        self._lock = threading.RLock()
+        self._transaction_depth = 0
+        self.overrides: Dict[str, Dict[str, Any]] = {}
+        # Bumped whenever the effective settings change, so users can rebuild derived state
+        self.generation = 0
+        self._file_state = self._stat()
+        self._next_check = time.monotonic() + reload_interval
         self.settings = self.load_config()
 
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        """Modification time and size of the config file, None if missing"""
+        try:
+            stat = os.stat(self.config_file)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload_if_changed(self) -> bool:
+        """
+        Reload settings if the file changed on disk since it was read
+
+        A file that cannot be parsed (e.g. while an editor is writing it)
+        keeps the current settings.
+
+        Returns:
+            True if new settings were loaded
+        """
+        with self._lock:
+            self._next_check = time.monotonic() + self.reload_interval
+            state = self._stat()
+            if state == self._file_state or state is None or self._transaction_depth:
+                return False
+            try:
+                with open(self.config_file, 'r', encoding='utf-8') as f:
+                    settings = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"Warning: Could not reload config file {self.config_file}: {e}")
+                return False
+            self._file_state = state
+            self.settings = settings
+            self.generation += 1
+            return True
+
+    def _maybe_reload(self) -> None:
+        """Check for file changes at most once per reload_interval"""
+        if time.monotonic() >= self._next_check:
+            self.reload_if_changed()
+
     def load_config(self) -> Dict[str, Any]:
         """
         Load configuration from JSON file
@@ -67,34 +126,107 @@ class Config:
         Returns:
             Configuration value or default
         """
+        self._maybe_reload()
+        if self.overrides:
+            section_overrides = self.overrides.get(section)
+            if section_overrides and key in section_overrides:
+                return section_overrides[key]
         try:
             return self.settings[section][key]
         except KeyError:
             return default
 
+    def override(self, section: str, key: str, value: Any) -> None:
+        """
+        Set in-memory value taking precedence over the file
+
+        Overrides (e.g. from command-line flags) survive hot reloads and are
+        never written to the file.
+
+        Args:
+            section: Configuration section name
+            key: Configuration key name
+            value: Value to use
+        """
+        with self._lock:
+            self.overrides.setdefault(section, {})[key] = value
+            self.generation += 1
+
     def update(self, section: str, key: str, value: Any) -> None:
         """
         Update configuration value and save to file
 
+        Inside transaction() the file is written once when the transaction ends.
+
         Args:
             section: Configuration section name
             key: Configuration key name
             value: New value
         """
-        if section not in self.settings:
-            self.settings[section] = {}
+        with self._lock:
+            if section not in self.settings:
+                self.settings[section] = {}
+
+            self.settings[section][key] = value
+            self.generation += 1
+            if not self._transaction_depth:
+                self._save_config()
+
+    def update_many(self, values: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Update several values and save to file once
 
-        self.settings[section][key] = value
-        self._save_config()
+        Args:
+            values: Dictionary of section -> {key: value}
+        """
+        with self.transaction():
+            for section, section_values in values.items():
+                for key, value in section_values.items():
+                    self.update(section, key, value)
+
+    @contextmanager
+    def transaction(self) -> Iterator["Config"]:
+        """
+        Group updates into one atomic write
+
+        Settings are restored if the block raises, and nothing is written.
+        Hot reload is paused while the transaction is open.
+
+        Yields:
+            This Config instance
+        """
+        with self._lock:
+            snapshot = copy.deepcopy(self.settings) if not self._transaction_depth else None
+            self._transaction_depth += 1
+            try:
+                yield self
+            except BaseException:
+                if snapshot is not None:
+                    self.settings = snapshot
+                    self.generation += 1
+                raise
+            finally:
+                self._transaction_depth -= 1
+            if not self._transaction_depth:
+                self._save_config()
 
     def _save_config(self) -> None:
-        """Save current configuration to file"""
+        """Save current configuration to file atomically (temp file + rename)"""
         try:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
+            # Create directory if it doesn't exist (a bare file name lives in the working directory)
+            directory = os.path.dirname(self.config_file) or '.'
+            os.makedirs(directory, exist_ok=True)
 
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=4, ensure_ascii=False)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(self.settings, f, indent=4, ensure_ascii=False)
+                os.replace(tmp_path, self.config_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            # Our own write is not a change to reload
+            self._file_state = self._stat()
         except IOError as e:
             print(f"Warning: Could not save config file {self.config_file}: {e}")
 
@@ -108,6 +240,9 @@ class Config:
         Returns:
             Dictionary with section settings
         """
+        self._maybe_reload()
+        if section in self.overrides:
+            return {**self.settings.get(section, {}), **self.overrides[section]}
         return self.settings.get(section, {})
 
     def __str__(self) -> str:
@@ -116,4 +251,22 @@ class Config:
 
     def __repr__(self) -> str:
         """Detailed string representation"""
-        return f"Config(file='{self.config_file}', sections={list(self.settings.keys())})"
\ No newline at end of file
+        return f"Config(file='{self.config_file}', sections={list(self.settings.keys())})"
+
+
+def shared_config(config_file: Optional[str] = None) -> Config:
+    """
+    Get process-wide Config for a file, parsing it only once
+
+    Returning a cached instance costs one stat() call; the file is re-read
+    only if it changed since it was loaded.
+
+    Args:
+        config_file: Path to configuration JSON file (None uses default)
+
+    Returns:
+        Config shared by all callers using the same file
+    """
+    config = shared_instance('config', os.path.abspath(config_file or 'config.json'), lambda: Config(config_file))
+    config.reload_if_changed()
+    return config
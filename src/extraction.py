@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+# soupsieve and bs4 are imported when rules are compiled / applied, so importing
+# the scraper package does not pay for them unless extraction is used
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    """Compiled rule extracting one named field"""
+    name: str
+    selector: Any
+    attr: Optional[str] = None
+    many: bool = False
+    absolute: bool = False
+    default: Any = None
+
+    @classmethod
+    def compile(cls, name: str, spec: Dict[str, Any]) -> "FieldRule":
+        """
+        Compile field rule from its config dictionary
+
+        Args:
+            name: Field name
+            spec: Dictionary with selector and optional attr, many, absolute and default
+
+        Returns:
+            Compiled FieldRule
+
+        Raises:
+            ValueError: If the selector is missing or invalid
+        """
+        if isinstance(spec, str):
+            spec = {'selector': spec}
+        selector = spec.get('selector')
+        if not selector:
+            raise ValueError(f"Extraction field '{name}' has no selector")
+
+        import soupsieve
+        try:
+            compiled = soupsieve.compile(selector)
+        except soupsieve.SelectorSyntaxError as e:
+            raise ValueError(f"Invalid selector for field '{name}': {e}") from e
+
+        return cls(name, compiled, spec.get('attr'), bool(spec.get('many', False)),
+                   bool(spec.get('absolute', False)), spec.get('default'))
+
+    def _value(self, element, base_url: str) -> Optional[str]:
+        if self.attr is None:
+            return element.get_text(strip=True)
+        value = element.get(self.attr)
+        if isinstance(value, list):  # Multi-valued attributes such as class
+            value = ' '.join(value)
+        if value is not None and self.absolute:
+            value = urljoin(base_url, value)
+        return value
+
+    def apply(self, root, base_url: str) -> Any:
+        """
+        Extract field value from an element
+
+        Args:
+            root: Element to search within
+            base_url: URL used to resolve relative links
+
+        Returns:
+            Value, list of values if many, or the default when nothing matches
+        """
+        if self.many:
+            return [self._value(element, base_url) for element in self.selector.select(root)]
+        element = self.selector.select_one(root)
+        if element is None:
+            return self.default
+        return self._value(element, base_url)
+
+
+class ExtractionRules:
+    """Declarative extraction rules compiled once and applied to many pages"""
+
+    def __init__(self, fields: List[FieldRule], item_selector: Optional[Any] = None,
+                 next_page: Optional[FieldRule] = None, parser: str = 'html.parser'):
+        """
+        Initialize extraction rules
+
+        Args:
+            fields: Compiled field rules
+            item_selector: Compiled selector of repeated items (None means one record per page)
+            next_page: Rule extracting the next page link
+            parser: BeautifulSoup tree builder name
+        """
+        self.fields = fields
+        self.item_selector = item_selector
+        self.next_page = next_page
+        self.parser = parser
+
+    @classmethod
+    def from_config(cls, section: Dict[str, Any]) -> "ExtractionRules":
+        """
+        Compile rules from the `extraction` config section
+
+        Args:
+            section: Dictionary with fields, optional item_selector, next_page and parser
+
+        Returns:
+            Compiled ExtractionRules
+
+        Raises:
+            ValueError: If the section has no fields or a selector is invalid
+        """
+        fields_spec = section.get('fields') or {}
+        if not fields_spec:
+            raise ValueError("Extraction config has no fields")
+
+        import soupsieve
+
+        fields = [FieldRule.compile(name, spec) for name, spec in fields_spec.items()]
+        item_selector = None
+        if section.get('item_selector'):
+            try:
+                item_selector = soupsieve.compile(section['item_selector'])
+            except soupsieve.SelectorSyntaxError as e:
+                raise ValueError(f"Invalid item_selector: {e}") from e
+
+        next_page = None
+        if section.get('next_page'):
+            spec = section['next_page']
+            if isinstance(spec, str):
+                spec = {'selector': spec}
+            next_page = FieldRule.compile('next_page', dict({'attr': 'href', 'absolute': True}, **spec))
+
+        return cls(fields, item_selector, next_page, section.get('parser', 'html.parser'))
+
+    def extract(self, html: str, base_url: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Apply rules to one page
+
+        Args:
+            html: HTML document text
+            base_url: URL the document was fetched from
+
+        Returns:
+            Tuple of (records, absolute next page URL or None)
+        """
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, self.parser)
+        items = self.item_selector.select(soup) if self.item_selector is not None else [soup]
+        records = [{rule.name: rule.apply(item, base_url) for rule in self.fields} for item in items]
+        next_url = self.next_page.apply(soup, base_url) if self.next_page is not None else None
+        return records, next_url
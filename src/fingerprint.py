@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+try:
+    from .registry import shared_instance
+except ImportError:
+    from registry import shared_instance
+
+SIMHASH_BITS = 64
+
+_SCRIPT_RE = re.compile(r'<(script|style)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]*>')
+_WORD_RE = re.compile(r'\w+')
+_HEAD_END_RE = re.compile(r'</head\s*>|<body\b', re.IGNORECASE)
+_TITLE_RE = re.compile(r'<title\b[^>]*>(.*?)</title\s*>', re.IGNORECASE | re.DOTALL)
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """Exact and near-duplicate signatures of a page"""
+    exact: bytes
+    simhash: int
+    words: int
+    head: bytes = b''
+
+
+def _hash64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+def simhash(features: Iterable[bytes]) -> int:
+    """
+    Compute 64-bit SimHash of a set of features
+
+    Bit b of the result is set when more than half of the feature hashes
+    have it set. Columns are counted with bit-sliced counters: plane k holds
+    bit k of every column's count, so adding a hash costs a few big-int
+    operations instead of one per bit.
+
+    Args:
+        features: Distinct features (e.g. word shingles)
+
+    Returns:
+        SimHash as an unsigned integer
+    """
+    planes: List[int] = []
+    count = 0
+    for feature in features:
+        count += 1
+        carry = _hash64(feature)
+        for k in range(len(planes)):
+            planes[k], carry = planes[k] ^ carry, planes[k] & carry
+            if not carry:
+                break
+        if carry:
+            planes.append(carry)
+
+    result = 0
+    for bit in range(SIMHASH_BITS):
+        ones = sum(((plane >> bit) & 1) << k for k, plane in enumerate(planes))
+        if 2 * ones > count:
+            result |= 1 << bit
+    return result
+
+
+def _words(html: str) -> List[str]:
+    return _WORD_RE.findall(_TAG_RE.sub(' ', _SCRIPT_RE.sub(' ', html)).lower())
+
+
+def page_fingerprint(content: bytes, encoding: Optional[str] = None, shingle_size: int = 3) -> Fingerprint:
+    """
+    Fingerprint a page body
+
+    The exact hash covers the raw bytes. The SimHash covers word shingles of
+    the visible text (tags, scripts and styles removed, lowercased), so
+    pages that differ only in markup or a few tokens such as timestamps or
+    session ids get signatures a few bits apart. The head hash covers the
+    text of the document head (or the title if there is no head), which
+    barely moves the SimHash but must match for a near duplicate.
+
+    Args:
+        content: Raw response body
+        encoding: Response encoding (None uses UTF-8)
+        shingle_size: Words per shingle
+
+    Returns:
+        Fingerprint of the page
+    """
+    exact = hashlib.blake2b(content, digest_size=16).digest()
+    try:
+        html = content.decode(encoding or 'utf-8', errors='replace')
+    except LookupError:
+        html = content.decode('utf-8', errors='replace')
+    words = _words(html)
+    shingles = {' '.join(words[i:i + shingle_size]).encode('utf-8')
+                for i in range(max(len(words) - shingle_size + 1, 1))}
+
+    head_end = _HEAD_END_RE.search(html)
+    if head_end is not None:
+        head_words = _words(html[:head_end.start()])
+    else:
+        title = _TITLE_RE.search(html)
+        head_words = _words(title.group(1)) if title is not None else []
+    head = hashlib.blake2b(' '.join(head_words).encode('utf-8'), digest_size=8).digest()
+    return Fingerprint(exact, simhash(shingles), len(words), head)
+
+
+@dataclass
+class _Entry:
+    namespace: Hashable
+    fingerprint: Fingerprint
+    result: Any
+
+
+class FingerprintIndex:
+    """
+    Bounded index of recent page fingerprints and their extraction results
+
+    Near duplicates are found with banded lookups: the 64 SimHash bits are
+    split into max_distance + 1 bands, and two signatures at most
+    max_distance bits apart agree exactly on at least one band. Only
+    entries sharing a band are compared bit by bit, and only pages with the
+    same head text (and so the same title) match. The least recently used
+    entry is dropped when the index is full.
+    """
+
+    def __init__(self, max_entries: int = 100000, max_distance: int = 6, min_words: int = 50):
+        """
+        Initialize index
+
+        Args:
+            max_entries: Maximum fingerprints kept
+            max_distance: Maximum differing SimHash bits of a near duplicate (0 disables)
+            min_words: Pages with fewer words only match exact duplicates
+        """
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self.min_words = min_words
+        self._bands = self._band_masks(max_distance + 1) if max_distance > 0 else []
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._exact: Dict[Tuple[Hashable, bytes], int] = {}
+        self._band_index: Dict[Tuple[Hashable, int, int], Set[int]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _band_masks(bands: int) -> List[Tuple[int, int]]:
+        width = SIMHASH_BITS // bands
+        masks = []
+        for band in range(bands):
+            shift = band * width
+            bits = SIMHASH_BITS - shift if band == bands - 1 else width
+            masks.append((shift, (1 << bits) - 1))
+        return masks
+
+    def _band_keys(self, namespace: Hashable, fingerprint: Fingerprint) -> List[Tuple[Hashable, int, int]]:
+        if fingerprint.words < self.min_words:
+            return []
+        return [(namespace, band, (fingerprint.simhash >> shift) & mask)
+                for band, (shift, mask) in enumerate(self._bands)]
+
+    def lookup(self, namespace: Hashable, fingerprint: Fingerprint, near: bool = True) -> Optional[Tuple[str, Any]]:
+        """
+        Find a recent page matching a fingerprint
+
+        Args:
+            namespace: Kind of result stored (results of different extractions never match)
+            fingerprint: Fingerprint of the new page
+            near: Whether near duplicates match (False only reuses exact duplicates)
+
+        Returns:
+            ('exact' or 'near', stored result) or None if no page matches
+        """
+        with self._lock:
+            entry_id = self._exact.get((namespace, fingerprint.exact))
+            kind = 'exact'
+            if entry_id is None and near:
+                kind = 'near'
+                for key in self._band_keys(namespace, fingerprint):
+                    for candidate in self._band_index.get(key, ()):
+                        other = self._entries[candidate].fingerprint
+                        if (other.head == fingerprint.head and
+                                bin(other.simhash ^ fingerprint.simhash).count('1') <= self.max_distance):
+                            entry_id = candidate
+                            break
+                    if entry_id is not None:
+                        break
+
+            if entry_id is None:
+                self.misses += 1
+                return None
+            if kind == 'exact':
+                self.exact_hits += 1
+            else:
+                self.near_hits += 1
+            self._entries.move_to_end(entry_id)
+            return kind, self._entries[entry_id].result
+
+    def add(self, namespace: Hashable, fingerprint: Fingerprint, result: Any) -> None:
+        """
+        Remember the extraction result of a page
+
+        Args:
+            namespace: Kind of result stored
+            fingerprint: Fingerprint of the page
+            result: Extraction result to reuse for duplicates
+        """
+        with self._lock:
+            if (namespace, fingerprint.exact) in self._exact:
+                return
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = _Entry(namespace, fingerprint, result)
+            self._exact[(namespace, fingerprint.exact)] = entry_id
+            for key in self._band_keys(namespace, fingerprint):
+                self._band_index.setdefault(key, set()).add(entry_id)
+
+            while len(self._entries) > self.max_entries:
+                self._evict()
+
+    def _evict(self) -> None:
+        entry_id, entry = self._entries.popitem(last=False)
+        del self._exact[(entry.namespace, entry.fingerprint.exact)]
+        for key in self._band_keys(entry.namespace, entry.fingerprint):
+            bucket = self._band_index[key]
+            bucket.discard(entry_id)
+            if not bucket:
+                del self._band_index[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get index counters
+
+        Returns:
+            Dictionary with entries, lookups, exact_hits, near_hits, misses and hit_rate
+        """
+        with self._lock:
+            lookups = self.exact_hits + self.near_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'lookups': lookups,
+                'exact_hits': self.exact_hits,
+                'near_hits': self.near_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.exact_hits + self.near_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+
+def shared_fingerprint_index(max_entries: int, max_distance: int = 6, min_words: int = 50) -> FingerprintIndex:
+    """Process-wide FingerprintIndex per set of settings"""
+    return shared_instance('fingerprint', (max_entries, max_distance, min_words),
+                           lambda: FingerprintIndex(max_entries, max_distance, min_words))
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+
+import hashlib
+import heapq
+import itertools
+import math
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Set
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url: str, base: Optional[str] = None) -> Optional[str]:
+    """
+    Normalize URL for deduplication
+
+    Resolves relative URLs, lowercases scheme and host, drops default ports
+    and fragments.
+
+    Args:
+        url: Absolute or relative URL
+        base: Base URL to resolve relative URLs against
+
+    Returns:
+        Normalized absolute URL or None if it is not an http(s) URL
+    """
+    url = url.strip()
+    if base is not None:
+        url = urljoin(base, url)
+
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return None
+
+    scheme = parts.scheme.lower()
+    if scheme not in _DEFAULT_PORTS or not parts.hostname:
+        return None
+
+    netloc = parts.hostname.lower()
+    if port is not None and port != _DEFAULT_PORTS[scheme]:
+        netloc = f"{netloc}:{port}"
+
+    return urlunsplit((scheme, netloc, parts.path or '/', parts.query, ''))
+
+
+def _hash64(item: str) -> int:
+    return int.from_bytes(hashlib.blake2b(item.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class BloomFilter:
+    """Fixed-size probabilistic set with a configurable false positive rate"""
+
+    def __init__(self, capacity: int = 1000000, error_rate: float = 0.001):
+        """
+        Initialize Bloom filter
+
+        Args:
+            capacity: Expected number of items
+            error_rate: Target false positive rate at full capacity
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        # Double hashing: k positions from two independent hashes
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, item: str) -> bool:
+        """
+        Add item
+
+        Args:
+            item: Item to add
+
+        Returns:
+            True if the item was not present before
+        """
+        added = False
+        for position in self._positions(item):
+            byte, bit = divmod(position, 8)
+            if not self._bits[byte] & (1 << bit):
+                self._bits[byte] |= 1 << bit
+                added = True
+        if added:
+            self._count += 1
+        return added
+
+    def __contains__(self, item: str) -> bool:
+        for position in self._positions(item):
+            byte, bit = divmod(position, 8)
+            if not self._bits[byte] & (1 << bit):
+                return False
+        return True
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def size_bytes(self) -> int:
+        """Memory used by the bit array"""
+        return len(self._bits)
+
+
+class HashedSeenSet:
+    """Exact-ish set storing 64-bit URL hashes instead of full strings"""
+
+    def __init__(self):
+        self._hashes: Set[int] = set()
+
+    def add(self, item: str) -> bool:
+        """
+        Add item
+
+        Args:
+            item: Item to add
+
+        Returns:
+            True if the item was not present before
+        """
+        key = _hash64(item)
+        if key in self._hashes:
+            return False
+        self._hashes.add(key)
+        return True
+
+    def __contains__(self, item: str) -> bool:
+        return _hash64(item) in self._hashes
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+
+@dataclass(frozen=True)
+class FrontierItem:
+    """URL scheduled for crawling"""
+    url: str
+    depth: int
+
+
+class CrawlFrontier:
+    """Priority frontier of URLs to crawl with dedup, depth and domain limits"""
+
+    def __init__(self, seen=None, max_depth: int = 2, allowed_domains: Optional[Iterable[str]] = None,
+                 max_pages_per_domain: int = 0):
+        """
+        Initialize crawl frontier
+
+        Args:
+            seen: Seen-URL set (BloomFilter or HashedSeenSet, default HashedSeenSet)
+            max_depth: Maximum link depth from the seeds
+            allowed_domains: Domains (and their subdomains) to stay on, None allows all
+            max_pages_per_domain: Maximum URLs scheduled per host (0 means unlimited)
+        """
+        self.seen = seen if seen is not None else HashedSeenSet()
+        self.max_depth = max_depth
+        self.allowed_domains = {d.lower() for d in allowed_domains} if allowed_domains else None
+        self.max_pages_per_domain = max_pages_per_domain
+        self._heap = []
+        self._counter = itertools.count()
+        self._per_domain: Dict[str, int] = {}
+
+    def _domain_allowed(self, host: str) -> bool:
+        if self.allowed_domains is None:
+            return True
+        return any(host == d or host.endswith('.' + d) for d in self.allowed_domains)
+
+    def push(self, url: str, depth: int = 0, priority: Optional[float] = None,
+             base: Optional[str] = None) -> bool:
+        """
+        Schedule URL if it is new and within the limits
+
+        Args:
+            url: URL to schedule
+            depth: Link depth from the seed
+            priority: Lower is crawled first (None uses depth, i.e. breadth first)
+            base: Base URL to resolve relative URLs against
+
+        Returns:
+            True if the URL was scheduled
+        """
+        if depth > self.max_depth:
+            return False
+
+        url = normalize_url(url, base)
+        if url is None:
+            return False
+
+        host = urlsplit(url).hostname
+        if not self._domain_allowed(host):
+            return False
+        if self.max_pages_per_domain and self._per_domain.get(host, 0) >= self.max_pages_per_domain:
+            return False
+        if not self.seen.add(url):
+            return False
+
+        self._per_domain[host] = self._per_domain.get(host, 0) + 1
+        heapq.heappush(self._heap, (depth if priority is None else priority, next(self._counter), url, depth))
+        return True
+
+    def pop(self) -> Optional[FrontierItem]:
+        """
+        Take the highest priority URL
+
+        Returns:
+            FrontierItem or None if the frontier is empty
+        """
+        if not self._heap:
+            return None
+        _, _, url, depth = heapq.heappop(self._heap)
+        return FrontierItem(url, depth)
+
+    def __len__(self) -> int:
+        return len(self._heap)
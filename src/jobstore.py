@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+
+import itertools
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+PENDING = 'pending'
+IN_FLIGHT = 'in_flight'
+DONE = 'done'
+FAILED = 'failed'
+
+_STOP = object()
+
+
+class JobStore:
+    """SQLite (WAL) store of URL job state with batched status updates"""
+
+    def __init__(self, path: str, batch_size: int = 1000, flush_interval: float = 0.5):
+        """
+        Initialize job store
+
+        Args:
+            path: Path to SQLite database file
+            batch_size: Maximum status updates committed in one transaction
+            flush_interval: Maximum seconds an update waits before being committed
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = self._connect()
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            ' url TEXT PRIMARY KEY,'
+            ' status TEXT NOT NULL,'
+            ' attempts INTEGER NOT NULL DEFAULT 0,'
+            ' result TEXT,'
+            ' error TEXT,'
+            ' updated_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)')
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+        # Status updates are queued and committed in batches by a writer thread
+        self._updates: queue.Queue = queue.Queue()
+        self._write_error: Optional[Exception] = None
+        self._writer_conn = self._connect()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def add_urls(self, urls: Iterable[str], chunk_size: int = 10000) -> int:
+        """
+        Add URLs as pending jobs, ignoring URLs already in the store
+
+        Args:
+            urls: Iterable of URLs, consumed lazily in chunks
+            chunk_size: URLs inserted per transaction
+
+        Returns:
+            Number of newly added URLs
+        """
+        added = 0
+        url_iter = iter(urls)
+        while True:
+            chunk = list(itertools.islice(url_iter, chunk_size))
+            if not chunk:
+                return added
+            now = time.time()
+            with self._lock:
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO jobs (url, status, updated_at) VALUES (?, ?, ?)',
+                    ((url, PENDING, now) for url in chunk)
+                )
+                self._conn.commit()
+                added += self._conn.total_changes - before
+
+    def claim(self, limit: int) -> List[str]:
+        """
+        Take pending URLs and mark them in flight
+
+        Args:
+            limit: Maximum number of URLs to claim
+
+        Returns:
+            List of claimed URLs (empty when nothing is pending)
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            rows = self._conn.execute(
+                'SELECT url FROM jobs WHERE status = ? LIMIT ?', (PENDING, limit)
+            ).fetchall()
+            urls = [row[0] for row in rows]
+            self._conn.executemany(
+                'UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = ? WHERE url = ?',
+                ((IN_FLIGHT, now, url) for url in urls)
+            )
+            self._conn.commit()
+        return urls
+
+    def mark_done(self, url: str, result: Any = None) -> None:
+        """
+        Record successful job (committed asynchronously in a batch)
+
+        Args:
+            url: Job URL
+            result: JSON-serializable result
+        """
+        self._updates.put((DONE, json.dumps(result, ensure_ascii=False), None, time.time(), url))
+
+    def mark_failed(self, url: str, error: Optional[str] = None) -> None:
+        """
+        Record failed job (committed asynchronously in a batch)
+
+        Args:
+            url: Job URL
+            error: Error description
+        """
+        self._updates.put((FAILED, None, error, time.time(), url))
+
+    def resume(self, max_attempts: int = 0) -> int:
+        """
+        Prepare store for resuming an interrupted run
+
+        Jobs left in flight by a crashed run go back to pending, and failed
+        jobs with fewer than max_attempts attempts are queued for retry.
+
+        Args:
+            max_attempts: Retry failed jobs below this attempt count (0 disables)
+
+        Returns:
+            Number of jobs moved back to pending
+        """
+        self.flush()
+        now = time.time()
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute('UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?',
+                               (PENDING, now, IN_FLIGHT))
+            if max_attempts:
+                self._conn.execute(
+                    'UPDATE jobs SET status = ?, updated_at = ? WHERE status = ? AND attempts < ?',
+                    (PENDING, now, FAILED, max_attempts)
+                )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Get number of jobs per status
+
+        Returns:
+            Dictionary of status -> count
+        """
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall()
+        result = {PENDING: 0, IN_FLIGHT: 0, DONE: 0, FAILED: 0}
+        result.update(dict(rows))
+        return result
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Get state of one job
+
+        Args:
+            url: Job URL
+
+        Returns:
+            Dictionary with status, attempts, result and error, or None if unknown
+        """
+        self.flush()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status, attempts, result, error FROM jobs WHERE url = ?', (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        status, attempts, result, error = row
+        return {'status': status, 'attempts': attempts,
+                'result': json.loads(result) if result is not None else None, 'error': error}
+
+    def flush(self) -> None:
+        """
+        Wait until all queued status updates are committed
+
+        Raises:
+            sqlite3.Error: If a batch queued since the last flush could not be committed
+        """
+        self._updates.join()
+        self._raise_write_error()
+
+    def close(self) -> None:
+        """
+        Commit queued updates and close the database
+
+        Raises:
+            sqlite3.Error: If a batch queued since the last flush could not be committed
+        """
+        self._updates.put(_STOP)
+        self._writer.join()
+        with self._lock:
+            self._conn.close()
+        self._raise_write_error()
+
+    def _raise_write_error(self) -> None:
+        with self._lock:
+            error, self._write_error = self._write_error, None
+        if error is not None:
+            raise error
+
+    def __enter__(self) -> "JobStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _write_loop(self) -> None:
+        conn = self._writer_conn
+        try:
+            while True:
+                batch = [self._updates.get()]
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size and batch[-1] is not _STOP:
+                    try:
+                        batch.append(self._updates.get(timeout=max(0.0, deadline - time.monotonic())))
+                    except queue.Empty:
+                        break
+
+                updates = [item for item in batch if item is not _STOP]
+                try:
+                    if updates:
+                        conn.executemany(
+                            'UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE url = ?',
+                            updates
+                        )
+                        conn.commit()
+                except Exception as e:
+                    # Keep the writer alive and hand the error to the next flush() instead of hanging it
+                    conn.rollback()
+                    with self._lock:
+                        if self._write_error is None:
+                            self._write_error = e
+                finally:
+                    for _ in batch:
+                        self._updates.task_done()
+                if len(updates) < len(batch):
+                    return
+        finally:
+            conn.close()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator, Optional
+
+import requests
+
+try:
+    from .politeness import ASYNC_POLL_INTERVAL
+    from .registry import shared_instance
+except ImportError:
+    from politeness import ASYNC_POLL_INTERVAL
+    from registry import shared_instance
+
+
+class ResponseTooLarge(requests.RequestException):
+    """Response body exceeds the configured size cap"""
+
+
+class ByteBudget:
+    """Process-wide budget of response bytes held in memory at once"""
+
+    def __init__(self, limit_bytes: int):
+        """
+        Initialize budget
+
+        Args:
+            limit_bytes: Bytes that may be reserved at the same time
+        """
+        self.limit_bytes = limit_bytes
+        self.in_use = 0
+        self.peak = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, n: int) -> None:
+        """
+        Reserve bytes, waiting while the budget is exhausted
+
+        A reservation larger than the whole budget is admitted once nothing
+        else is reserved, so it cannot wait forever.
+
+        Args:
+            n: Bytes to reserve
+        """
+        with self._cond:
+            while not self._admits(n):
+                self._cond.wait()
+            self._add(n)
+
+    async def acquire_async(self, n: int) -> None:
+        """
+        Asyncio version of acquire, sharing the same budget
+
+        Waiting never blocks the event loop: an exhausted budget is polled
+        every ASYNC_POLL_INTERVAL seconds instead of waiting on the condition.
+
+        Args:
+            n: Bytes to reserve
+        """
+        import asyncio
+
+        while True:
+            with self._cond:
+                if self._admits(n):
+                    self._add(n)
+                    return
+            await asyncio.sleep(ASYNC_POLL_INTERVAL)
+
+    def grow(self, n: int) -> None:
+        """
+        Extend an existing reservation without waiting
+
+        Used when a body without Content-Length outgrows its initial
+        reservation; waiting here could deadlock fetches that already hold
+        part of the budget. New fetches still wait until usage drops.
+
+        Args:
+            n: Additional bytes
+        """
+        with self._cond:
+            self._add(n)
+
+    def release(self, n: int) -> None:
+        """
+        Return reserved bytes to the budget
+
+        Args:
+            n: Bytes to release
+        """
+        with self._cond:
+            self.in_use -= n
+            self._cond.notify_all()
+
+    def _admits(self, n: int) -> bool:
+        return not self.in_use or self.in_use + n <= self.limit_bytes
+
+    def _add(self, n: int) -> None:
+        self.in_use += n
+        self.peak = max(self.peak, self.in_use)
+
+
+class BufferedResponse:
+    """
+    Fully read response body, other attributes come from the wrapped response
+
+    Decoded text is materialized on first access of .text only. The body
+    is the bytearray it was read into, not a bytes copy.
+    """
+
+    def __init__(self, response: requests.Response, content: bytearray):
+        self._response = response
+        self.content = content
+        self._text: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = decode_body(self.content, self._response.encoding)
+        return self._text
+
+    def iter_content(self, chunk_size: int = 1, decode_unicode: bool = False) -> Iterator[bytes]:
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def __getattr__(self, name: str):
+        return getattr(self._response, name)
+
+
+def decode_body(content: bytes, encoding: Optional[str]) -> str:
+    """Decode a response body, falling back to UTF-8 for unknown charsets like requests does"""
+    try:
+        return content.decode(encoding or 'utf-8', errors='replace')
+    except LookupError:
+        return content.decode('utf-8', errors='replace')
+
+
+def content_length(response: requests.Response) -> Optional[int]:
+    """Declared Content-Length of a response, None if missing or invalid"""
+    try:
+        return int(response.headers['Content-Length'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+@contextmanager
+def read_limited(response: requests.Response, max_bytes: int = 0, budget: Optional[ByteBudget] = None,
+                 chunk_size: int = 65536) -> Iterator[BufferedResponse]:
+    """
+    Read a streamed response body within a size cap and memory budget
+
+    The budget reservation (Content-Length if declared, otherwise one chunk
+    growing as data arrives) is held until the with block exits, so it
+    covers parsing of the body too. A declared length is never trusted
+    beyond max_bytes: the reservation is capped at the whole budget and the
+    buffer at one chunk, so a server declaring a huge body it never sends
+    cannot claim the memory.
+
+    Args:
+        response: Response opened with stream=True
+        max_bytes: Abort once the body exceeds this many bytes (0 disables)
+        budget: Shared budget to reserve the body's bytes from (None disables)
+        chunk_size: Bytes per read
+
+    Yields:
+        BufferedResponse with the complete body
+
+    Raises:
+        ResponseTooLarge: If Content-Length or the bytes read exceed max_bytes
+    """
+    declared = content_length(response)
+    if max_bytes and declared is not None and declared > max_bytes:
+        raise ResponseTooLarge(f"Content-Length {declared} exceeds limit of {max_bytes} bytes")
+
+    reserved = 0
+    if budget is not None:
+        reserved = min(declared, max_bytes or budget.limit_bytes) if declared is not None else chunk_size
+        budget.acquire(reserved)
+    try:
+        # Chunks are copied into one preallocated buffer, so the body is never
+        # held twice (as chunks and joined) during the read
+        body = bytearray(min(declared, max_bytes or chunk_size) if declared is not None else 0)
+        received = 0
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            end = received + len(chunk)
+            if max_bytes and end > max_bytes:
+                raise ResponseTooLarge(f"Body exceeds limit of {max_bytes} bytes")
+            if budget is not None and end > reserved:
+                budget.grow(end - reserved)
+                reserved = end
+            body[received:end] = chunk
+            received = end
+        del body[received:]
+        yield BufferedResponse(response, body)
+    finally:
+        if budget is not None:
+            budget.release(reserved)
+
+
+@asynccontextmanager
+async def read_limited_async(response, max_bytes: int = 0, budget: Optional[ByteBudget] = None,
+                             chunk_size: int = 65536) -> AsyncIterator[str]:
+    """
+    Asyncio version of read_limited for aiohttp responses
+
+    Reserves from the same budget with the same rules, so threaded and
+    asyncio fetches share one bound on response memory.
+
+    Args:
+        response: aiohttp.ClientResponse whose body has not been read yet
+        max_bytes: Abort once the body exceeds this many bytes (0 disables)
+        budget: Shared budget to reserve the body's bytes from (None disables)
+        chunk_size: Bytes per read
+
+    Yields:
+        Decoded body text
+
+    Raises:
+        ResponseTooLarge: If Content-Length or the bytes read exceed max_bytes
+    """
+    declared = response.content_length
+    if max_bytes and declared is not None and declared > max_bytes:
+        raise ResponseTooLarge(f"Content-Length {declared} exceeds limit of {max_bytes} bytes")
+
+    reserved = 0
+    if budget is not None:
+        reserved = min(declared, max_bytes or budget.limit_bytes) if declared is not None else chunk_size
+        await budget.acquire_async(reserved)
+    try:
+        body = bytearray(min(declared, max_bytes or chunk_size) if declared is not None else 0)
+        received = 0
+        async for chunk in response.content.iter_chunked(chunk_size):
+            end = received + len(chunk)
+            if max_bytes and end > max_bytes:
+                raise ResponseTooLarge(f"Body exceeds limit of {max_bytes} bytes")
+            if budget is not None and end > reserved:
+                budget.grow(end - reserved)
+                reserved = end
+            body[received:end] = chunk
+            received = end
+        del body[received:]
+        yield decode_body(body, response.charset)
+    finally:
+        if budget is not None:
+            budget.release(reserved)
+
+
+def shared_byte_budget(limit_bytes: int) -> ByteBudget:
+    """Process-wide ByteBudget per limit"""
+    return shared_instance('byte_budget', limit_bytes, lambda: ByteBudget(limit_bytes))
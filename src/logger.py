@@ -1,33 +1,48 @@
 #!/usr/bin/env python3
 
+import atexit
+import copy
 import logging
+import logging.handlers
 import os
-from typing import Optional
+import queue
+import threading
+from typing import Dict, Optional, Tuple
 
 try:
-    from .config import Config
+    from .config import Config, shared_config
 except ImportError:
-    from config import Config
+    from config import Config, shared_config
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock prepare() formats the record (and any traceback) on the calling
+        # thread. Only the args are merged here, so later changes to mutable args do
+        # not alter the message; timestamps and tracebacks are formatted by the
+        # listener's handlers.
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        return record
 
 
 class ScraperLogger:
     """Handles logging configuration and setup for the scraper"""
 
+    # One queue + listener per distinct handler configuration, shared process-wide
+    _pipelines: Dict[Tuple, Tuple[logging.handlers.QueueHandler, logging.handlers.QueueListener]] = {}
+    _pipelines_lock = threading.Lock()
+
     def __init__(self, name: str, config: Optional[Config] = None):
-        self.config = config or Config()
+        self.config = config or shared_config()
         self.logger = self._setup_logger(name)
 
     def _setup_logger(self, name: str) -> logging.Logger:
         """Setup logging with configuration from config file"""
         # Load configuration values
-        log_file = self.config.fetch_config_value('logging', 'file_path', 'logs/scraper.log')
         log_level = self.config.fetch_config_value('logging', 'level', 'INFO')
-        console_output = self.config.fetch_config_value('logging', 'console_output', True)
-        console_format = self.config.fetch_config_value('logging', 'console_log_format', '%(levelname)s - %(message)s')
-        file_format = self.config.fetch_config_value('logging', 'file_log_format', '%(asctime)s - %(levelname)s - %(message)s')
-
-        # Create logs directory
-        os.makedirs(os.path.dirname(log_file), exist_ok=True)
 
         # Create custom logger
         logger = logging.getLogger(name)
@@ -36,25 +51,74 @@ class ScraperLogger:
         # Clear existing handlers to avoid duplicates
         logger.handlers.clear()
 
-        # File handler
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_formatter = logging.Formatter(file_format)
-        file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
-
-        # Console handler (if enabled)
-        if console_output:
-            console_handler = logging.StreamHandler()
-            console_formatter = logging.Formatter(console_format)
-            console_handler.setFormatter(console_formatter)
-            logger.addHandler(console_handler)
+        # Records only go onto a queue here, disk and console I/O happen on the listener thread
+        queue_handler, listener = self._get_pipeline()
+        logger.addHandler(queue_handler)
+        self.handlers = listener.handlers
 
         return logger
 
+    def _get_pipeline(self) -> Tuple[logging.handlers.QueueHandler, logging.handlers.QueueListener]:
+        """Get shared queue handler and listener for the configured outputs"""
+        log_file = self.config.fetch_config_value('logging', 'file_path', 'logs/scraper.log')
+        max_file_size_mb = self.config.fetch_config_value('logging', 'max_file_size_mb', 10)
+        backup_count = self.config.fetch_config_value('logging', 'backup_count', 5)
+        console_output = self.config.fetch_config_value('logging', 'console_output', True)
+        console_format = self.config.fetch_config_value('logging', 'console_log_format', '%(levelname)s - %(message)s')
+        file_format = self.config.fetch_config_value('logging', 'file_log_format', '%(asctime)s - %(levelname)s - %(message)s')
+
+        key = (os.path.abspath(log_file), max_file_size_mb, backup_count,
+               console_output, console_format, file_format)
+
+        with self._pipelines_lock:
+            pipeline = self._pipelines.get(key)
+            if pipeline is not None:
+                return pipeline
+
+            # Create logs directory
+            os.makedirs(os.path.dirname(log_file), exist_ok=True)
+
+            # Rotating file handler enforcing max_file_size_mb
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file,
+                maxBytes=int(max_file_size_mb * 1024 * 1024),
+                backupCount=backup_count,
+                encoding='utf-8',
+            )
+            file_handler.setFormatter(logging.Formatter(file_format))
+            handlers = [file_handler]
+
+            # Console handler (if enabled)
+            if console_output:
+                console_handler = logging.StreamHandler()
+                console_handler.setFormatter(logging.Formatter(console_format))
+                handlers.append(console_handler)
+
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+            listener.start()
+
+            pipeline = (_QueueHandler(log_queue), listener)
+            self._pipelines[key] = pipeline
+            return pipeline
+
     def get_logger(self) -> logging.Logger:
         """Get the configured logger instance"""
         return self.logger
 
+    @classmethod
+    def shutdown(cls) -> None:
+        """Flush queued records and close all shared handlers"""
+        with cls._pipelines_lock:
+            for _, listener in cls._pipelines.values():
+                listener.stop()
+                for handler in listener.handlers:
+                    handler.close()
+            cls._pipelines.clear()
+
+
+atexit.register(ScraperLogger.shutdown)
+
 
 if __name__ == "__main__":
     # Test the logger
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+
+import atexit
+import bisect
+import os
+import tempfile
+import threading
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+try:
+    from .registry import pop_shared, shared_instance
+except ImportError:
+    from registry import pop_shared, shared_instance
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram, cheap to update"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one value"""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate quantile from bucket counts
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Upper bound of the bucket holding the quantile, or None if empty
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.buckets[i] if i < len(self.buckets) else float('inf')
+        return float('inf')
+
+    def as_dict(self) -> Dict[str, float]:
+        """Snapshot with count, sum, mean and p50/p90/p99 estimates"""
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else None,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99),
+        }
+
+
+class HostMetrics:
+    """Aggregated request metrics of one host"""
+
+    PHASES = ('ttfb', 'download', 'parse', 'total')
+
+    def __init__(self):
+        self.phases = {phase: Histogram() for phase in self.PHASES}
+        self.retries = Histogram((0, 1, 2, 3, 5, 10))
+        self.status_codes: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.attempts = 0
+        self.requests = 0
+        self.bytes_received = 0
+
+
+class MetricsRegistry:
+    """Per-host request metrics with Prometheus text export"""
+
+    def __init__(self):
+        self._hosts: Dict[str, HostMetrics] = {}
+        self._lock = threading.Lock()
+
+    def _host(self, host: str) -> HostMetrics:
+        metrics = self._hosts.get(host)
+        if metrics is None:
+            metrics = self._hosts[host] = HostMetrics()
+        return metrics
+
+    def observe_attempt(self, host: str, status: Optional[int] = None, error: Optional[str] = None,
+                        bytes_received: int = 0, **phases: Optional[float]) -> None:
+        """
+        Record one request attempt
+
+        Args:
+            host: Request host
+            status: HTTP status code, if a response was received
+            error: Error class name for failed attempts (timeout, connection_error, ...)
+            bytes_received: Response body bytes read
+            **phases: Phase durations in seconds (ttfb, download, parse, total)
+        """
+        with self._lock:
+            metrics = self._host(host)
+            metrics.attempts += 1
+            metrics.bytes_received += bytes_received
+            if status is not None:
+                metrics.status_codes[status] += 1
+            if error is not None:
+                metrics.errors[error] += 1
+            for phase, seconds in phases.items():
+                if seconds is not None:
+                    metrics.phases[phase].observe(seconds)
+
+    def observe_request(self, host: str, retries: int) -> None:
+        """
+        Record a finished request (all attempts)
+
+        Args:
+            host: Request host
+            retries: Number of retries the request needed
+        """
+        with self._lock:
+            metrics = self._host(host)
+            metrics.requests += 1
+            metrics.retries.observe(retries)
+
+    def snapshot(self) -> Dict[str, dict]:
+        """
+        Get metrics of all hosts
+
+        Returns:
+            Dictionary of host -> metrics dictionary
+        """
+        with self._lock:
+            return {
+                host: {
+                    'requests': m.requests,
+                    'attempts': m.attempts,
+                    'bytes_received': m.bytes_received,
+                    'status_codes': dict(m.status_codes),
+                    'errors': dict(m.errors),
+                    'retries': m.retries.as_dict(),
+                    'phases': {phase: h.as_dict() for phase, h in m.phases.items()},
+                }
+                for host, m in self._hosts.items()
+            }
+
+    def to_prometheus(self) -> str:
+        """
+        Render metrics in Prometheus text exposition format
+
+        Returns:
+            Metrics text
+        """
+        lines = [
+            '# HELP scraper_phase_seconds Request phase durations per host',
+            '# TYPE scraper_phase_seconds histogram',
+        ]
+        with self._lock:
+            hosts = sorted(self._hosts.items())
+            for host, m in hosts:
+                for phase, histogram in m.phases.items():
+                    labels = f'host="{_escape(host)}",phase="{phase}"'
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + (float('inf'),), histogram.counts):
+                        cumulative += count
+                        le = '+Inf' if bound == float('inf') else repr(bound)
+                        lines.append(f'scraper_phase_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+                    lines.append(f'scraper_phase_seconds_sum{{{labels}}} {histogram.sum}')
+                    lines.append(f'scraper_phase_seconds_count{{{labels}}} {histogram.count}')
+
+            for name, help_text, value in [
+                ('scraper_requests_total', 'Finished requests per host', lambda m: m.requests),
+                ('scraper_attempts_total', 'Request attempts per host', lambda m: m.attempts),
+                ('scraper_retries_total', 'Retries per host', lambda m: int(m.retries.sum)),
+                ('scraper_bytes_received_total', 'Response bytes per host', lambda m: m.bytes_received),
+            ]:
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+                lines += [f'{name}{{host="{_escape(host)}"}} {value(m)}' for host, m in hosts]
+
+            lines += ['# HELP scraper_responses_total Responses per host and status code',
+                      '# TYPE scraper_responses_total counter']
+            for host, m in hosts:
+                for status, count in sorted(m.status_codes.items()):
+                    lines.append(f'scraper_responses_total{{host="{_escape(host)}",status="{status}"}} {count}')
+
+            lines += ['# HELP scraper_errors_total Failed attempts per host and error',
+                      '# TYPE scraper_errors_total counter']
+            for host, m in hosts:
+                for error, count in sorted(m.errors.items()):
+                    lines.append(f'scraper_errors_total{{host="{_escape(host)}",error="{error}"}} {count}')
+
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Atomically write Prometheus text file (e.g. for node_exporter's textfile collector)
+
+        Args:
+            path: Output file path
+        """
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.metrics-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class PrometheusFileExporter:
+    """Background thread writing a registry to a Prometheus text file periodically"""
+
+    def __init__(self, registry: MetricsRegistry, path: str, interval: float = 15):
+        """
+        Initialize exporter
+
+        Args:
+            registry: Metrics registry to export
+            path: Output file path
+            interval: Seconds between writes
+        """
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> "PrometheusFileExporter":
+        """Start writing in the background"""
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the thread after writing a final snapshot (safe to call more than once)"""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.registry.write_prometheus(self.path)
+        self.registry.write_prometheus(self.path)
+
+
+_shared_registry = MetricsRegistry()
+
+
+def shared_metrics_registry(prometheus_path: Optional[str] = None, interval: float = 15) -> MetricsRegistry:
+    """
+    Get process-wide metrics registry, starting a file exporter for the path if needed
+
+    Args:
+        prometheus_path: Prometheus text file to write periodically (None disables export)
+        interval: Seconds between writes
+
+    Returns:
+        MetricsRegistry shared by all scrapers in the process
+    """
+    if prometheus_path:
+        shared_instance('prometheus_exporter', prometheus_path,
+                        lambda: PrometheusFileExporter(_shared_registry, prometheus_path, interval).start())
+    return _shared_registry
+
+
+def stop_exporters() -> None:
+    """Stop all file exporters, each writing a final snapshot"""
+    for exporter in pop_shared('prometheus_exporter'):
+        exporter.stop()
+
+
+# Runs shorter than export_interval would otherwise never write the file
+atexit.register(stop_exporters)
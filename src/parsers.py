@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+
+import codecs
+import re
+from html import unescape
+from html.parser import HTMLParser
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin
+
+
+class TitleParser(HTMLParser):
+    """Incremental HTML parser that stops as soon as the title is known"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title: Optional[str] = None
+        self.done = False
+        self._in_title = False
+        self._parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'title' and not self.done:
+            self._in_title = True
+        elif tag == 'body':
+            # Title must be in head, no point scanning the body
+            self.done = True
+
+    def handle_endtag(self, tag):
+        if tag == 'title' and self._in_title:
+            self._in_title = False
+            self.title = ''.join(self._parts).strip() or None
+            self.done = True
+        elif tag == 'head':
+            self.done = True
+
+    def handle_data(self, data):
+        if self._in_title:
+            self._parts.append(data)
+
+
+def scan_title(chunks: Iterable[bytes], encoding: Optional[str] = None,
+               max_bytes: int = 65536) -> Optional[str]:
+    """
+    Extract page title from a stream of body chunks
+
+    Stops consuming chunks as soon as </title> (or <body>) has been seen,
+    or after max_bytes have been scanned.
+
+    Args:
+        chunks: Iterable of raw body chunks
+        encoding: Body encoding (None uses UTF-8)
+        max_bytes: Maximum number of bytes to scan
+
+    Returns:
+        Stripped title or None if not found within the scanned bytes
+    """
+    try:
+        decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+    except LookupError:
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    parser = TitleParser()
+    scanned = 0
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        chunk = chunk[:max_bytes - scanned]
+        scanned += len(chunk)
+        parser.feed(decoder.decode(chunk))
+        if parser.done or scanned >= max_bytes:
+            break
+
+    if not parser.done:
+        # Flush buffered text, e.g. a title cut off by the byte cap
+        parser.feed(decoder.decode(b'', final=True))
+        parser.close()
+        if parser.title is None and parser._in_title:
+            parser.title = ''.join(parser._parts).strip() or None
+
+    return parser.title
+
+
+_TITLE_RE = re.compile(r'<title\b[^>]*>(.*?)</title\s*>', re.IGNORECASE | re.DOTALL)
+
+
+def _soup_title(html: str) -> Optional[str]:
+    """Full BeautifulSoup tree with the built-in html.parser"""
+    from bs4 import BeautifulSoup  # Imported on first parse to keep startup fast
+
+    soup = BeautifulSoup(html, 'html.parser')
+    if soup.title and soup.title.string:
+        return soup.title.string.strip() or None
+    return None
+
+
+def _strainer_title(html: str) -> Optional[str]:
+    """BeautifulSoup parse restricted to <title> elements"""
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    soup = BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer('title'))
+    title = soup.find('title')
+    if title and title.string:
+        return title.string.strip() or None
+    return None
+
+
+def _lxml_title(html: str) -> Optional[str]:
+    """lxml C parser, no BeautifulSoup tree"""
+    import lxml.html
+
+    if not html.strip():
+        return None
+    try:
+        document = lxml.html.document_fromstring(html)
+    except (ValueError, lxml.etree.ParserError):
+        return None
+    title = document.find('.//title')
+    if title is not None and title.text:
+        return title.text.strip() or None
+    return None
+
+
+def _fast_title(html: str) -> Optional[str]:
+    """Zero-tree regex scan for the first <title> element"""
+    match = _TITLE_RE.search(html)
+    if match:
+        return unescape(match.group(1)).strip() or None
+    return None
+
+
+def _lxml_available() -> bool:
+    """Check whether the optional lxml backend can be imported"""
+    try:
+        import lxml.html  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+# name -> (title extractor, availability check, fallback name)
+TITLE_PARSERS: Dict[str, Tuple[Callable[[str], Optional[str]], Callable[[], bool], Optional[str]]] = {
+    'html.parser': (_soup_title, lambda: True, None),
+    'strainer': (_strainer_title, lambda: True, None),
+    'lxml': (_lxml_title, lambda: _lxml_available(), 'strainer'),
+    'fast': (_fast_title, lambda: True, None),
+}
+
+
+def resolve_title_parser(name: str) -> Tuple[str, Callable[[str], Optional[str]]]:
+    """
+    Resolve title parser backend by name, falling back if it is unavailable
+
+    Args:
+        name: Backend name (html.parser, strainer, lxml or fast)
+
+    Returns:
+        Tuple of (resolved backend name, title extractor function)
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if name not in TITLE_PARSERS:
+        raise ValueError(f"Unknown parser '{name}', choose from: {', '.join(TITLE_PARSERS)}")
+
+    while True:
+        parse, available, fallback = TITLE_PARSERS[name]
+        if available() or fallback is None:
+            return name, parse
+        name = fallback
+
+
+class LinkParser(HTMLParser):
+    """Collect <a href> links and the <base href> without building a tree"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.base: Optional[str] = None
+        self.links: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            for name, value in attrs:
+                if name == 'href' and value:
+                    self.links.append(value)
+        elif tag == 'base' and self.base is None:
+            for name, value in attrs:
+                if name == 'href' and value:
+                    self.base = value
+
+
+def extract_links(html: str, base_url: str) -> List[str]:
+    """
+    Extract absolute link URLs from an HTML document
+
+    Args:
+        html: HTML document text
+        base_url: URL the document was fetched from
+
+    Returns:
+        List of absolute URLs in document order (may contain duplicates)
+    """
+    parser = LinkParser()
+    parser.feed(html)
+    parser.close()
+    base = urljoin(base_url, parser.base) if parser.base else base_url
+    return [urljoin(base, link) for link in parser.links]
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+try:
+    from .fingerprint import page_fingerprint
+    from .parsers import resolve_title_parser
+except ImportError:
+    from fingerprint import page_fingerprint
+    from parsers import resolve_title_parser
+
+_DONE = object()
+
+
+def parse_page(url: str, content: bytes, encoding: Optional[str],
+               parser_name: str) -> Tuple[str, Optional[str], float]:
+    """
+    Decode raw page bytes and extract the title (runs in a worker process)
+
+    Args:
+        url: Page URL
+        content: Raw response body
+        encoding: Response encoding (None uses UTF-8)
+        parser_name: Title parser backend name
+
+    Returns:
+        Tuple of (url, title, seconds spent parsing)
+    """
+    start = time.perf_counter()
+    try:
+        html = content.decode(encoding or 'utf-8', errors='replace')
+    except LookupError:
+        html = content.decode('utf-8', errors='replace')
+    _, parse = resolve_title_parser(parser_name)
+    return url, parse(html), time.perf_counter() - start
+
+
+@dataclass
+class StageStats:
+    """Counters of one pipeline stage"""
+    name: str
+    items: int = 0
+    busy_seconds: float = 0.0
+    max_queue_depth: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, busy_seconds: float) -> None:
+        """Record one processed item"""
+        with self._lock:
+            self.items += 1
+            self.busy_seconds += busy_seconds
+
+    def observe_queue(self, depth: int) -> None:
+        """Track the high water mark of the stage's input queue"""
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+
+    def as_dict(self) -> Dict[str, float]:
+        """Snapshot with throughput in items per second of wall time"""
+        elapsed = max(time.perf_counter() - self.started_at, 1e-9)
+        return {
+            'items': self.items,
+            'busy_seconds': round(self.busy_seconds, 6),
+            'items_per_sec': round(self.items / elapsed, 3),
+            'max_queue_depth': self.max_queue_depth,
+        }
+
+
+class FetchParsePipeline:
+    """Fetch pages on I/O threads and parse them on a process pool"""
+
+    def __init__(self, scraper, fetch_workers: Optional[int] = None, parse_workers: Optional[int] = None,
+                 queue_size: Optional[int] = None):
+        """
+        Initialize pipeline
+
+        Args:
+            scraper: WebScraper providing config, retries and the pooled session
+            fetch_workers: Number of fetch threads (None uses config value)
+            parse_workers: Number of parser processes (None uses config value or CPU count)
+            queue_size: Capacity of the queues between stages (None uses config value)
+        """
+        config = scraper.config
+        self.scraper = scraper
+        self.fetch_workers = fetch_workers or config.fetch_config_value(
+            'pipeline', 'fetch_workers', config.fetch_config_value('scraping', 'max_workers', 10))
+        self.parse_workers = parse_workers or config.fetch_config_value(
+            'pipeline', 'parse_workers', 0) or multiprocessing.cpu_count()
+        self.queue_size = queue_size or config.fetch_config_value('pipeline', 'queue_size', 256)
+        self.start_method = config.fetch_config_value('pipeline', 'start_method', 'spawn')
+        self.stages: Dict[str, StageStats] = {}
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get per-stage throughput of the current or last run
+
+        Returns:
+            Dictionary of stage name -> counters
+        """
+        return {name: stage.as_dict() for name, stage in self.stages.items()}
+
+    def run(self, urls: Iterable[str]) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        Run URLs through the fetch and parse stages
+
+        Queues between stages are bounded, so slow parsing holds back fetching
+        and slow fetching holds back reading the input.
+
+        Args:
+            urls: Iterable of URLs, consumed lazily
+
+        Yields:
+            (url, title) tuples in completion order; title is None on failure
+        """
+        self.stages = {'fetch': StageStats('fetch'), 'parse': StageStats('parse')}
+        url_queue: queue.Queue = queue.Queue(self.queue_size)
+        page_queue: queue.Queue = queue.Queue(self.queue_size)
+        stop = threading.Event()
+        session = self.scraper.get_session()
+        fingerprints = self.scraper.fingerprints
+
+        def read_page(response):
+            # Fingerprint on the fetch threads so the consumer only does index lookups
+            fingerprint = page_fingerprint(response.content, response.encoding) if fingerprints is not None else None
+            return response.content, response.encoding, fingerprint
+
+        def put(q: queue.Queue, item) -> bool:
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def feed() -> None:
+            try:
+                for url in urls:
+                    if not put(url_queue, url):
+                        return
+            finally:
+                for _ in range(self.fetch_workers):
+                    put(url_queue, _DONE)
+
+        def fetch() -> None:
+            try:
+                while not stop.is_set():
+                    try:
+                        url = url_queue.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                    if url is _DONE:
+                        return
+                    start = time.perf_counter()
+                    try:
+                        page = self.scraper._scrape(url, session, read_page)
+                    except Exception:
+                        # An unexpected error must not end this thread and drop the URLs it would fetch next
+                        self.scraper.logger.exception(f"Unexpected error fetching {url}")
+                        page = None
+                    self.stages['fetch'].record(time.perf_counter() - start)
+                    if not put(page_queue, (url, page)):
+                        return
+            finally:
+                put(page_queue, _DONE)
+
+        threads = [threading.Thread(target=feed, daemon=True)]
+        threads += [threading.Thread(target=fetch, daemon=True) for _ in range(self.fetch_workers)]
+        executor = ProcessPoolExecutor(self.parse_workers,
+                                       mp_context=multiprocessing.get_context(self.start_method))
+        parser_name = self.scraper.parser_name
+        max_in_flight = self.parse_workers * 2
+        pending = {}
+        running_fetchers = self.fetch_workers
+
+        def collect(block: bool) -> Iterator[Tuple[str, Optional[str]]]:
+            done, _ = wait(pending, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+            for future in done:
+                url, fingerprint = pending.pop(future)
+                _, title, busy = future.result()
+                self.stages['parse'].record(busy)
+                title = self.scraper._report_title(title)
+                if fingerprint is not None:
+                    fingerprints.add('title', fingerprint, title)
+                yield url, title
+
+        try:
+            for thread in threads:
+                thread.start()
+
+            while running_fetchers or pending:
+                if running_fetchers:
+                    self.stages['parse'].observe_queue(page_queue.qsize())
+                    self.stages['fetch'].observe_queue(url_queue.qsize())
+                    try:
+                        item = page_queue.get(timeout=0.05 if pending else None)
+                    except queue.Empty:
+                        yield from collect(block=False)
+                        continue
+
+                    if item is _DONE:
+                        running_fetchers -= 1
+                        continue
+
+                    url, page = item
+                    if page is None:
+                        yield url, None
+                        continue
+
+                    content, encoding, fingerprint = page
+                    if fingerprint is not None:
+                        match = fingerprints.lookup('title', fingerprint)
+                        if match is not None:
+                            yield url, self.scraper._report_title(match[1])
+                            continue
+
+                    # Bound the parse backlog, too, so memory stays flat
+                    while len(pending) >= max_in_flight:
+                        yield from collect(block=True)
+                    pending[executor.submit(parse_page, url, content, encoding, parser_name)] = (url, fingerprint)
+                    yield from collect(block=False)
+                else:
+                    yield from collect(block=True)
+        finally:
+            stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+            for thread in threads:
+                thread.join()
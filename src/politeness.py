@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+
+import random
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Iterator, Optional
+from urllib.parse import urlsplit
+
+try:
+    from .registry import shared_instance
+except ImportError:
+    from registry import shared_instance
+
+# Delay-seconds form of Retry-After; fractions are not in RFC 9110 but some servers send them
+_RETRY_AFTER_SECONDS_RE = re.compile(r'\d+(?:\.\d+)?')
+
+# How often a coroutine re-checks a full host in HostScheduler.slot_async
+ASYNC_POLL_INTERVAL = 0.01
+
+
+def host_of(url: str) -> str:
+    """Get lowercased host[:port] of a URL"""
+    return urlsplit(url).netloc.lower()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse Retry-After header value
+
+    Args:
+        value: Header value, either delay in seconds (fractions accepted) or an HTTP date
+
+    Returns:
+        Delay in seconds or None if missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if _RETRY_AFTER_SECONDS_RE.fullmatch(value):
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def backoff_delay(attempt: int, base: float, factor: float = 2.0,
+                  max_delay: float = 30.0, jitter: bool = True) -> float:
+    """
+    Exponential backoff delay for a retry attempt
+
+    Args:
+        attempt: Zero-based number of the failed attempt
+        base: Delay after the first failure
+        factor: Growth factor per attempt
+        max_delay: Upper bound of the delay
+        jitter: Randomize the upper half of the delay to spread out retries
+
+    Returns:
+        Delay in seconds
+    """
+    delay = min(max_delay, base * factor ** attempt)
+    if jitter:
+        delay = delay / 2 + random.uniform(0, delay / 2)
+    return delay
+
+
+def interleave_by_host(urls: Iterable[str], window: int = 1000) -> Iterator[str]:
+    """
+    Reorder URLs round-robin by host within a bounded lookahead window
+
+    Args:
+        urls: Iterable of URLs, consumed lazily
+        window: Maximum number of URLs buffered at once
+
+    Yields:
+        The same URLs with consecutive requests spread across hosts
+    """
+    url_iter = iter(urls)
+    queues: "OrderedDict[str, deque]" = OrderedDict()
+    buffered = 0
+    exhausted = False
+
+    while True:
+        while not exhausted and buffered < window:
+            url = next(url_iter, None)
+            if url is None:
+                exhausted = True
+                break
+            queues.setdefault(host_of(url), deque()).append(url)
+            buffered += 1
+
+        if not queues:
+            return
+
+        host, queue = next(iter(queues.items()))
+        yield queue.popleft()
+        buffered -= 1
+        if queue:
+            queues.move_to_end(host)
+        else:
+            del queues[host]
+
+
+class TokenBucket:
+    """Thread-safe token bucket handing out reservations"""
+
+    def __init__(self, rate: float, capacity: float = 1):
+        """
+        Initialize token bucket
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take one token, going into debt if none is available
+
+        Returns:
+            Seconds the caller has to wait before using the token
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class _HostState:
+    """Limits and pacing state of a single host"""
+
+    def __init__(self, requests_per_second: float, burst: float, max_concurrent: int):
+        self.bucket = TokenBucket(requests_per_second, burst) if requests_per_second > 0 else None
+        self.semaphore = threading.BoundedSemaphore(max_concurrent) if max_concurrent > 0 else None
+        self.not_before = 0.0
+        self.min_interval = 0.0
+        self.next_start = 0.0
+
+
+class HostScheduler:
+    """Per-host politeness limits: requests per second, concurrency and server backoff"""
+
+    def __init__(self, requests_per_second: float = 0, burst: float = 1, max_concurrent_per_host: int = 0):
+        """
+        Initialize host scheduler
+
+        Args:
+            requests_per_second: Request rate per host (0 disables rate limiting)
+            burst: Requests allowed back to back before rate limiting kicks in
+            max_concurrent_per_host: Requests in flight per host (0 means unlimited)
+        """
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.max_concurrent_per_host = max_concurrent_per_host
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, host: str) -> _HostState:
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = _HostState(self.requests_per_second, self.burst, self.max_concurrent_per_host)
+                self._hosts[host] = state
+            return state
+
+    @contextmanager
+    def slot(self, host: str):
+        """
+        Wait until a request to host is allowed and hold a concurrency slot
+
+        Args:
+            host: Host the request goes to
+        """
+        state = self._state(host)
+        if state.semaphore is not None:
+            state.semaphore.acquire()
+        try:
+            delay = self._start_delay(state)
+            if delay > 0:
+                time.sleep(delay)
+            yield
+        finally:
+            if state.semaphore is not None:
+                state.semaphore.release()
+
+    @asynccontextmanager
+    async def slot_async(self, host: str):
+        """
+        Asyncio version of slot, sharing the same per-host limits
+
+        Waiting never blocks the event loop: a full host is polled every
+        ASYNC_POLL_INTERVAL seconds instead of blocking on its semaphore.
+
+        Args:
+            host: Host the request goes to
+        """
+        import asyncio
+
+        state = self._state(host)
+        if state.semaphore is not None:
+            while not state.semaphore.acquire(blocking=False):
+                await asyncio.sleep(ASYNC_POLL_INTERVAL)
+        try:
+            delay = self._start_delay(state)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield
+        finally:
+            if state.semaphore is not None:
+                state.semaphore.release()
+
+    def _start_delay(self, state: _HostState) -> float:
+        """Reserve the next start time of a host and return how long to wait for it"""
+        delay = state.bucket.reserve() if state.bucket is not None else 0.0
+        with self._lock:
+            now = time.monotonic()
+            start = max(now + delay, state.not_before, state.next_start)
+            if state.min_interval > 0:
+                # Reserve the start time so concurrent callers queue up behind it
+                state.next_start = start + state.min_interval
+        return start - now
+
+    def set_min_interval(self, host: str, seconds: float) -> None:
+        """
+        Enforce a minimum gap between request starts to host, e.g. robots Crawl-delay
+
+        Args:
+            host: Host to pace
+            seconds: Minimum interval between requests
+        """
+        state = self._state(host)
+        with self._lock:
+            state.min_interval = seconds
+
+    def defer(self, host: str, seconds: float) -> None:
+        """
+        Hold back all requests to host, e.g. after a Retry-After response
+
+        Args:
+            host: Host to pause
+            seconds: Pause duration
+        """
+        state = self._state(host)
+        with self._lock:
+            state.not_before = max(state.not_before, time.monotonic() + seconds)
+
+
+def shared_host_scheduler(requests_per_second: float = 0, burst: float = 1,
+                          max_concurrent_per_host: int = 0) -> HostScheduler:
+    """Process-wide HostScheduler per set of limits"""
+    return shared_instance('scheduler', (requests_per_second, burst, max_concurrent_per_host),
+                           lambda: HostScheduler(requests_per_second, burst, max_concurrent_per_host))
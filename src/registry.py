@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Tuple, TypeVar
+
+T = TypeVar('T')
+
+_instances: Dict[Tuple[str, Hashable], Any] = {}
+# Reentrant, so a factory may itself ask for a shared instance
+_lock = threading.RLock()
+
+
+def shared_instance(kind: str, key: Hashable, factory: Callable[[], T]) -> T:
+    """
+    Get the process-wide instance of a component, creating it on first use
+
+    The factory runs under the registry lock, so concurrent first calls for
+    the same key create one instance.
+
+    Args:
+        kind: Component name, keeps keys of different components apart
+        key: Settings the instance is shared by
+        factory: Creates the instance if there is none for the key yet
+
+    Returns:
+        Instance shared by all callers with the same kind and key
+    """
+    with _lock:
+        instance = _instances.get((kind, key))
+        if instance is None:
+            instance = _instances[(kind, key)] = factory()
+        return instance
+
+
+def pop_shared(kind: str) -> List[Any]:
+    """
+    Remove all shared instances of a component
+
+    Args:
+        kind: Component name
+
+    Returns:
+        Removed instances, so the caller can close them
+    """
+    with _lock:
+        keys = [key for key in _instances if key[0] == kind]
+        return [_instances.pop(key) for key in keys]
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+try:
+    from .registry import shared_instance
+except ImportError:
+    from registry import shared_instance
+
+
+def _compile_pattern(pattern: str) -> "re.Pattern":
+    """Compile robots.txt path pattern with * and $ wildcards"""
+    anchored = pattern.endswith('$')
+    if anchored:
+        pattern = pattern[:-1]
+    regex = '.*'.join(re.escape(part) for part in pattern.split('*'))
+    return re.compile(regex + ('$' if anchored else ''))
+
+
+class RobotsRules:
+    """Rules from a robots.txt file for one user agent, compiled once"""
+
+    def __init__(self, rules: List[Tuple[bool, str]], crawl_delay: Optional[float] = None,
+                 sitemaps: Optional[List[str]] = None):
+        """
+        Initialize compiled rules
+
+        Args:
+            rules: List of (allow, path pattern) tuples
+            crawl_delay: Crawl-delay in seconds, if any
+            sitemaps: Sitemap URLs listed in the file
+        """
+        self.crawl_delay = crawl_delay
+        self.sitemaps = sitemaps or []
+        # Longest pattern wins, Allow wins a tie (RFC 9309)
+        ordered = sorted((r for r in rules if r[1]), key=lambda r: (-len(r[1]), not r[0]))
+        self._rules = [(allow, _compile_pattern(pattern)) for allow, pattern in ordered]
+
+    @classmethod
+    def allow_all(cls) -> "RobotsRules":
+        """Rules allowing everything (missing robots.txt)"""
+        return cls([])
+
+    @classmethod
+    def disallow_all(cls) -> "RobotsRules":
+        """Rules disallowing everything (unreachable robots.txt)"""
+        return cls([(False, '/')])
+
+    @classmethod
+    def parse(cls, text: str, user_agent: str) -> "RobotsRules":
+        """
+        Parse robots.txt content for a user agent
+
+        Args:
+            text: robots.txt content
+            user_agent: User agent string of the scraper
+
+        Returns:
+            RobotsRules of the most specific matching group, or the * group
+        """
+        agent = user_agent.lower()
+        groups = []
+        sitemaps = []
+        current = None
+        last_was_agent = False
+
+        for line in text.splitlines():
+            line = line.split('#', 1)[0].strip()
+            if ':' not in line:
+                continue
+            field, value = (part.strip() for part in line.split(':', 1))
+            field = field.lower()
+
+            if field == 'user-agent':
+                # Consecutive User-agent lines share one group
+                if current is None or not last_was_agent:
+                    current = {'agents': [], 'rules': [], 'crawl_delay': None}
+                    groups.append(current)
+                current['agents'].append(value.lower())
+                last_was_agent = True
+                continue
+
+            last_was_agent = False
+            if field == 'sitemap':
+                sitemaps.append(value)
+            elif current is None:
+                continue
+            elif field in ('allow', 'disallow'):
+                current['rules'].append((field == 'allow', value))
+            elif field == 'crawl-delay':
+                try:
+                    current['crawl_delay'] = float(value)
+                except ValueError:
+                    pass
+
+        specific = [g for g in groups if any(a != '*' and a in agent for a in g['agents'])]
+        matched = specific or [g for g in groups if '*' in g['agents']]
+
+        rules = [rule for group in matched for rule in group['rules']]
+        delays = [group['crawl_delay'] for group in matched if group['crawl_delay'] is not None]
+        return cls(rules, max(delays) if delays else None, sitemaps)
+
+    def can_fetch(self, url: str) -> bool:
+        """
+        Check whether URL may be fetched
+
+        Args:
+            url: Absolute URL
+
+        Returns:
+            True if allowed
+        """
+        parts = urlsplit(url)
+        path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        if path == '/robots.txt':
+            return True
+        for allow, pattern in self._rules:
+            if pattern.match(path):
+                return allow
+        return True
+
+
+class RobotsCache:
+    """Per-host cache of parsed robots.txt rules with a TTL"""
+
+    def __init__(self, user_agent: str = '*', ttl_seconds: float = 3600, timeout: float = 10,
+                 error_ttl_seconds: float = 300):
+        """
+        Initialize robots cache
+
+        Args:
+            user_agent: User agent the rules are evaluated for
+            ttl_seconds: How long fetched rules are reused
+            timeout: Timeout for fetching robots.txt
+            error_ttl_seconds: How long to keep rules of an unreachable robots.txt
+        """
+        self.user_agent = user_agent
+        self.ttl_seconds = ttl_seconds
+        self.timeout = timeout
+        self.error_ttl_seconds = error_ttl_seconds
+        self._entries: Dict[str, Tuple[RobotsRules, float]] = {}
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def rules_for(self, url: str, get: Optional[Callable[..., requests.Response]] = None) -> RobotsRules:
+        """
+        Get rules for the host of URL, fetching robots.txt if needed
+
+        Concurrent callers for the same host wait for a single fetch.
+
+        Args:
+            url: Any URL on the host
+            get: Function used to fetch robots.txt (default requests.get)
+
+        Returns:
+            RobotsRules for the host
+        """
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc.lower()}"
+
+        rules = self._cached(origin)
+        if rules is not None:
+            return rules
+
+        with self._lock:
+            host_lock = self._host_locks.setdefault(origin, threading.Lock())
+        with host_lock:
+            rules = self._cached(origin)
+            if rules is None:
+                rules, ttl = self._fetch(origin, get or requests.get)
+                with self._lock:
+                    self._entries[origin] = (rules, time.monotonic() + ttl)
+            return rules
+
+    def can_fetch(self, url: str, get: Optional[Callable[..., requests.Response]] = None) -> bool:
+        """Check whether URL may be fetched according to its host's robots.txt"""
+        return self.rules_for(url, get).can_fetch(url)
+
+    def _cached(self, origin: str) -> Optional[RobotsRules]:
+        with self._lock:
+            entry = self._entries.get(origin)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+        return None
+
+    def _fetch(self, origin: str, get: Callable[..., requests.Response]) -> Tuple[RobotsRules, float]:
+        try:
+            response = get(f"{origin}/robots.txt", timeout=self.timeout,
+                           headers={'User-Agent': self.user_agent})
+        except requests.RequestException:
+            return RobotsRules.disallow_all(), self.error_ttl_seconds
+
+        if 200 <= response.status_code < 300:
+            return RobotsRules.parse(response.text, self.user_agent), self.ttl_seconds
+        if 400 <= response.status_code < 500:
+            # No robots.txt means no restrictions
+            return RobotsRules.allow_all(), self.ttl_seconds
+        return RobotsRules.disallow_all(), self.error_ttl_seconds
+
+
+def shared_robots_cache(user_agent: str = '*', ttl_seconds: float = 3600, timeout: float = 10) -> RobotsCache:
+    """Process-wide RobotsCache per user agent and TTL (timeout applies when it is created)"""
+    return shared_instance('robots', (user_agent, ttl_seconds), lambda: RobotsCache(user_agent, ttl_seconds, timeout))
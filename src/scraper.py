@@ -1,71 +1,1272 @@
 #!/usr/bin/env python3
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+import importlib
+import itertools
+import os
+import threading
 import time
-from typing import Optional
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Optional dependency for the asyncio engine, imported on first use (see _import_aiohttp)
+aiohttp = None
 
 try:
-    from .config import Config  # For relative import within package
+    from .config import Config, shared_config  # For relative import within package
     from .logger import ScraperLogger
+    from .adaptive import AdaptiveLimiter, is_congestion, shared_adaptive_limiter
+    from .circuit import CircuitBreaker, is_host_failure, shared_circuit_breaker
+    from .cache import CacheEntry, ResultCache, ValidatorCache, shared_result_cache, shared_validator_cache
+    from .extraction import ExtractionRules
+    from .fingerprint import FingerprintIndex, page_fingerprint, shared_fingerprint_index
+    from .limits import ByteBudget, ResponseTooLarge, read_limited, read_limited_async, shared_byte_budget
+    from .metrics import MetricsRegistry, shared_metrics_registry
+    from .frontier import BloomFilter, CrawlFrontier, HashedSeenSet
+    from .parsers import extract_links, resolve_title_parser, scan_title
+    from .robots import RobotsCache, shared_robots_cache
+    from .politeness import (HostScheduler, backoff_delay, host_of, interleave_by_host,
+                             parse_retry_after, shared_host_scheduler)
 except ImportError:
-    from config import Config   # Fallback for direct execution
+    from config import Config, shared_config   # Fallback for direct execution
     from logger import ScraperLogger
+    from adaptive import AdaptiveLimiter, is_congestion, shared_adaptive_limiter
+    from circuit import CircuitBreaker, is_host_failure, shared_circuit_breaker
+    from cache import CacheEntry, ResultCache, ValidatorCache, shared_result_cache, shared_validator_cache
+    from extraction import ExtractionRules
+    from fingerprint import FingerprintIndex, page_fingerprint, shared_fingerprint_index
+    from limits import ByteBudget, ResponseTooLarge, read_limited, read_limited_async, shared_byte_budget
+    from metrics import MetricsRegistry, shared_metrics_registry
+    from frontier import BloomFilter, CrawlFrontier, HashedSeenSet
+    from parsers import extract_links, resolve_title_parser, scan_title
+    from robots import RobotsCache, shared_robots_cache
+    from politeness import (HostScheduler, backoff_delay, host_of, interleave_by_host,
+                            parse_retry_after, shared_host_scheduler)
+
+
+# Feature modules loading heavy dependencies (mmap, sqlite3, xml.etree) are
+# imported on first use, so `from src import WebScraper` stays cheap
+_LAZY_ATTRIBUTES = {
+    "ArchiveReader": "archive",
+    "ArchiveWriter": "archive",
+    "replay_range": "archive",
+    "shared_archive_writer": "archive",
+    "JobStore": "jobstore",
+    "SitemapEntry": "sitemap",
+    "SitemapReader": "sitemap",
+    "SitemapState": "sitemap",
+}
+
+if TYPE_CHECKING:
+    from .archive import ArchiveWriter
+    from .jobstore import JobStore
+    from .sitemap import SitemapEntry, SitemapState
+
+
+def _lazy(name: str) -> Any:
+    """Import a name of a feature module on first use"""
+    module_name = _LAZY_ATTRIBUTES[name]
+    if __package__:
+        module = importlib.import_module(f".{module_name}", __package__)
+    else:
+        module = importlib.import_module(module_name)  # Direct execution
+    value = getattr(module, name)
+    globals()[name] = value  # Later lookups skip _lazy
+    return value
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return _lazy(name)
+
+
+def _import_aiohttp():
+    """Import aiohttp once, so the sync engine never pays for loading it"""
+    global aiohttp
+    if aiohttp is None:
+        try:
+            import aiohttp as module
+        except ImportError:
+            raise ImportError("aiohttp is required for the asyncio engine: pip install aiohttp") from None
+        aiohttp = module
+    return aiohttp
+
 
 class WebScraper:
-    def __init__(self, url: str, config_file: Optional[str] = None):
+    def __init__(self, url: str, config_file: Optional[str] = None,
+                 result_cache: Optional[ResultCache] = None):
         self.url = url
-        self.config = Config(config_file)
+        # Parsed once per process and hot-reloaded when the file changes
+        self.config = shared_config(config_file)
 
-        # Setup logger using the new ScraperLogger class
-        logger_manager = ScraperLogger(f"{__name__}_{id(self)}", self.config)
+        # Scrapers using the same config file share one logger, so its level and
+        # handlers are never overwritten by a scraper with a different config
+        logger_manager = ScraperLogger(f"{__name__}.{id(self.config)}", self.config)
         self.logger = logger_manager.get_logger()
 
+        # HTML parser backend, falls back when an optional backend is missing
+        parser_name = self.config.fetch_config_value('scraping', 'parser', 'html.parser')
+        self.parser_name, self._parse_title = resolve_title_parser(parser_name)
+        if self.parser_name != parser_name:
+            self.logger.warning(f"Parser '{parser_name}' is not available, using '{self.parser_name}'")
+
+        # On-disk ETag / Last-Modified cache (optional)
+        self.validator_cache: Optional[ValidatorCache] = None
+        if self.config.fetch_config_value('http_cache', 'enabled', False):
+            self.validator_cache = shared_validator_cache(
+                self.config.fetch_config_value('http_cache', 'path', '.cache/http_cache.sqlite'),
+                self.config.fetch_config_value('http_cache', 'max_entries', 100000),
+                self.config.fetch_config_value('http_cache', 'max_age_seconds', 30 * 24 * 3600),
+            )
+
+        # In-memory result cache shared by scrapers with the same limits (optional)
+        self.result_cache = result_cache
+        if self.result_cache is None and self.config.fetch_config_value('memory_cache', 'enabled', False):
+            self.result_cache = shared_result_cache(
+                self.config.fetch_config_value('memory_cache', 'max_entries', 10000),
+                self.config.fetch_config_value('memory_cache', 'max_bytes', 64 * 1024 * 1024),
+                self.config.fetch_config_value('memory_cache', 'ttl_seconds', 300),
+            )
+
+        # Politeness, concurrency, circuit and memory limits, rebuilt when the config changes
+        self._limits_lock = threading.Lock()
+        self._configure_limits()
+
+        # robots.txt rules shared by all scrapers in the process (optional)
+        self.robots: Optional[RobotsCache] = None
+        if self.config.fetch_config_value('robots', 'enabled', False):
+            self.robots = shared_robots_cache(
+                self.config.fetch_config_value('scraping', 'user_agent', '*'),
+                self.config.fetch_config_value('robots', 'ttl_seconds', 3600),
+                self.config.fetch_config_value('scraping', 'timeout', 10),
+            )
+
+        # Per-host timing metrics shared by all scrapers in the process (optional)
+        self.metrics: Optional[MetricsRegistry] = None
+        if self.config.fetch_config_value('metrics', 'enabled', False):
+            self.metrics = shared_metrics_registry(
+                self.config.fetch_config_value('metrics', 'prometheus_path', None),
+                self.config.fetch_config_value('metrics', 'export_interval', 15),
+            )
+
+        # Raw responses captured to an append-only archive for offline replay (optional)
+        self.archive: Optional["ArchiveWriter"] = None
+        if self.config.fetch_config_value('archive', 'enabled', False):
+            self.archive = _lazy('shared_archive_writer')(
+                self.config.fetch_config_value('archive', 'path', 'archive/responses.arc'),
+                self.config.fetch_config_value('archive', 'compression_level', 6),
+            )
+
+        # Fingerprints of recent pages, so duplicates reuse earlier results (optional)
+        self.fingerprints: Optional[FingerprintIndex] = None
+        if self.config.fetch_config_value('fingerprint', 'enabled', False):
+            self.fingerprints = shared_fingerprint_index(
+                self.config.fetch_config_value('fingerprint', 'max_entries', 100000),
+                self.config.fetch_config_value('fingerprint', 'max_distance', 6),
+                self.config.fetch_config_value('fingerprint', 'min_words', 50),
+            )
+
+        # Extraction rules compiled once from config on first use
+        self._extraction_rules: Optional[ExtractionRules] = None
+
+        # Completed sitemap reads (origin -> start time) awaiting commit_sitemap_state
+        self._sitemap_reads: Dict[str, datetime] = {}
+
+        # Pooled session shared by batch workers, created on first use
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+
+    def _configure_limits(self) -> None:
+        """Attach the shared limiters matching the current config"""
+        self._limits_generation = self.config.generation
+
+        # Per-host politeness limits shared by all scrapers with the same settings
+        self.scheduler: HostScheduler = shared_host_scheduler(
+            self.config.fetch_config_value('politeness', 'requests_per_second', 0),
+            self.config.fetch_config_value('politeness', 'burst', 1),
+            self.config.fetch_config_value('politeness', 'max_concurrent_per_host', 0),
+        )
+
+        # Per-host concurrency adjusted from observed outcomes (optional)
+        self.adaptive: Optional[AdaptiveLimiter] = None
+        if self.config.fetch_config_value('adaptive', 'enabled', False):
+            self.adaptive = shared_adaptive_limiter(
+                initial=self.config.fetch_config_value('adaptive', 'initial_concurrency', 4),
+                minimum=self.config.fetch_config_value('adaptive', 'min_concurrency', 1),
+                maximum=self.config.fetch_config_value('adaptive', 'max_concurrency', 64),
+                increase=self.config.fetch_config_value('adaptive', 'increase', 1.0),
+                decrease_factor=self.config.fetch_config_value('adaptive', 'decrease_factor', 0.5),
+                latency_tolerance=self.config.fetch_config_value('adaptive', 'latency_tolerance', 2.0),
+                cooldown_seconds=self.config.fetch_config_value('adaptive', 'cooldown_seconds', 1.0),
+            )
+
+        # Per-host circuit breaker failing fast on dead hosts (optional)
+        self.breaker: Optional[CircuitBreaker] = None
+        failure_threshold = self.config.fetch_config_value('scraping', 'circuit_failure_threshold', 0)
+        if failure_threshold:
+            self.breaker = shared_circuit_breaker(
+                failure_threshold,
+                self.config.fetch_config_value('scraping', 'circuit_cooldown_seconds', 30),
+                self.config.fetch_config_value('scraping', 'circuit_half_open_requests', 1),
+            )
+
+        # Process-wide budget of response bytes held in memory (optional)
+        self.byte_budget: Optional[ByteBudget] = None
+        memory_budget_mb = self.config.fetch_config_value('scraping', 'memory_budget_mb', 0)
+        if memory_budget_mb:
+            self.byte_budget = shared_byte_budget(int(memory_budget_mb * 1024 * 1024))
+
+    def _refresh_limits(self) -> None:
+        """Pick up new limits after the config was reloaded or updated"""
+        if self.config.generation != self._limits_generation:
+            with self._limits_lock:
+                if self.config.generation != self._limits_generation:
+                    self._configure_limits()
+                    self.logger.info("Configuration changed, applied new limits")
+
+    def get_session(self) -> requests.Session:
+        """
+        Get the pooled HTTP session shared by all batch workers
+
+        Returns:
+            requests.Session with connection pool sized from config
+        """
+        with self._session_lock:
+            if self._session is None:
+                pool_size = self.config.fetch_config_value('scraping', 'pool_size', 10)
+                user_agent = self.config.fetch_config_value('scraping', 'user_agent')
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                if user_agent:
+                    session.headers['User-Agent'] = user_agent
+
+                self._session = session
+            return self._session
+
+    def close(self) -> None:
+        """Close the pooled session and release its connections, flushing archive and metrics"""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+        if self.archive is not None:
+            self.archive.flush()
+        prometheus_path = self.config.fetch_config_value('metrics', 'prometheus_path', None)
+        if self.metrics is not None and prometheus_path:
+            self.metrics.write_prometheus(prometheus_path)
+
     def check_website(self):
         """Check website with retry logic and configurable timeout"""
+        return self._lookup(self.url)
+
+    def check_many(self, urls: Iterable[str],
+                   max_workers: Optional[int] = None) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        Check many websites concurrently using a thread pool
+
+        URLs are consumed lazily, so the input can be a generator of any size.
+        All workers share one pooled session and the same retry/timeout
+        settings as check_website.
+
+        Args:
+            urls: Iterable of URLs to check
+            max_workers: Number of worker threads (None uses config value)
+
+        Yields:
+            (url, title) tuples in completion order; title is None on failure
+        """
+        if max_workers is None:
+            max_workers = self.config.fetch_config_value('scraping', 'max_workers', 10)
+
+        session = self.get_session()
+        interleave_window = self.config.fetch_config_value('politeness', 'interleave_window', 1000)
+        if interleave_window > 0:
+            # Spread consecutive requests across hosts so one slow host does not stall the batch
+            urls = interleave_by_host(urls, interleave_window)
+        url_iter = iter(urls)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = {}
+
+        def submit(count: int) -> None:
+            for url in itertools.islice(url_iter, count):
+                pending[executor.submit(self._lookup, url, session)] = url
+
+        try:
+            # Keep a bounded window of futures in flight instead of submitting everything
+            submit(max_workers * 2)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = pending.pop(future)
+                    yield url, future.result()
+                submit(len(done))
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def run_job(self, store: Optional["JobStore"] = None, urls: Optional[Iterable[str]] = None,
+                max_workers: Optional[int] = None,
+                max_attempts: Optional[int] = None) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        Run a checkpointed batch job that can resume where it stopped
+
+        URLs are added to the job store, jobs left in flight by an interrupted
+        run are picked up again, and every result is recorded in the store.
+        A URL without a title counts as failed and is retried on the next run
+        until it has used max_attempts attempts.
+
+        Args:
+            store: JobStore holding the job state (None opens, and finally closes, the
+                store at jobs.path)
+            urls: New URLs to add to the job (None just resumes)
+            max_workers: Number of worker threads (None uses config value)
+            max_attempts: Attempts per URL across runs (None uses config value)
+
+        Yields:
+            (url, title) tuples in completion order; title is None on failure
+        """
+        if max_workers is None:
+            max_workers = self.config.fetch_config_value('scraping', 'max_workers', 10)
+        if max_attempts is None:
+            max_attempts = self.config.fetch_config_value('jobs', 'max_attempts', 3)
+        if store is None:
+            with _lazy('JobStore')(self.config.fetch_config_value('jobs', 'path', '.cache/jobs.sqlite')) as store:
+                yield from self.run_job(store, urls, max_workers, max_attempts)
+            return
+
+        if urls is not None:
+            added = store.add_urls(urls)
+            self.logger.info(f"Added {added} new URLs to job store {store.path}")
+        requeued = store.resume(max_attempts)
+        if requeued:
+            self.logger.info(f"Resuming {requeued} unfinished URLs from job store {store.path}")
+
+        def claimed() -> Iterator[str]:
+            while True:
+                batch = store.claim(max_workers * 4)
+                if not batch:
+                    return
+                yield from batch
+
+        for url, title in self.check_many(claimed(), max_workers=max_workers):
+            if title is not None:
+                store.mark_done(url, title)
+            else:
+                store.mark_failed(url, "request failed or no title")
+            yield url, title
+        store.flush()
+
+    def crawl(self, seeds: Optional[Iterable[str]] = None, max_pages: Optional[int] = None,
+              max_depth: Optional[int] = None,
+              max_workers: Optional[int] = None) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        Crawl from seed URLs, following links discovered on each page
+
+        Links are normalized, deduplicated and scheduled breadth first with the
+        depth and domain limits from the `crawl` config section.
+
+        Args:
+            seeds: Start URLs (None uses the scraper URL)
+            max_pages: Maximum pages to fetch (None uses config value)
+            max_depth: Maximum link depth from the seeds (None uses config value)
+            max_workers: Number of worker threads (None uses config value)
+
+        Yields:
+            (url, title) tuples in completion order; title is None on failure
+        """
+        seeds = list(seeds) if seeds is not None else [self.url]
+        if max_pages is None:
+            max_pages = self.config.fetch_config_value('crawl', 'max_pages', 100)
+        if max_workers is None:
+            max_workers = self.config.fetch_config_value('scraping', 'max_workers', 10)
+
+        frontier = self._create_frontier(seeds, max_depth)
+        for seed in seeds:
+            frontier.push(seed, depth=0)
+
+        session = self.get_session()
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = {}
+        fetched = 0
+
+        def fetch_page(response: requests.Response) -> Tuple[Optional[str], List[str]]:
+            html = response.text
+            return self._extract_title(html), extract_links(html, response.url or '')
+
+        try:
+            while pending or (len(frontier) and fetched < max_pages):
+                while len(frontier) and len(pending) < max_workers and fetched < max_pages:
+                    item = frontier.pop()
+                    pending[executor.submit(self._scrape, item.url, session, fetch_page)] = item
+                    fetched += 1
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = pending.pop(future)
+                    page = future.result()
+                    if page is None:
+                        yield item.url, None
+                        continue
+
+                    title, links = page
+                    for link in links:
+                        frontier.push(link, depth=item.depth + 1)
+                    yield item.url, title
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def get_extraction_rules(self) -> ExtractionRules:
+        """
+        Get extraction rules compiled from the `extraction` config section
+
+        Returns:
+            Compiled ExtractionRules, cached for the lifetime of the scraper
+
+        Raises:
+            ValueError: If the extraction config is missing or invalid
+        """
+        if self._extraction_rules is None:
+            self._extraction_rules = ExtractionRules.from_config(self.config.get_section('extraction'))
+        return self._extraction_rules
+
+    def extract_records(self, urls: Optional[Iterable[str]] = None, max_pages: Optional[int] = None,
+                        max_workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Extract records with the configured rules, following next-page links
+
+        Each start URL begins a pagination chain; chains run concurrently and
+        the compiled rules are shared by every page.
+
+        Args:
+            urls: Start URLs (None uses the scraper URL)
+            max_pages: Maximum pages per chain (None uses config value)
+            max_workers: Number of worker threads (None uses config value)
+
+        Yields:
+            Record dictionaries as pages complete
+        """
+        rules = self.get_extraction_rules()
+        if max_pages is None:
+            max_pages = self.config.fetch_config_value('extraction', 'max_pages', 10)
+        if max_workers is None:
+            max_workers = self.config.fetch_config_value('scraping', 'max_workers', 10)
+
+        def extract_page(response: requests.Response):
+            # A duplicate page's records were emitted already, but its next page may not have been.
+            # Records depend on every item, so only exact duplicates are reused.
+            return self._deduplicated('records', response, lambda r: rules.extract(r.text, r.url or ''),
+                                      lambda page: ([], page[1]), near=False)
+
+        session = self.get_session()
+        url_iter = iter(urls if urls is not None else [self.url])
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = {}
+        visited = set()
+
+        def submit(url: str, page_number: int) -> None:
+            visited.add(url)
+            pending[executor.submit(self._scrape, url, session, extract_page)] = page_number
+
+        try:
+            for url in itertools.islice(url_iter, max_workers):
+                submit(url, 1)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page_number = pending.pop(future)
+                    page = future.result()
+                    if page is None:
+                        continue
+
+                    records, next_url = page
+                    if next_url and next_url not in visited and page_number < max_pages:
+                        submit(next_url, page_number + 1)
+                    yield from records
+
+                for url in itertools.islice(url_iter, max_workers - len(pending)):
+                    submit(url, 1)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def sitemap_entries(self, sites: Optional[Iterable[str]] = None,
+                        since: Optional[datetime] = None) -> Iterator["SitemapEntry"]:
+        """
+        Stream page URLs listed in the sitemaps of sites
+
+        Sitemaps are taken from robots.txt, or the `sitemap.known_paths` if it
+        lists none. Sitemap indexes and gzip-compressed sitemaps are read
+        incrementally, so sitemaps of any size never have to fit in memory.
+        With `sitemap.incremental`, pages whose lastmod is older than the
+        previous committed read of the site are skipped. A read is only
+        recorded by commit_sitemap_state once the caller has checked its
+        pages, and only if no sitemap of the site failed.
+
+        Args:
+            sites: Site URLs (None uses the scraper URL)
+            since: Skip pages last modified before this time (overrides the incremental state)
+
+        Yields:
+            SitemapEntry objects with url and lastmod, ready to feed check_many
+        """
+        session = self.get_session()
+        robots = self.robots or shared_robots_cache(
+            self.config.fetch_config_value('scraping', 'user_agent', '*'),
+            self.config.fetch_config_value('robots', 'ttl_seconds', 3600),
+            self.config.fetch_config_value('scraping', 'timeout', 10),
+        )
+        state = self._sitemap_state()
+
+        for site in (sites if sites is not None else [self.url]):
+            parts = urlsplit(site)
+            origin = f"{parts.scheme}://{parts.netloc}"
+            started = datetime.now(timezone.utc)
+            site_since = since if since is not None or state is None else state.last_run(origin)
+
+            reader = _lazy('SitemapReader')(
+                session.get,
+                timeout=self.config.fetch_config_value('scraping', 'timeout', 10),
+                max_depth=self.config.fetch_config_value('sitemap', 'max_depth', 3),
+                known_paths=self.config.fetch_config_value('sitemap', 'known_paths', ['/sitemap.xml']),
+                logger=self.logger,
+            )
+            sitemaps = reader.discover(site, robots.rules_for(site, session.get).sitemaps)
+            self.logger.info(f"Reading sitemaps of {origin}" + (f" changed since {site_since}" if site_since else ""))
+            yield from reader.entries(sitemaps, site_since)
+
+            if reader.skipped_urls or reader.skipped_sitemaps:
+                self.logger.info(f"Skipped {reader.skipped_urls} unchanged pages and "
+                                 f"{reader.skipped_sitemaps} unchanged sitemaps of {origin}")
+            if state is not None:
+                if reader.complete:
+                    # Exhausting the generator only means the URLs were handed out, so the
+                    # caller commits once their pages were actually fetched
+                    self._sitemap_reads[origin] = started
+                else:
+                    # Marking would make the next run skip pages that were never read
+                    self.logger.warning(f"Sitemaps of {origin} were not fully read, keeping the previous state")
+
+    def commit_sitemap_state(self, failed_urls: Iterable[str] = ()) -> List[str]:
+        """
+        Record the completed sitemap reads of sitemap_entries as done
+
+        Call after the pages of the sitemaps were checked. The state keeps one
+        start time per site, so a site with any failed page is not recorded
+        and its next run reads the site in full again instead of skipping the
+        failed page for good.
+
+        Args:
+            failed_urls: URLs whose check failed
+
+        Returns:
+            Origins of the sites recorded
+        """
+        state = self._sitemap_state()
+        reads, self._sitemap_reads = self._sitemap_reads, {}
+        if state is None:
+            return []
+
+        failed = {f"{parts.scheme}://{parts.netloc}" for parts in map(urlsplit, failed_urls)}
+        committed = []
+        for origin, started in reads.items():
+            if origin in failed:
+                self.logger.warning(f"Pages of {origin} failed, keeping the previous sitemap state")
+                continue
+            state.mark(origin, started)
+            committed.append(origin)
+        return committed
+
+    def _sitemap_state(self) -> Optional["SitemapState"]:
+        """State of incremental sitemap reads, None unless sitemap.incremental is on"""
+        if not self.config.fetch_config_value('sitemap', 'incremental', False):
+            return None
+        return _lazy('SitemapState')(self.config.fetch_config_value('sitemap', 'state_path', '.cache/sitemap_state.json'))
+
+    def replay(self, path: Optional[str] = None,
+               workers: Optional[int] = None) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        Extract titles from a capture archive instead of the network
+
+        Args:
+            path: Archive file (None uses archive.path from config)
+            workers: Number of parser processes (None uses config value or CPU count)
+
+        Yields:
+            (url, title) tuples in completion order; title is None if not found
+        """
+        for url, title in self._replay(path, workers):
+            yield url, self._report_title(title)
+
+    def replay_records(self, path: Optional[str] = None, workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Extract records with the configured rules from a capture archive
+
+        Next-page links are not followed; pages captured during the original
+        run are in the archive already.
+
+        Args:
+            path: Archive file (None uses archive.path from config)
+            workers: Number of parser processes (None uses config value or CPU count)
+
+        Yields:
+            Record dictionaries as chunks complete
+
+        Raises:
+            ValueError: If the extraction config is missing or invalid
+        """
+        self.get_extraction_rules()  # Fail here, not in every worker
+        for _, page in self._replay(path, workers, self.config.get_section('extraction')):
+            if page is not None:
+                yield from page[0]
+
+    def _replay(self, path: Optional[str], workers: Optional[int],
+                extraction: Optional[Dict[str, Any]] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Run archived responses through replay_range on a process pool
+
+        Each task covers a chunk of consecutive records; workers map the
+        archive themselves, so only results cross process boundaries.
+        """
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        path = path or self.config.fetch_config_value('archive', 'path', 'archive/responses.arc')
+        if self.archive is not None and os.path.abspath(path) == os.path.abspath(self.archive.path):
+            self.archive.flush()
+        with _lazy('ArchiveReader')(path) as reader:
+            total = len(reader)
+        self.logger.info(f"Replaying {total} responses from {path}")
+
+        workers = workers or self.config.fetch_config_value(
+            'pipeline', 'parse_workers', 0) or multiprocessing.cpu_count()
+        chunk_size = self.config.fetch_config_value('archive', 'replay_chunk_size', 256)
+        start_method = self.config.fetch_config_value('pipeline', 'start_method', 'spawn')
+        chunks = iter(range(0, total, chunk_size))
+        executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context(start_method))
+        pending = set()
+
+        def submit(count: int) -> None:
+            for start in itertools.islice(chunks, count):
+                pending.add(executor.submit(_lazy('replay_range'), path, start, min(start + chunk_size, total),
+                                            self.parser_name, extraction))
+
+        try:
+            # Bounded window of chunks in flight keeps memory flat on archives of any size
+            submit(workers * 2)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield from future.result()
+                submit(len(done))
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _create_frontier(self, seeds: List[str], max_depth: Optional[int] = None) -> CrawlFrontier:
+        """Build crawl frontier from the `crawl` config section"""
+        if max_depth is None:
+            max_depth = self.config.fetch_config_value('crawl', 'max_depth', 2)
+
+        if self.config.fetch_config_value('crawl', 'seen_filter', 'hashed') == 'bloom':
+            seen = BloomFilter(
+                self.config.fetch_config_value('crawl', 'expected_urls', 1000000),
+                self.config.fetch_config_value('crawl', 'false_positive_rate', 0.001),
+            )
+        else:
+            seen = HashedSeenSet()
+
+        allowed_domains = None
+        if self.config.fetch_config_value('crawl', 'same_domain', True):
+            allowed_domains = {urlsplit(seed).hostname for seed in seeds if urlsplit(seed).hostname}
+
+        return CrawlFrontier(
+            seen,
+            max_depth=max_depth,
+            allowed_domains=allowed_domains,
+            max_pages_per_domain=self.config.fetch_config_value('crawl', 'max_pages_per_domain', 0),
+        )
+
+    async def check_website_async(self, url: Optional[str] = None,
+                                  session: Optional["aiohttp.ClientSession"] = None) -> Optional[str]:
+        """
+        Asyncio version of check_website
+
+        Uses the same timeout and retry settings, but waits between retries
+        with asyncio.sleep so the event loop is never blocked.
+
+        Args:
+            url: URL to check (None uses the scraper URL)
+            session: Optional aiohttp session to reuse connections
+
+        Returns:
+            Page title or None if not found or all attempts failed
+        """
+        _import_aiohttp()
+
+        url = url or self.url
+        if session is None:
+            async with self._create_async_session() as own_session:
+                return await self._lookup_async(url, own_session)
+        return await self._lookup_async(url, session)
+
+    async def check_many_async(self, urls: Iterable[str],
+                               max_concurrency: Optional[int] = None) -> AsyncIterator[Tuple[str, Optional[str]]]:
+        """
+        Check many websites concurrently on the event loop
+
+        A semaphore bounds the number of requests in flight, and URLs are
+        consumed lazily so the input can be a generator of any size.
+
+        Args:
+            urls: Iterable of URLs to check
+            max_concurrency: Maximum requests in flight (None uses config value)
+
+        Yields:
+            (url, title) tuples in completion order; title is None on failure
+        """
+        import asyncio
+
+        _import_aiohttp()
+
+        if max_concurrency is None:
+            max_concurrency = self.config.fetch_config_value('scraping', 'max_concurrency', 100)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        url_iter = iter(urls)
+        pending = {}
+
+        async def bounded_scrape(url: str, session: "aiohttp.ClientSession") -> Optional[str]:
+            async with semaphore:
+                return await self._lookup_async(url, session)
+
+        async with self._create_async_session(max_concurrency) as session:
+            def submit(count: int) -> None:
+                for url in itertools.islice(url_iter, count):
+                    pending[asyncio.ensure_future(bounded_scrape(url, session))] = url
+
+            try:
+                # Only keep a bounded window of tasks alive at any time
+                submit(max_concurrency * 2)
+                while pending:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        url = pending.pop(task)
+                        yield url, task.result()
+                    submit(len(done))
+            finally:
+                for task in pending:
+                    task.cancel()
+
+    def _create_async_session(self, limit: Optional[int] = None) -> "aiohttp.ClientSession":
+        """Create aiohttp session with connection limit and headers from config"""
+        if limit is None:
+            limit = self.config.fetch_config_value('scraping', 'pool_size', 10)
+        user_agent = self.config.fetch_config_value('scraping', 'user_agent')
+        headers = {'User-Agent': user_agent} if user_agent else None
+
+        connector = aiohttp.TCPConnector(limit=limit)
+        return aiohttp.ClientSession(connector=connector, headers=headers)
+
+    async def _lookup_async(self, url: str, session: "aiohttp.ClientSession") -> Optional[str]:
+        """Serve URL from the result cache if possible, otherwise scrape it (concurrent lookups share a fetch)"""
+        if self.result_cache is None:
+            return await self._scrape_async(url, session)
+        return await self.result_cache.get_or_load_async(url, lambda: self._scrape_async(url, session))
+
+    async def _scrape_async(self, url: str, session: "aiohttp.ClientSession") -> Optional[str]:
+        """
+        Fetch URL on the event loop with retry logic and extract page title
+
+        Goes through the same robots.txt, politeness, adaptive concurrency and
+        circuit breaker gates as _scrape, sharing their per-host state with the
+        threaded engine.
+        """
+        import asyncio
+
         timeout = self.config.fetch_config_value('scraping', 'timeout', 10)
         max_retries = self.config.fetch_config_value('scraping', 'max_retries', 3)
+        max_bytes = self.config.fetch_config_value('scraping', 'max_response_bytes', 0)
+        chunk_size = self.config.fetch_config_value('scraping', 'stream_chunk_size', 8192)
+        open_action = self.config.fetch_config_value('scraping', 'circuit_open_action', 'fail')
+        self._refresh_limits()
+        scheduler, adaptive, breaker = self.scheduler, self.adaptive, self.breaker
+
+        self.logger.info(f"Starting async scraping for URL: {url}")
+
+        host = host_of(url)
+        if self.robots is not None:
+            # robots.txt is fetched with requests, so keep it off the event loop
+            allowed = await asyncio.get_running_loop().run_in_executor(None, self._robots_allowed, url, host)
+            if not allowed:
+                self.logger.warning(f"Disallowed by robots.txt: {url}")
+                return None
+
+        for attempt in range(max_retries):
+            retry_after = None
+            error = status = None
+
+            if breaker is not None and not breaker.allow(host, self._log_circuit_change):
+                if open_action == 'defer' and attempt < max_retries - 1:
+                    delay = max(breaker.retry_in(host),
+                                self.config.fetch_config_value('scraping', 'retry_delay', 1))
+                    self.logger.info(f"Circuit open for {host}, deferring {url} by {delay:.2f} seconds")
+                    await asyncio.sleep(delay)
+                    continue
+                self.logger.warning(f"Circuit open for {host}, skipping {url}")
+                return None
+
+            if adaptive is not None:
+                await adaptive.acquire_async(host)
+            started = time.perf_counter()
+            try:
+                self.logger.debug(f"Attempt {attempt + 1}/{max_retries}")
+
+                client_timeout = aiohttp.ClientTimeout(total=timeout)
+                async with scheduler.slot_async(host):
+                    started = time.perf_counter()  # Exclude time spent waiting for the host slot
+                    async with session.get(url, timeout=client_timeout) as response:
+                        response.raise_for_status()
+                        if not max_bytes and self.byte_budget is None:
+                            html = await response.text(errors='replace')
+                        else:
+                            # Parse inside the read so the budget reservation covers it, as in _fetch_limited
+                            async with read_limited_async(response, max_bytes, self.byte_budget,
+                                                          chunk_size) as html:
+                                return self._extract_title(html)
+
+                return self._extract_title(html)
+
+            except ResponseTooLarge as e:
+                self.logger.warning(f"Skipping {url}: {e}")
+                return None
+            except asyncio.TimeoutError:
+                self.logger.warning(f"Timeout on attempt {attempt + 1}")
+                error = 'timeout'
+            except aiohttp.ClientConnectionError:
+                self.logger.warning(f"Connection error on attempt {attempt + 1}")
+                error = 'connection_error'
+            except aiohttp.ClientResponseError as e:
+                self.logger.warning(f"HTTP error on attempt {attempt + 1}: {e.status} {e.message}")
+                error, status = 'http_error', e.status
+                if e.status in (429, 503) and e.headers is not None:
+                    retry_after = parse_retry_after(e.headers.get('Retry-After'))
+                    if retry_after is not None:
+                        scheduler.defer(host, self._retry_delay(attempt, retry_after))
+            except aiohttp.ClientError as e:
+                self.logger.warning(f"Request error on attempt {attempt + 1}: {e}")
+                error = 'request_error'
+            finally:
+                if breaker is not None:
+                    breaker.record(host, is_host_failure(error, status), self._log_circuit_change)
+                if adaptive is not None:
+                    new_limit = adaptive.release(host, time.perf_counter() - started,
+                                                 is_congestion(error, status))
+                    if new_limit is not None:
+                        self.logger.debug(f"Concurrency limit for {host} is now {new_limit}")
+
+            # Wait before next attempt without blocking the event loop
+            if attempt < max_retries - 1:
+                delay = self._retry_delay(attempt, retry_after)
+                self.logger.info(f"Retrying in {delay:.2f} seconds...")
+                await asyncio.sleep(delay)
+
+        # All attempts failed
+        self.logger.error(f"Failed to scrape {url} after {max_retries} attempts")
+        return None
+
+    def _extract_title(self, html: str) -> Optional[str]:
+        """
+        Extract page title from HTML
+
+        Args:
+            html: HTML document text
+
+        Returns:
+            Stripped title or None if the page has no title
+        """
+        # Perform scraping logic here
+        return self._report_title(self._parse_title(html))
+
+    def _full_title(self, response: requests.Response) -> Optional[str]:
+        """Extract page title from a fully read response"""
+        return self._deduplicated('title', response, lambda r: self._extract_title(r.text), self._report_title)
+
+    def _deduplicated(self, namespace: str, response: requests.Response, extract: Callable[[requests.Response], Any],
+                      on_duplicate: Optional[Callable[[Any], Any]] = None, near: bool = True) -> Any:
+        """
+        Run extraction unless the page duplicates a recently seen one
+
+        Args:
+            namespace: Kind of extraction, results are only reused within it
+            response: Fully read response
+            extract: Callable turning the response into the result
+            on_duplicate: Maps the earlier page's result to this page's (None reuses it as is)
+            near: Whether near duplicates are reused (False only reuses exact duplicates)
+
+        Returns:
+            Result of extract, or the reused result of a matching earlier page
+        """
+        if self.fingerprints is None:
+            return extract(response)
+
+        fingerprint = page_fingerprint(response.content, response.encoding)
+        match = self.fingerprints.lookup(namespace, fingerprint, near)
+        if match is not None:
+            kind, result = match
+            self.logger.debug(f"Page {response.url} duplicates a recent page ({kind} match), reusing its {namespace}")
+            return on_duplicate(result) if on_duplicate is not None else result
+
+        result = extract(response)
+        self.fingerprints.add(namespace, fingerprint, result)
+        return result
+
+    def _stream_title(self, response: requests.Response) -> Optional[str]:
+        """
+        Extract page title from a streamed response without downloading the body
+
+        Args:
+            response: Response opened with stream=True
+
+        Returns:
+            Stripped title or None if not found in the scanned head bytes
+        """
+        max_head_bytes = self.config.fetch_config_value('scraping', 'max_head_bytes', 65536)
+        chunk_size = self.config.fetch_config_value('scraping', 'stream_chunk_size', 8192)
+
+        chunks = response.iter_content(chunk_size=chunk_size)
+        return self._report_title(scan_title(chunks, response.encoding, max_head_bytes))
+
+    def _report_title(self, title: Optional[str]) -> Optional[str]:
+        """Log extracted title and pass it through"""
+        if title:
+            self.logger.info(f"Website title found: {title}")
+            return title
+        self.logger.warning("No title found on the page")
+        return None
+
+    def _robots_allowed(self, url: str, host: str, session: Optional[requests.Session] = None) -> bool:
+        """
+        Check robots.txt before opening a connection and apply its Crawl-delay
+
+        Args:
+            url: URL about to be fetched
+            host: Host of the URL
+            session: Optional pooled session used to fetch robots.txt
+
+        Returns:
+            True if the URL may be fetched
+        """
+        rules = self.robots.rules_for(url, session.get if session is not None else None)
+
+        if rules.crawl_delay and self.config.fetch_config_value('robots', 'respect_crawl_delay', True):
+            max_delay = self.config.fetch_config_value('robots', 'max_crawl_delay', 30)
+            self.scheduler.set_min_interval(host, min(rules.crawl_delay, max_delay))
+
+        return rules.can_fetch(url)
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Delay before the next attempt
+
+        Args:
+            attempt: Zero-based number of the failed attempt
+            retry_after: Delay requested by the server via Retry-After, if any
+
+        Returns:
+            Server-provided delay (capped at max_retry_delay) or exponential backoff
+        """
         retry_delay = self.config.fetch_config_value('scraping', 'retry_delay', 1)
+        max_delay = self.config.fetch_config_value('scraping', 'max_retry_delay', 30)
+
+        if retry_after is not None:
+            return min(retry_after, max_delay)
+        return backoff_delay(
+            attempt,
+            retry_delay,
+            self.config.fetch_config_value('scraping', 'backoff_factor', 2),
+            max_delay,
+            self.config.fetch_config_value('scraping', 'retry_jitter', True),
+        )
+
+    def _handle_response(self, url: str, response: requests.Response, cached: Optional[CacheEntry],
+                         extract) -> Optional[str]:
+        """
+        Turn a response into a title, short-circuiting on 304 Not Modified
+
+        Args:
+            url: Requested URL
+            response: HTTP response
+            cached: Validator cache entry the request was made with
+            extract: Callable extracting the title from the response
+
+        Returns:
+            Page title or None if not found
+        """
+        if cached is not None and response.status_code == 304:
+            self.logger.info(f"Not modified, using cached title for {url}")
+            self.validator_cache.touch(url)
+            return cached.title
+
+        response.raise_for_status()  # Raise an error for HTTP errors
+        title = extract(response)
+
+        if self.validator_cache is not None:
+            self.validator_cache.store(url, response.headers, title)
+        return title
+
+    def _request(self, url: str, timeout: float,
+                 session: Optional[requests.Session] = None, **kwargs) -> requests.Response:
+        """Send GET request through the pooled session if given"""
+        if session is None:
+            return requests.get(url, timeout=timeout, **kwargs)
+        return session.get(url, timeout=timeout, **kwargs)
+
+    @contextmanager
+    def _fetch(self, url: str, timeout: float, session: Optional[requests.Session] = None,
+               **kwargs) -> Iterator[requests.Response]:
+        """
+        Send GET request, reading the body within the size cap and byte budget if configured
+
+        Args:
+            url: URL to fetch
+            timeout: Request timeout in seconds
+            session: Optional pooled session to send requests through
+            **kwargs: Extra arguments for the request
+
+        Yields:
+            Response whose body stays within scraping.max_response_bytes
+
+        Raises:
+            ResponseTooLarge: If the body exceeds scraping.max_response_bytes
+        """
+        max_bytes = self.config.fetch_config_value('scraping', 'max_response_bytes', 0)
+        if not max_bytes and self.byte_budget is None:
+            yield self._request(url, timeout, session, **kwargs)
+            return
+
+        chunk_size = self.config.fetch_config_value('scraping', 'stream_chunk_size', 8192)
+        # Stream so an oversized body is abandoned after at most max_bytes instead of downloaded
+        with self._request(url, timeout, session, stream=True, **kwargs) as response:
+            with read_limited(response, max_bytes, self.byte_budget, chunk_size) as buffered:
+                yield buffered
+
+    def _lookup(self, url: str, session: Optional[requests.Session] = None) -> Optional[str]:
+        """
+        Serve URL from the result cache if possible, otherwise scrape it
+
+        Concurrent lookups of the same URL share a single fetch.
 
-        self.logger.info(f"Starting scraping for URL: {self.url}")
+        Args:
+            url: URL to check
+            session: Optional pooled session to send requests through
+
+        Returns:
+            Page title or None if not found or all attempts failed
+        """
+        if self.result_cache is None:
+            return self._scrape(url, session)
+        return self.result_cache.get_or_load(url, lambda: self._scrape(url, session))
+
+    def _scrape(self, url: str, session: Optional[requests.Session] = None,
+                extract_page: Optional[Callable[[requests.Response], Any]] = None) -> Any:
+        """
+        Fetch URL with retry logic and extract page title
+
+        Args:
+            url: URL to scrape
+            session: Optional pooled session to send requests through
+            extract_page: Custom extraction from the full response instead of
+                the title (bypasses the validator cache and streaming mode)
+
+        Returns:
+            Page title (or extract_page result) or None if all attempts failed
+        """
+        timeout = self.config.fetch_config_value('scraping', 'timeout', 10)
+        max_retries = self.config.fetch_config_value('scraping', 'max_retries', 3)
+        # Capturing needs the whole body, so it turns streaming title mode off
+        stream_title = self.config.fetch_config_value('scraping', 'stream_title', False) and self.archive is None
+        open_action = self.config.fetch_config_value('scraping', 'circuit_open_action', 'fail')
+        # Limiters are read once, so every acquire is released on the same object after a reload
+        self._refresh_limits()
+        scheduler, adaptive, breaker = self.scheduler, self.adaptive, self.breaker
+
+        self.logger.info(f"Starting scraping for URL: {url}")
+
+        host = host_of(url)
+        if self.robots is not None and not self._robots_allowed(url, host, session):
+            self.logger.warning(f"Disallowed by robots.txt: {url}")
+            return None
+
+        use_cache = self.validator_cache is not None and extract_page is None
+        cached = self.validator_cache.get(url) if use_cache else None
+        conditional_headers = ValidatorCache.conditional_headers(cached)
+        request_kwargs = {'headers': conditional_headers} if conditional_headers else {}
 
         for attempt in range(max_retries):
+            retry_after = None
+            error = status = None
+
+            if breaker is not None and not breaker.allow(host, self._log_circuit_change):
+                if open_action == 'defer' and attempt < max_retries - 1:
+                    # Wait for the circuit to let trial requests through instead of giving up
+                    delay = max(breaker.retry_in(host),
+                                self.config.fetch_config_value('scraping', 'retry_delay', 1))
+                    self.logger.info(f"Circuit open for {host}, deferring {url} by {delay:.2f} seconds")
+                    time.sleep(delay)
+                    continue
+                self.logger.warning(f"Circuit open for {host}, skipping {url}")
+                return None
+
+            if adaptive is not None:
+                adaptive.acquire(host)
+            started = time.perf_counter()
             try:
                 self.logger.debug(f"Attempt {attempt + 1}/{max_retries}")
 
-                response = requests.get(self.url, timeout=timeout)
-                response.raise_for_status()  # Raise an error for HTTP errors
+                with scheduler.slot(host):
+                    started = time.perf_counter()  # Exclude time spent waiting for the host slot
 
-                soup = BeautifulSoup(response.text, 'html.parser')
+                    if extract_page is not None:
+                        with self._fetch(url, timeout, session) as response:
+                            response.raise_for_status()
+                            self._capture(url, response)
+                            return self._extract(host, attempt, started, response, extract_page)
 
-                # Perform scraping logic here
-                if soup.title and soup.title.string:
-                    title = soup.title.string.strip()
-                    self.logger.info(f"Website title found: {title}")
-                    return title
-                else:
-                    self.logger.warning("No title found on the page")
-                    return None
+                    if stream_title:
+                        # Read only the head of the page and stop after </title>
+                        # Closing the response drops the connection instead of draining the body
+                        with self._request(url, timeout, session, stream=True, **request_kwargs) as response:
+                            return self._extract(host, attempt, started, response,
+                                                 lambda r: self._handle_response(url, r, cached, self._stream_title),
+                                                 streamed=True)
+
+                    with self._fetch(url, timeout, session, **request_kwargs) as response:
+                        self._capture(url, response)
+                        return self._extract(host, attempt, started, response,
+                                             lambda r: self._handle_response(url, r, cached, self._full_title))
 
+            except ResponseTooLarge as e:
+                # Retrying would download the same oversized body again
+                self.logger.warning(f"Skipping {url}: {e}")
+                self._observe_failure(host, started, 'too_large')
+                if self.metrics is not None:
+                    self.metrics.observe_request(host, attempt)
+                return None
             except requests.Timeout:
                 self.logger.warning(f"Timeout on attempt {attempt + 1}")
+                error = 'timeout'
             except requests.ConnectionError:
                 self.logger.warning(f"Connection error on attempt {attempt + 1}")
+                error = 'connection_error'
             except requests.HTTPError as e:
                 self.logger.warning(f"HTTP error on attempt {attempt + 1}: {e}")
+                error = 'http_error'
+                status = e.response.status_code if e.response is not None else None
+                if status in (429, 503):
+                    retry_after = parse_retry_after(e.response.headers.get('Retry-After'))
+                    if retry_after is not None:
+                        # Server asked the whole host to back off, not just this URL; capped
+                        # like the retry delay so a huge value cannot stall the host for good
+                        scheduler.defer(host, self._retry_delay(attempt, retry_after))
             except requests.RequestException as e:
                 self.logger.warning(f"Request error on attempt {attempt + 1}: {e}")
+                error = 'request_error'
+            finally:
+                if breaker is not None:
+                    breaker.record(host, is_host_failure(error, status), self._log_circuit_change)
+                if adaptive is not None:
+                    new_limit = adaptive.release(host, time.perf_counter() - started,
+                                                 is_congestion(error, status))
+                    if new_limit is not None:
+                        self.logger.debug(f"Concurrency limit for {host} is now {new_limit}")
+
+            self._observe_failure(host, started, error, status)
 
             # Wait before next attempt (if not the last attempt)
             if attempt < max_retries - 1:
-                self.logger.info(f"Retrying in {retry_delay} seconds...")
-                import time
-                time.sleep(retry_delay)
+                delay = self._retry_delay(attempt, retry_after)
+                self.logger.info(f"Retrying in {delay:.2f} seconds...")
+                time.sleep(delay)
 
         # All attempts failed
-        self.logger.error(f"Failed to scrape after {max_retries} attempts")
+        self.logger.error(f"Failed to scrape {url} after {max_retries} attempts")
+        if self.metrics is not None:
+            self.metrics.observe_request(host, max(max_retries - 1, 0))
         return None
 
+    def _capture(self, url: str, response: requests.Response) -> None:
+        """Append a successful response to the capture archive if enabled"""
+        if self.archive is not None and 200 <= response.status_code < 300:
+            self.archive.write_response(url, response)
+
+    def _extract(self, host: str, attempt: int, started: float, response: requests.Response,
+                 extract: Callable[[requests.Response], Any], streamed: bool = False) -> Any:
+        """Run extraction on a response, timing it when metrics are enabled"""
+        if self.metrics is None:
+            return extract(response)
+        return self._timed(host, attempt, started, response, extract, streamed)
+
+    def _timed(self, host: str, attempt: int, started: float, response: requests.Response,
+               extract: Callable[[requests.Response], Any], streamed: bool = False) -> Any:
+        """
+        Run extraction on a response and record the attempt's phase timings
+
+        TTFB comes from response.elapsed and includes DNS and connect time
+        on fresh connections (requests does not expose them separately).
+        Streamed bodies are downloaded during extraction, so their download
+        phase covers both reading and scanning.
+
+        Args:
+            host: Request host
+            attempt: Zero-based attempt number
+            started: perf_counter() value when the request was sent
+            response: HTTP response
+            extract: Callable turning the response into the result
+            streamed: Whether the body is read lazily by extract
+
+        Returns:
+            Result of extract
+        """
+        fetched = time.perf_counter()
+        elapsed = getattr(response, 'elapsed', None)
+        ttfb = elapsed.total_seconds() if isinstance(elapsed, timedelta) else None
+
+        result = extract(response)
+        done = time.perf_counter()
+
+        if streamed:
+            download, parse = done - started - (ttfb or 0), None
+            tell = getattr(response.raw, 'tell', None)
+            bytes_received = tell() if callable(tell) else 0
+        else:
+            download, parse = fetched - started - (ttfb or 0), done - fetched
+            bytes_received = len(response.content or b'')
+
+        self.metrics.observe_attempt(host, status=response.status_code, bytes_received=bytes_received,
+                                     ttfb=ttfb, download=max(download, 0.0), parse=parse,
+                                     total=done - started)
+        self.metrics.observe_request(host, attempt)
+        return result
+
+    def _log_circuit_change(self, host: str, old: str, new: str) -> None:
+        """Log circuit breaker state changes"""
+        if new == 'open':
+            self.logger.warning(f"Circuit for {host} opened ({old} -> {new})")
+        else:
+            self.logger.info(f"Circuit for {host} {old} -> {new}")
+
+    def _observe_failure(self, host: str, started: float, error: str, status: Optional[int] = None) -> None:
+        """Record a failed attempt if metrics are enabled"""
+        if self.metrics is not None:
+            self.metrics.observe_attempt(host, status=status, error=error,
+                                         total=time.perf_counter() - started)
+
 if __name__ == "__main__":
     scraper = WebScraper("https://example.com")
     title = scraper.check_website()
@@ -75,4 +1276,4 @@ if __name__ == "__main__":
     if title:
         print(f"Website title is: {title}")
     else:
-        print("Failed to retrieve website title.")
\ No newline at end of file
+        print("Failed to retrieve website title.")
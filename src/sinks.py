@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+
+import csv
+import gzip
+import io
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    from .config import Config
+except ImportError:
+    from config import Config
+
+
+# File modes: refuse to overwrite, overwrite, append
+MODES = ('x', 'w', 'a')
+
+
+class RecordSink(ABC):
+    """Base class for sinks writing records in buffered batches with size-based rotation"""
+
+    def __init__(self, path: str, flush_size: int = 1000, rotate_bytes: int = 0, mode: str = 'x'):
+        """
+        Initialize sink
+
+        Args:
+            path: Output file path; rotated files get .1, .2, ... before the extension
+            flush_size: Number of buffered records that triggers a write
+            rotate_bytes: Start a new file once the current one reaches this size (0 disables)
+            mode: 'x' fails if an output file exists, 'w' overwrites it, 'a' appends to it
+
+        Raises:
+            ValueError: If the mode is unknown
+            FileExistsError: If mode is 'x' and the output file exists
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown sink mode '{mode}', choose from: {', '.join(MODES)}")
+        if mode == 'x' and os.path.exists(path):
+            raise FileExistsError(f"Output file {path} already exists")
+        self.path = path
+        self.mode = mode
+        self.flush_size = max(1, flush_size)
+        self.rotate_bytes = rotate_bytes
+        self.paths: List[str] = []
+        self.records_written = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._raw = None
+        self._stream = None
+        self._index = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """
+        Buffer one record, writing the batch when flush_size is reached
+
+        Args:
+            record: Record dictionary
+        """
+        with self._lock:
+            self._buffer.append(record)
+            if len(self._buffer) >= self.flush_size:
+                self._flush_locked()
+
+    def write_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Write every record of an iterable, consuming it lazily"""
+        for record in records:
+            self.write(record)
+
+    def flush(self) -> None:
+        """Write buffered records to disk"""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        """Flush buffered records and close the current file"""
+        with self._lock:
+            self._flush_locked()
+            self._close_file()
+
+    def __enter__(self) -> "RecordSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _flush_locked(self) -> None:
+        if not self._buffer:
+            return
+        if self._stream is None:
+            self._open_next()
+        self._write_batch(self._buffer)
+        self._stream.flush()
+        self.records_written += len(self._buffer)
+        self._buffer = []
+
+        if self.rotate_bytes and self._raw.tell() >= self.rotate_bytes:
+            self._close_file()
+
+    def _next_path(self) -> str:
+        if self._index == 0:
+            return self.path
+        directory, name = os.path.split(self.path)
+        stem, dot, extension = name.partition('.')
+        return os.path.join(directory, f"{stem}.{self._index}{dot}{extension}")
+
+    def _open_next(self) -> None:
+        path = self._next_path()
+        self._index += 1
+        self.paths.append(path)
+        self._raw = open(path, self.mode + 'b')
+        self._stream = self._wrap(self._raw)
+        self._on_open()
+
+    def _close_file(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+            if not self._raw.closed:
+                self._raw.close()
+            self._stream = None
+            self._raw = None
+
+    def _wrap(self, raw) -> io.TextIOBase:
+        """Wrap the binary file in the text stream records are written to"""
+        return io.TextIOWrapper(raw, encoding='utf-8', newline='')
+
+    def _on_open(self) -> None:
+        """Hook called after a new file is opened"""
+        pass
+
+    @abstractmethod
+    def _write_batch(self, records: List[Dict[str, Any]]) -> None:
+        """Write a batch of records to the current stream"""
+
+
+class JsonlSink(RecordSink):
+    """Write records as JSON Lines"""
+
+    def _write_batch(self, records: List[Dict[str, Any]]) -> None:
+        self._stream.write(''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in records))
+
+
+class GzipJsonlSink(JsonlSink):
+    """Write records as gzip-compressed JSON Lines"""
+
+    def __init__(self, path: str, flush_size: int = 1000, rotate_bytes: int = 0, mode: str = 'x',
+                 compresslevel: int = 6):
+        super().__init__(path, flush_size, rotate_bytes, mode)
+        self.compresslevel = compresslevel
+
+    def _wrap(self, raw) -> io.TextIOBase:
+        gz = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=self.compresslevel)
+        return io.TextIOWrapper(gz, encoding='utf-8', newline='')
+
+
+class CsvSink(RecordSink):
+    """
+    Write records as CSV, lists are joined with '|'
+
+    The columns are fieldnames, or the header of the file being appended to,
+    or the keys of the first record. A record with other keys fails the
+    write unless extrasaction is 'ignore'.
+    """
+
+    def __init__(self, path: str, flush_size: int = 1000, rotate_bytes: int = 0, mode: str = 'x',
+                 fieldnames: Optional[List[str]] = None, extrasaction: str = 'raise'):
+        super().__init__(path, flush_size, rotate_bytes, mode)
+        self.fieldnames = fieldnames
+        self.extrasaction = extrasaction
+        self._writer = None
+
+    def _on_open(self) -> None:
+        self._writer = None
+
+    def _write_batch(self, records: List[Dict[str, Any]]) -> None:
+        appending = self._writer is None and self._raw.tell() > 0
+        if self.fieldnames is None:
+            self.fieldnames = self._read_header() if appending else list(records[0].keys())
+        if self.extrasaction == 'raise':
+            # Checked before writing, so a failed batch stays buffered and nothing is half written
+            extra = {key for record in records for key in record} - set(self.fieldnames)
+            if extra:
+                raise ValueError(f"Record keys {sorted(extra)} are not CSV columns {self.fieldnames}")
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._stream, fieldnames=self.fieldnames, extrasaction='ignore')
+            if not appending:
+                self._writer.writeheader()
+        self._writer.writerows(
+            {k: '|'.join(map(str, v)) if isinstance(v, list) else v for k, v in r.items()} for r in records
+        )
+
+    def _read_header(self) -> List[str]:
+        with open(self.paths[-1], newline='', encoding='utf-8') as f:
+            return next(csv.reader(f))
+
+
+SINKS = {
+    'jsonl': JsonlSink,
+    'jsonl.gz': GzipJsonlSink,
+    'csv': CsvSink,
+}
+
+
+def open_sink(path: str, format: Optional[str] = None, flush_size: int = 1000,
+              rotate_bytes: int = 0, mode: str = 'x') -> RecordSink:
+    """
+    Create sink for a path
+
+    Args:
+        path: Output file path
+        format: jsonl, jsonl.gz or csv (None infers it from the path)
+        flush_size: Number of buffered records that triggers a write
+        rotate_bytes: File size that triggers rotation (0 disables)
+        mode: 'x' fails if an output file exists, 'w' overwrites it, 'a' appends to it
+
+    Returns:
+        RecordSink instance
+
+    Raises:
+        ValueError: If the format or mode is unknown
+        FileExistsError: If mode is 'x' and the output file exists
+    """
+    if format is None:
+        name = os.path.basename(path)
+        format = next((f for f in sorted(SINKS, key=len, reverse=True) if name.endswith('.' + f)), 'jsonl')
+    if format not in SINKS:
+        raise ValueError(f"Unknown output format '{format}', choose from: {', '.join(SINKS)}")
+    return SINKS[format](path, flush_size=flush_size, rotate_bytes=rotate_bytes, mode=mode)
+
+
+def sink_from_config(config: Config, path: Optional[str] = None, format: Optional[str] = None) -> RecordSink:
+    """
+    Create sink from the `output` config section
+
+    Args:
+        config: Config instance
+        path: Output path overriding the config value
+        format: Output format overriding the config value
+
+    Returns:
+        RecordSink instance
+    """
+    rotate_mb = config.fetch_config_value('output', 'rotate_mb', 0)
+    return open_sink(
+        path or config.fetch_config_value('output', 'path', 'output/results.jsonl'),
+        format or config.fetch_config_value('output', 'format'),
+        config.fetch_config_value('output', 'flush_size', 1000),
+        int(rotate_mb * 1024 * 1024),
+        config.fetch_config_value('output', 'mode', 'x'),
+    )
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+
+import gzip
+import io
+import json
+import os
+import tempfile
+import threading
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+import requests
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+@dataclass(frozen=True)
+class SitemapEntry:
+    """Page URL listed in a sitemap"""
+    url: str
+    lastmod: Optional[datetime] = None
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a W3C datetime as used by <lastmod>
+
+    Args:
+        value: Text such as 2025-01-31, 2025-01-31T10:00:00Z or 2025-01
+
+    Returns:
+        Timezone-aware datetime (UTC when no offset is given), None if missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        # Year or year-month precision
+        try:
+            parsed = datetime.strptime(value, '%Y-%m' if len(value) == 7 else '%Y')
+        except ValueError:
+            return None
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+
+class _ChunkStream(io.RawIOBase):
+    """Read-only file object over an iterator of byte chunks"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._pending = b''
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            self._pending = next(self._chunks, b'')
+            if not self._pending:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size], self._pending = self._pending[:size], self._pending[size:]
+        return size
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def iter_sitemap(stream: BinaryIO) -> Iterator[Tuple[str, str, Optional[datetime]]]:
+    """
+    Stream entries of a sitemap or sitemap index
+
+    Elements are parsed incrementally and cleared once read, so memory use
+    does not grow with the number of entries. Gzip-compressed input is
+    detected by its magic bytes.
+
+    Args:
+        stream: Binary file-like object with the sitemap XML
+
+    Yields:
+        ('url' or 'sitemap', location, lastmod) for every <url> / <sitemap> entry
+    """
+    buffered = stream if hasattr(stream, 'peek') else io.BufferedReader(stream)
+    if buffered.peek(2)[:2] == GZIP_MAGIC:
+        buffered = gzip.GzipFile(fileobj=buffered)
+
+    root = None
+    for event, element in ET.iterparse(buffered, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = element
+            continue
+
+        kind = _local_name(element.tag)
+        if kind in ('url', 'sitemap'):
+            loc = lastmod = None
+            for child in element:
+                name = _local_name(child.tag)
+                if name == 'loc':
+                    loc = (child.text or '').strip()
+                elif name == 'lastmod':
+                    lastmod = parse_lastmod(child.text)
+            if loc:
+                yield kind, loc, lastmod
+            # Drop finished entries so the tree never holds more than one
+            root.clear()
+
+
+class SitemapReader:
+    """Discover a site's sitemaps and stream the page URLs they list"""
+
+    def __init__(self, get: Optional[Callable[..., requests.Response]] = None, timeout: float = 10,
+                 max_depth: int = 3, known_paths: Iterable[str] = ('/sitemap.xml',), logger=None):
+        """
+        Initialize reader
+
+        Args:
+            get: Function used to fetch sitemaps (default requests.get)
+            timeout: Request timeout in seconds
+            max_depth: Maximum nesting of sitemap indexes
+            known_paths: Paths tried when robots.txt lists no sitemaps
+            logger: Optional logger for skipped sitemaps
+        """
+        self.get = get or requests.get
+        self.timeout = timeout
+        self.max_depth = max_depth
+        self.known_paths = list(known_paths)
+        self.logger = logger
+        self.skipped_sitemaps = 0
+        self.skipped_urls = 0
+        self.read = 0
+        self.missing = 0
+        self.failed = 0
+
+    @property
+    def complete(self) -> bool:
+        """Whether at least one sitemap was read and none failed (404 / 410 are not failures)"""
+        return self.read > 0 and self.failed == 0
+
+    def discover(self, site_url: str, robots_sitemaps: Optional[List[str]] = None) -> List[str]:
+        """
+        Find the sitemap URLs of a site
+
+        Args:
+            site_url: Any URL on the site
+            robots_sitemaps: Sitemap lines from the site's robots.txt
+
+        Returns:
+            Absolute sitemap URLs from robots.txt, or the known paths if it lists none
+        """
+        parts = urlsplit(site_url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        if robots_sitemaps:
+            return [urljoin(origin + '/', url) for url in robots_sitemaps]
+        return [urljoin(origin + '/', path) for path in self.known_paths]
+
+    def entries(self, sitemap_urls: Iterable[str], since: Optional[datetime] = None) -> Iterator[SitemapEntry]:
+        """
+        Stream page entries from sitemaps, descending into sitemap indexes
+
+        Sitemaps often give date-only lastmod values, so since is compared
+        at day precision: pages changed earlier on the same day are read
+        again rather than missed.
+
+        Args:
+            sitemap_urls: Sitemap or sitemap index URLs
+            since: Skip pages (and whole child sitemaps) with an older lastmod;
+                entries without lastmod are always yielded
+
+        Yields:
+            SitemapEntry for every page URL, in sitemap order
+        """
+        if since is not None:
+            since = since.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        seen = set()
+        for url in sitemap_urls:
+            yield from self._read(url, since, 0, seen)
+
+    def _read(self, url: str, since: Optional[datetime], depth: int, seen: set) -> Iterator[SitemapEntry]:
+        if url in seen:
+            return
+        seen.add(url)
+
+        try:
+            response = self.get(url, timeout=self.timeout, stream=True)
+        except requests.RequestException as e:
+            self._log(f"Could not fetch sitemap {url}: {e}")
+            self.failed += 1
+            return
+
+        with response:
+            if not 200 <= response.status_code < 300:
+                self._log(f"Could not fetch sitemap {url}: HTTP {response.status_code}")
+                if response.status_code in (404, 410):
+                    self.missing += 1
+                else:
+                    self.failed += 1
+                return
+            # iter_content undoes Content-Encoding; .gz files are detected by iter_sitemap
+            chunks = response.iter_content(chunk_size=65536)
+            try:
+                for kind, loc, lastmod in iter_sitemap(_ChunkStream(chunks)):
+                    if since is not None and lastmod is not None and lastmod < since:
+                        if kind == 'sitemap':
+                            self.skipped_sitemaps += 1
+                        else:
+                            self.skipped_urls += 1
+                        continue
+                    if kind == 'url':
+                        yield SitemapEntry(urljoin(url, loc), lastmod)
+                    elif depth < self.max_depth:
+                        # The child is streamed while this index stays open, so memory is per level
+                        yield from self._read(urljoin(url, loc), since, depth + 1, seen)
+            except (ET.ParseError, OSError, EOFError, requests.RequestException) as e:
+                self._log(f"Stopped reading sitemap {url}: {e}")
+                self.failed += 1
+            else:
+                self.read += 1
+
+    def _log(self, message: str) -> None:
+        if self.logger is not None:
+            self.logger.warning(message)
+
+
+class SitemapState:
+    """When each site's sitemaps were last read, persisted as a small JSON file"""
+
+    def __init__(self, path: str):
+        """
+        Initialize state
+
+        Args:
+            path: Path to the JSON state file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, str]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def last_run(self, site: str) -> Optional[datetime]:
+        """
+        Get the start time of the last completed read of a site
+
+        Args:
+            site: Site origin
+
+        Returns:
+            Timezone-aware datetime or None if the site was never read
+        """
+        with self._lock:
+            return parse_lastmod(self._load().get(site))
+
+    def mark(self, site: str, started: datetime) -> None:
+        """
+        Record a completed read of a site
+
+        Args:
+            site: Site origin
+            started: When the read started (pages changed after this are read next time)
+        """
+        with self._lock:
+            state = self._load()
+            state[site] = started.isoformat()
+            directory = os.path.dirname(self.path) or '.'
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(state, f, indent=4)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+import itertools
+import json
+import sys
+import pathlib
+
+import pytest
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+from src import WebScraper
+
+
+@pytest.fixture
+def write_config(tmp_path):
+    """
+    Write config files for tests against a local server
+
+    Scraping defaults to a short timeout, one attempt and no retry delay, and
+    the log goes to tmp_path instead of the repository's logs/ directory.
+    Keyword arguments are config sections; scraping and logging are merged
+    into the defaults, others are written as given. Every call writes a new
+    file, so process-wide config caching never returns an older one.
+
+    Returns:
+        Function taking config sections and returning the config file path
+    """
+    counter = itertools.count()
+
+    def write(**sections) -> str:
+        config = {
+            "scraping": {"timeout": 5, "max_retries": 1, "retry_delay": 0, **sections.pop('scraping', {})},
+            "logging": {"level": "DEBUG", "console_output": False, "file_path": str(tmp_path / 'scraper.log'),
+                        **sections.pop('logging', {})},
+            **sections
+        }
+        index = next(counter)
+        path = tmp_path / (f'config{index}.json' if index else 'config.json')
+        path.write_text(json.dumps(config))
+        return str(path)
+
+    return write
+
+
+@pytest.fixture
+def scraper_factory(write_config):
+    """
+    Create WebScrapers with a config written by write_config
+
+    Returns:
+        Function taking the scraper URL and config sections
+    """
+    def make(url: str, **sections) -> WebScraper:
+        return WebScraper(url, config_file=write_config(**sections))
+
+    return make
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Local in-process HTTP server used by tests that need real network I/O
+"""
+
+import gzip
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serve a few fixed routes used by the test suite"""
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        self.server.hits[path] = self.server.hits.get(path, 0) + 1
+
+        if path.startswith('/title/'):
+            name = path[len('/title/'):]
+            self._send(200, f'<html><head><title>{name}</title></head><body></body></html>')
+        elif path.startswith('/etag/'):
+            name = path[len('/etag/'):]
+            if self.headers.get('If-None-Match') == f'"{name}"':
+                self.send_response(304)
+                self.send_header('ETag', f'"{name}"')
+                self.end_headers()
+            else:
+                self._send(200, f'<html><head><title>{name}</title></head></html>',
+                           {'ETag': f'"{name}"', 'Last-Modified': 'Wed, 01 Jan 2025 00:00:00 GMT'})
+        elif path.startswith('/crawl/'):
+            # Binary tree of pages: n links to 2n and 2n+1
+            n = int(path[len('/crawl/'):])
+            links = (f'<a href="{2 * n}">left</a><a href="/crawl/{2 * n + 1}#top">right</a>'
+                     '<a href="http://other.example/">external</a><a href="mailto:x@y">mail</a>')
+            self._send(200, f'<html><head><title>Page {n}</title></head><body>{links}</body></html>')
+        elif path.startswith('/quotes/'):
+            # Paginated quotes site, 2 quotes per page, 3 pages
+            n = int(path[len('/quotes/'):])
+            quotes = ''.join(
+                f'<div class="quote"><span class="text">Quote {n}.{i}</span>'
+                f'<small class="author">Author {i}</small><a href="/author/{i}">about</a>'
+                f'<a class="tag" href="/tag/a">a</a><a class="tag" href="/tag/b{n}">b{n}</a></div>'
+                for i in range(2)
+            )
+            pager = f'<li class="next"><a href="/quotes/{n + 1}">Next</a></li>' if n < 3 else ''
+            self._send(200, f'<html><head><title>Quotes</title></head><body>{quotes}{pager}</body></html>')
+        elif path == '/robots.txt':
+            self._send(200, 'User-agent: *\nDisallow: /private\nCrawl-delay: 0.05\n'
+                            'Sitemap: /sitemap.xml\n')
+        elif path.startswith('/big/'):
+            # Page with a body of <kb> kilobytes, /big/<kb>/nolength omits Content-Length
+            kb, _, mode = path[len('/big/'):].partition('/')
+            body = '<html><head><title>Big</title></head><body>' + 'x' * (int(kb) * 1024) + '</body></html>'
+            if mode == 'nolength':
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.end_headers()
+                self.wfile.write(body.encode('utf-8'))
+            else:
+                self._send(200, body)
+        elif path == '/sitemap.xml':
+            # Sitemap index: a gzipped child, an old child and a loop back to itself
+            self._send(200, '<?xml version="1.0" encoding="UTF-8"?>'
+                            '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                            '<sitemap><loc>/sitemap-pages.xml.gz</loc><lastmod>2030-01-01</lastmod></sitemap>'
+                            '<sitemap><loc>/sitemap-old.xml</loc><lastmod>2020-01-01</lastmod></sitemap>'
+                            '<sitemap><loc>/sitemap.xml</loc></sitemap>'
+                            '</sitemapindex>')
+        elif path == '/sitemap-pages.xml.gz':
+            urls = ('<url><loc>/title/new</loc><lastmod>2030-01-01T10:00:00Z</lastmod></url>'
+                    '<url><loc>/title/old</loc><lastmod>2020-01-01T10:00:00+02:00</lastmod></url>'
+                    '<url><loc>/title/unknown</loc></url>')
+            body = gzip.compress(('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                                  f'{urls}</urlset>').encode('utf-8'))
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/gzip')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif path == '/sitemap-old.xml':
+            self._send(200, '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                            '<url><loc>/title/archived</loc><lastmod>2019-05</lastmod></url></urlset>')
+        elif path.startswith('/mirror/'):
+            # Same article on every URL, only the session token differs
+            n = path[len('/mirror/'):]
+            article = ' '.join(f'word{i % 37} text{i % 11}' for i in range(200))
+            self._send(200, f'<html><head><title>Mirror</title></head><body><p>{article}</p>'
+                            f'<span>session {n}-{time.monotonic_ns()}</span></body></html>')
+        elif path.startswith('/charset/'):
+            name = path[len('/charset/'):]
+            self._send(200, '<html><head><title>Charset</title></head></html>',
+                       content_type=f'text/html; charset={name}')
+        elif path.startswith('/throttled/'):
+            # 429 asking the client to come back after <seconds>
+            self._send(429, 'Too Many Requests', {'Retry-After': path[len('/throttled/'):]})
+        elif path == '/notitle':
+            self._send(200, '<html><head></head><body>No title here</body></html>')
+        elif path == '/error':
+            self._send(500, 'Internal Server Error')
+        elif path.startswith('/slow/'):
+            time.sleep(float(path[len('/slow/'):]))
+            self._send(200, '<html><head><title>Slow</title></head></html>')
+        else:
+            self._send(404, 'Not Found')
+
+    def _send(self, status: int, body: str, headers: dict = None,
+              content_type: str = 'text/html; charset=utf-8') -> None:
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        """Keep test output quiet"""
+        pass
+
+
+class LocalServer:
+    """Run a threaded HTTP server on a free localhost port"""
+
+    def __init__(self):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.hits = {}
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def hits(self) -> dict:
+        return self.httpd.hits
+
+    def __enter__(self) -> "LocalServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
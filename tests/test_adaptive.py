@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+import pytest
+import asyncio
+import threading
+import sys
+import pathlib
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+from src.adaptive import AdaptiveLimiter, is_congestion
+from tests.local_server import LocalServer
+
+
+class TestIsCongestion:
+    """Test outcome classification"""
+
+    def test_classification(self):
+        """Test which outcomes count as overload"""
+        assert is_congestion('timeout')
+        assert is_congestion('connection_error')
+        assert is_congestion('http_error', 429)
+        assert is_congestion('http_error', 503)
+        assert not is_congestion('http_error', 404)
+        assert not is_congestion('request_error')
+        assert not is_congestion(None, 200)
+
+
+class TestAdaptiveLimiter:
+    """Test suite for AdaptiveLimiter class"""
+
+    def _round(self, limiter, host, latency=0.01, congested=False):
+        limiter.acquire(host)
+        return limiter.release(host, latency, congested)
+
+    def test_additive_increase_on_healthy_responses(self):
+        """Test that the limit grows by about one per round of requests"""
+        limiter = AdaptiveLimiter(initial=2, maximum=10)
+        for _ in range(3):
+            self._round(limiter, 'a.com')
+        assert limiter.limit('a.com') == 3
+
+        for _ in range(500):
+            self._round(limiter, 'a.com')
+        assert limiter.limit('a.com') == 10
+
+    def test_multiplicative_decrease_with_cooldown(self):
+        """Test that a burst of failures only cuts the limit once"""
+        limiter = AdaptiveLimiter(initial=16, cooldown_seconds=60)
+        assert self._round(limiter, 'a.com', congested=True) == 8
+        for _ in range(5):
+            self._round(limiter, 'a.com', congested=True)
+        assert limiter.limit('a.com') == 8
+
+        limiter = AdaptiveLimiter(initial=16, minimum=2, cooldown_seconds=0)
+        for _ in range(10):
+            self._round(limiter, 'a.com', congested=True)
+        assert limiter.limit('a.com') == 2
+
+    def test_slow_responses_hold_the_limit(self):
+        """Test that growth stops when latency rises well above the fastest seen"""
+        limiter = AdaptiveLimiter(initial=4, latency_tolerance=2.0)
+        self._round(limiter, 'a.com', latency=0.01)
+        before = limiter.snapshot()['a.com']['limit']
+        for _ in range(50):
+            self._round(limiter, 'a.com', latency=1.0)
+        assert limiter.limit('a.com') == before
+
+    def test_acquire_blocks_at_limit(self):
+        """Test that requests beyond the host's limit wait for a slot"""
+        limiter = AdaptiveLimiter(initial=1)
+        limiter.acquire('a.com')
+        limiter.acquire('b.com')  # Other hosts are independent
+        acquired = threading.Event()
+
+        thread = threading.Thread(target=lambda: (limiter.acquire('a.com'), acquired.set()))
+        thread.start()
+        assert not acquired.wait(0.1)
+        limiter.release('a.com', 0.01, False)
+        assert acquired.wait(1)
+        thread.join()
+        assert limiter.snapshot()['a.com']['in_flight'] == 1
+
+
+class TestScraperAdaptive:
+    """Test WebScraper with adaptive concurrency against a local server"""
+
+    def test_limits_follow_outcomes(self, scraper_factory):
+        """Test that failing hosts are cut back and healthy ones grow"""
+        with LocalServer() as healthy, LocalServer() as failing:
+            urls = [f"{healthy.base_url}/title/p{i}" for i in range(40)] + [f"{failing.base_url}/error"] * 5
+            scraper = scraper_factory(urls[0], adaptive={"enabled": True, "initial_concurrency": 4,
+                                                         "cooldown_seconds": 0, "latency_tolerance": 1000})
+            scraper.adaptive = AdaptiveLimiter(initial=4, cooldown_seconds=0, latency_tolerance=1000)
+            results = list(scraper.check_many(urls, max_workers=8))
+
+        limits = scraper.adaptive.snapshot()
+        assert len(results) == 45
+        assert limits[healthy.base_url.split('://')[1]]['limit'] > 4
+        assert limits[failing.base_url.split('://')[1]]['limit'] == 1
+        assert all(state['in_flight'] == 0 for state in limits.values())
+
+    def test_async_limits_follow_outcomes(self, scraper_factory):
+        """Test that the asyncio engine acquires and releases the same limits"""
+        pytest.importorskip("aiohttp")
+
+        async def run(urls):
+            return [item async for item in scraper.check_many_async(urls, max_concurrency=8)]
+
+        with LocalServer() as healthy, LocalServer() as failing:
+            urls = [f"{healthy.base_url}/title/p{i}" for i in range(40)] + [f"{failing.base_url}/error"] * 5
+            scraper = scraper_factory(urls[0], adaptive={"enabled": True, "initial_concurrency": 4,
+                                                         "cooldown_seconds": 0, "latency_tolerance": 1000})
+            scraper.adaptive = AdaptiveLimiter(initial=4, cooldown_seconds=0, latency_tolerance=1000)
+            results = asyncio.run(run(urls))
+
+        limits = scraper.adaptive.snapshot()
+        assert len(results) == 45
+        assert limits[healthy.base_url.split('://')[1]]['limit'] > 4
+        assert limits[failing.base_url.split('://')[1]]['limit'] == 1
+        assert all(state['in_flight'] == 0 for state in limits.values())
+
+
+if __name__ == "__main__":
+    # Run tests if script is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+import pytest
+import sys
+import pathlib
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+from src import WebScraper
+from src.archive import ArchiveReader, ArchiveRecord, ArchiveWriter, index_path, replay_range
+from tests.local_server import LocalServer
+
+
+def _record(i: int, status: int = 200) -> ArchiveRecord:
+    body = f'<html><head><title>Page {i}</title></head><body>{"x" * i}</body></html>'.encode()
+    return ArchiveRecord(f'https://example.com/{i}', status, body, {'Content-Type': 'text/html'}, 'utf-8')
+
+
+class TestArchive:
+    """Test suite for ArchiveWriter and ArchiveReader"""
+
+    def test_round_trip(self, tmp_path):
+        """Test that records read back exactly as written"""
+        path = str(tmp_path / 'capture.arc')
+        with ArchiveWriter(path) as writer:
+            for i in range(50):
+                writer.write(_record(i))
+
+        with ArchiveReader(path) as reader:
+            assert len(reader) == 50
+            assert reader.read(7) == _record(7)
+            assert [r.url for r in reader.iter_range(10, 13)] == [f'https://example.com/{i}' for i in (10, 11, 12)]
+            assert list(reader) == [_record(i) for i in range(50)]
+
+    def test_reopen_appends(self, tmp_path):
+        """Test that a second writer continues the same archive"""
+        path = str(tmp_path / 'capture.arc')
+        with ArchiveWriter(path) as writer:
+            writer.write(_record(0))
+        with ArchiveWriter(path) as writer:
+            assert writer.records == 1
+            writer.write(_record(1))
+
+        with ArchiveReader(path) as reader:
+            assert [r.url for r in reader] == ['https://example.com/0', 'https://example.com/1']
+
+    def test_recovers_from_partial_frame_and_lost_index(self, tmp_path):
+        """Test that an interrupted write and a missing index do not lose complete records"""
+        path = tmp_path / 'capture.arc'
+        with ArchiveWriter(str(path)) as writer:
+            for i in range(3):
+                writer.write(_record(i))
+
+        pathlib.Path(index_path(str(path))).unlink()
+        with open(path, 'ab') as f:
+            f.write(b'\x40\x00\x00\x00partial')
+
+        with ArchiveReader(str(path)) as reader:
+            assert len(reader) == 3
+        with ArchiveWriter(str(path)) as writer:
+            writer.write(_record(3))
+        with ArchiveReader(str(path)) as reader:
+            assert [r.url for r in reader][-2:] == ['https://example.com/2', 'https://example.com/3']
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test that a file without the archive header is refused"""
+        path = tmp_path / 'other.arc'
+        path.write_bytes(b'not an archive')
+        with pytest.raises(ValueError):
+            ArchiveReader(str(path))
+
+    def test_replay_range(self, tmp_path):
+        """Test that replay parses titles and skips unsuccessful responses"""
+        path = str(tmp_path / 'capture.arc')
+        with ArchiveWriter(path) as writer:
+            writer.write(_record(0))
+            writer.write(_record(1, status=500))
+            writer.write(_record(2))
+
+        assert replay_range(path, 0, 3, 'html.parser') == [
+            ('https://example.com/0', 'Page 0'), ('https://example.com/1', None), ('https://example.com/2', 'Page 2')]
+
+
+class TestScraperCaptureReplay:
+    """Test capturing a batch run and replaying it offline"""
+
+    def _scraper(self, scraper_factory, tmp_path, url, **extra) -> WebScraper:
+        return scraper_factory(url, scraping={"stream_title": True},
+                               archive={"enabled": True, "path": str(tmp_path / 'capture.arc'),
+                                        "replay_chunk_size": 4}, **extra)
+
+    def test_replay_matches_live_run(self, scraper_factory, tmp_path):
+        """Test that replayed titles equal the captured run without network access"""
+        with LocalServer() as server:
+            scraper = self._scraper(scraper_factory, tmp_path, server.base_url)
+            urls = [f"{server.base_url}/title/page{i}" for i in range(20)] + [f"{server.base_url}/error"]
+            live = dict(scraper.check_many(urls))
+            scraper.close()
+
+        replayed = dict(scraper.replay(workers=2))
+
+        assert live[f"{server.base_url}/error"] is None
+        assert scraper.archive.records == 20  # Failed responses are not captured
+        assert replayed == {url: title for url, title in live.items() if title is not None}
+
+    def test_replay_records(self, scraper_factory, tmp_path):
+        """Test that extraction rules run against archived pages"""
+        extraction = {
+            "item_selector": "div.quote",
+            "fields": {"text": {"selector": "span.text"},
+                       "author_url": {"selector": "a[href^='/author/']", "attr": "href", "absolute": True}},
+            "next_page": {"selector": "li.next a"}
+        }
+        with LocalServer() as server:
+            scraper = self._scraper(scraper_factory, tmp_path, f"{server.base_url}/quotes/1", extraction=extraction)
+            live = list(scraper.extract_records())
+
+        replayed = list(scraper.replay_records(workers=1))
+
+        assert len(replayed) == 6
+        assert sorted(r["text"] for r in replayed) == sorted(r["text"] for r in live)
+        assert all(r["author_url"].startswith(server.base_url) for r in replayed)
+
+
+if __name__ == "__main__":
+    # Run tests if script is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+import pytest
+import os
+import asyncio
+import time
+import sys
+import pathlib
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+from src import WebScraper
+from src.cache import ResultCache
+from src.circuit import CircuitBreaker
+from src.limits import ByteBudget
+from src.robots import RobotsCache
+from tests.local_server import LocalServer
+
+aiohttp = pytest.importorskip("aiohttp")
+
+
+async def collect(agen):
+    """Collect all items of an async generator"""
+    return [item async for item in agen]
+
+
+class TestAsyncWebScraper:
+    """Test suite for the asyncio scraping engine against a local server"""
+
+    def setup_method(self):
+        """Setup before each test"""
+        test_config_path = os.path.join(os.path.dirname(__file__), 'test_config.json')
+        self.server = LocalServer().__enter__()
+        self.scraper = WebScraper(f"{self.server.base_url}/title/Local", config_file=test_config_path)
+
+    def teardown_method(self):
+        """Stop the local server after each test"""
+        self.server.__exit__(None, None, None)
+
+    def test_check_website_async_success(self):
+        """Test async check returns page title"""
+        result = asyncio.run(self.scraper.check_website_async())
+        assert result == "Local"
+
+    def test_check_website_async_no_title(self):
+        """Test async check of a page without title"""
+        result = asyncio.run(self.scraper.check_website_async(f"{self.server.base_url}/notitle"))
+        assert result is None
+
+    def test_check_website_async_retries_http_errors(self):
+        """Test that HTTP errors are retried max_retries times"""
+        max_retries = self.scraper.config.fetch_config_value("scraping", "max_retries", 3)
+
+        result = asyncio.run(self.scraper.check_website_async(f"{self.server.base_url}/error"))
+
+        assert result is None
+        assert self.server.hits['/error'] == max_retries
+
+    def test_check_many_async_returns_all_results(self):
+        """Test async batch runner yields every URL"""
+        urls = [f"{self.server.base_url}/title/page{i}" for i in range(20)]
+
+        results = dict(asyncio.run(collect(self.scraper.check_many_async(urls, max_concurrency=5))))
+
+        assert results == {url: f"page{i}" for i, url in enumerate(urls)}
+
+    def test_check_many_async_runs_concurrently(self):
+        """Test that slow requests overlap instead of running one by one"""
+        urls = [f"{self.server.base_url}/slow/0.2?{i}" for i in range(10)]
+
+        start = time.perf_counter()
+        results = asyncio.run(collect(self.scraper.check_many_async(urls, max_concurrency=10)))
+        elapsed = time.perf_counter() - start
+
+        assert len(results) == 10
+        assert all(title == "Slow" for _, title in results)
+        assert elapsed < 1.5
+
+    def test_retry_delay_does_not_block_event_loop(self):
+        """Test that other coroutines progress while a request waits to retry"""
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        async def run():
+            return await asyncio.gather(
+                self.scraper.check_website_async(f"{self.server.base_url}/error"),
+                ticker(),
+            )
+
+        asyncio.run(run())
+        assert len(ticks) == 5
+
+
+
+class TestAsyncGates:
+    """Test that the asyncio engine shares the sync engine's gates and caches"""
+
+    def test_robots_disallowed_urls_are_not_fetched(self, scraper_factory):
+        """Test that robots.txt is checked before an async request"""
+        with LocalServer() as server:
+            scraper = scraper_factory(server.base_url, robots={"enabled": True, "ttl_seconds": 60})
+            scraper.robots = RobotsCache(ttl_seconds=60)  # Isolate from the process-wide cache
+            result = asyncio.run(scraper.check_website_async(f"{server.base_url}/private/page"))
+
+        assert result is None
+        assert '/private/page' not in server.hits
+
+    def test_open_circuit_skips_async_requests(self, scraper_factory):
+        """Test that the circuit breaker stops async requests to a failing host"""
+        with LocalServer() as server:
+            scraper = scraper_factory(server.base_url)
+            scraper.breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=60)
+            urls = [f"{server.base_url}/error?{i}" for i in range(5)]
+            results = asyncio.run(collect(scraper.check_many_async(urls, max_concurrency=1)))
+
+        assert all(title is None for _, title in results)
+        assert server.hits['/error'] == 2
+
+    def test_duplicate_urls_in_flight_share_one_fetch(self, scraper_factory):
+        """Test that concurrent async lookups of one URL are coalesced"""
+        with LocalServer() as server:
+            scraper = scraper_factory(server.base_url)
+            scraper.result_cache = ResultCache()
+            urls = [f"{server.base_url}/slow/0.2"] * 5
+            results = asyncio.run(collect(scraper.check_many_async(urls, max_concurrency=5)))
+
+        assert [title for _, title in results] == ["Slow"] * 5
+        assert server.hits['/slow/0.2'] == 1
+        assert scraper.result_cache.stats()['coalesced'] == 4
+
+    def test_oversized_responses_are_skipped(self, scraper_factory):
+        """Test that max_response_bytes applies to async fetches with and without Content-Length"""
+        with LocalServer() as server:
+            urls = [f"{server.base_url}/big/100", f"{server.base_url}/big/100/nolength",
+                    f"{server.base_url}/big/1/nolength"]
+            scraper = scraper_factory(urls[0], scraping={"max_response_bytes": 10 * 1024})
+            results = dict(asyncio.run(collect(scraper.check_many_async(urls))))
+
+        assert results == {urls[0]: None, urls[1]: None, urls[2]: "Big"}
+
+    def test_budget_bounds_bytes_in_flight(self, scraper_factory):
+        """Test that concurrent async fetches reserve from the memory budget"""
+        with LocalServer() as server:
+            urls = [f"{server.base_url}/big/100?{i}" for i in range(20)]
+            scraper = scraper_factory(urls[0], scraping={"memory_budget_mb": 0.25})
+            scraper.byte_budget = ByteBudget(256 * 1024)  # Isolate from the shared budget
+            results = asyncio.run(collect(scraper.check_many_async(urls, max_concurrency=8)))
+
+        assert [title for _, title in results] == ["Big"] * 20
+        assert 100 * 1024 < scraper.byte_budget.peak <= 256 * 1024
+        assert scraper.byte_budget.in_use == 0
+
+
+if __name__ == "__main__":
+    # Run tests if script is executed directly
+    pytest.main([__file__, "-v"])
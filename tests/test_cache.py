@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+
+import pytest
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+import sys
+import pathlib
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+from src import WebScraper
+from src.cache import ResultCache, ValidatorCache
+from tests.local_server import LocalServer
+
+
+class TestValidatorCache:
+    """Test suite for ValidatorCache class"""
+
+    def setup_method(self):
+        """Setup before each test"""
+        self.tmp_dir = pathlib.Path(tempfile.mkdtemp())
+        self.cache = ValidatorCache(str(self.tmp_dir / 'cache.sqlite'), max_entries=5)
+
+    def teardown_method(self):
+        """Close cache after each test"""
+        self.cache.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_store_and_get(self):
+        """Test storing validators and reading them back"""
+        self.cache.store('https://a.example', {'ETag': '"abc"', 'Last-Modified': 'Mon'}, 'Title A')
+
+        entry = self.cache.get('https://a.example')
+        assert entry.etag == '"abc"'
+        assert entry.last_modified == 'Mon'
+        assert entry.title == 'Title A'
+
+    def test_store_without_validators_is_skipped(self):
+        """Test that responses without validators are not cached"""
+        self.cache.store('https://a.example', {}, 'Title A')
+        assert self.cache.get('https://a.example') is None
+
+    def test_conditional_headers(self):
+        """Test building If-None-Match / If-Modified-Since headers"""
+        self.cache.store('https://a.example', {'ETag': '"abc"', 'Last-Modified': 'Mon'}, 'Title A')
+        headers = ValidatorCache.conditional_headers(self.cache.get('https://a.example'))
+
+        assert headers == {'If-None-Match': '"abc"', 'If-Modified-Since': 'Mon'}
+        assert ValidatorCache.conditional_headers(None) == {}
+
+    def test_expired_entries_are_ignored(self):
+        """Test that entries older than max_age_seconds are not returned"""
+        self.cache.max_age_seconds = 10
+        self.cache.store('https://a.example', {'ETag': '"abc"'}, 'Title A')
+
+        with patch('src.cache.time.time', return_value=time.time() + 60):
+            assert self.cache.get('https://a.example') is None
+
+    def test_evicts_least_recently_used(self):
+        """Test that entries over max_entries are evicted oldest first"""
+        for i in range(8):
+            with patch('src.cache.time.time', return_value=1000.0 + i):
+                self.cache.store(f'https://{i}.example', {'ETag': f'"{i}"'}, str(i))
+        self.cache.max_age_seconds = float('inf')
+        self.cache.evict()
+
+        assert len(self.cache) == 5
+        assert self.cache.get('https://0.example') is None
+        assert self.cache.get('https://7.example') is not None
+
+    def test_persists_across_instances(self):
+        """Test that validators survive reopening the cache file"""
+        self.cache.store('https://a.example', {'ETag': '"abc"'}, 'Title A')
+        reopened = ValidatorCache(self.cache.path)
+        try:
+            assert reopened.get('https://a.example').title == 'Title A'
+        finally:
+            reopened.close()
+
+
+class TestScraperValidatorCache:
+    """Test 304 short-circuiting against a local server"""
+
+    def test_not_modified_returns_cached_title(self, scraper_factory, tmp_path):
+        """Test that the second check sends If-None-Match and uses the cached title"""
+        with LocalServer() as server:
+            scraper = scraper_factory(f"{server.base_url}/etag/Cached",
+                                      http_cache={"enabled": True, "path": str(tmp_path / 'http_cache.sqlite')})
+            assert scraper.check_website() == "Cached"
+
+            with patch.object(scraper, '_extract_title') as mock_extract:
+                assert scraper.check_website() == "Cached"
+                mock_extract.assert_not_called()
+
+            assert server.hits['/etag/Cached'] == 2
+
+
+
+class TestResultCache:
+    """Test suite for in-memory ResultCache class"""
+
+    def setup_method(self):
+        """Setup before each test"""
+        self.cache = ResultCache(max_entries=3, max_bytes=10000, ttl_seconds=60)
+
+    def test_put_and_get(self):
+        """Test hit and miss counting"""
+        self.cache.put('a', 'Title A')
+
+        assert self.cache.get('a') == (True, 'Title A')
+        assert self.cache.get('b') == (False, None)
+        stats = self.cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['entries'] == 1
+
+    def test_lru_eviction_by_entry_count(self):
+        """Test that least recently used entries are evicted first"""
+        for key in ['a', 'b', 'c']:
+            self.cache.put(key, key)
+        self.cache.get('a')
+        self.cache.put('d', 'd')
+
+        assert self.cache.get('b') == (False, None)
+        assert self.cache.get('a') == (True, 'a')
+        assert self.cache.stats()['evictions'] == 1
+
+    def test_eviction_by_bytes(self):
+        """Test that entries are evicted when the byte budget is exceeded"""
+        cache = ResultCache(max_entries=100, max_bytes=300, ttl_seconds=60)
+        for i in range(10):
+            cache.put(f'key{i}', 'x' * 50)
+
+        stats = cache.stats()
+        assert stats['bytes'] <= 300
+        assert stats['evictions'] > 0
+
+    def test_entries_expire_after_ttl(self):
+        """Test per-entry TTL expiration"""
+        self.cache.put('short', 'value', ttl=10)
+        self.cache.put('long', 'value', ttl=1000)
+
+        with patch('src.cache.time.monotonic', return_value=time.monotonic() + 100):
+            assert self.cache.get('short') == (False, None)
+            assert self.cache.get('long') == (True, 'value')
+        assert self.cache.stats()['expirations'] == 1
+
+    def test_get_or_load_caches_result(self):
+        """Test that loader runs only on a miss"""
+        loader = Mock(return_value='Loaded')
+
+        assert self.cache.get_or_load('a', loader) == 'Loaded'
+        assert self.cache.get_or_load('a', loader) == 'Loaded'
+        loader.assert_called_once()
+
+    def test_get_or_load_does_not_cache_none(self):
+        """Test that failed lookups are not cached by default"""
+        loader = Mock(return_value=None)
+
+        self.cache.get_or_load('a', loader)
+        self.cache.get_or_load('a', loader)
+        assert loader.call_count == 2
+
+    def test_get_or_load_coalesces_concurrent_callers(self):
+        """Test that concurrent callers for the same key share one load"""
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow_loader():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'Shared'
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            first = executor.submit(self.cache.get_or_load, 'hot', slow_loader)
+            started.wait(5)
+            others = [executor.submit(self.cache.get_or_load, 'hot', slow_loader) for _ in range(4)]
+            while self.cache.stats()['coalesced'] < 4:
+                time.sleep(0.01)
+            release.set()
+            results = [first.result()] + [f.result() for f in others]
+
+        assert results == ['Shared'] * 5
+        assert len(calls) == 1
+
+    def test_get_or_load_propagates_errors_to_waiters(self):
+        """Test that loader errors are raised and not cached"""
+        with pytest.raises(RuntimeError):
+            self.cache.get_or_load('a', Mock(side_effect=RuntimeError("boom")))
+        assert self.cache.get_or_load('a', Mock(return_value='ok')) == 'ok'
+
+    def test_scraper_serves_repeated_lookups_from_cache(self):
+        """Test that WebScraper skips network I/O on a cache hit"""
+        test_config_path = pathlib.Path(__file__).parent / 'test_config.json'
+        scraper = WebScraper("https://example.com", config_file=str(test_config_path),
+                             result_cache=self.cache)
+
+        with patch('src.scraper.requests.get') as mock_get:
+            mock_response = Mock()
+            mock_response.raise_for_status.return_value = None
+            mock_response.text = '<html><head><title>Hot</title></head></html>'
+            mock_get.return_value = mock_response
+
+            assert scraper.check_website() == "Hot"
+            assert scraper.check_website() == "Hot"
+
+        mock_get.assert_called_once()
+
+
+if __name__ == "__main__":
+    # Run tests if script is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+
+import pytest
+import gc
+import time
+import weakref
+import sys
+import pathlib
+from unittest.mock import patch
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+from src.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, is_host_failure, shared_circuit_breaker
+from tests.local_server import LocalServer
+
+
+class TestCircuitBreaker:
+    """Test suite for CircuitBreaker class"""
+
+    def setup_method(self):
+        """Setup before each test"""
+        self.changes = []
+        self.breaker = CircuitBreaker(failure_threshold=3, cooldown_seconds=0.1,
+                                      on_state_change=lambda *change: self.changes.append(change))
+
+    def _fail(self, host, times):
+        for _ in range(times):
+            assert self.breaker.allow(host)
+            self.breaker.record(host, failed=True)
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that only consecutive failures open the circuit"""
+        self._fail('a.com', 2)
+        self.breaker.record('a.com', failed=False)
+        self._fail('a.com', 2)
+        assert self.breaker.state('a.com') == CLOSED
+
+        self._fail('a.com', 1)
+        assert self.breaker.state('a.com') == OPEN
+        assert not self.breaker.allow('a.com')
+        assert 0 < self.breaker.retry_in('a.com') <= 0.1
+        assert self.breaker.allow('b.com')  # Other hosts are unaffected
+        assert self.changes == [('a.com', CLOSED, OPEN)]
+
+    def test_half_open_trial_closes_on_success(self):
+        """Test recovery through a single trial request"""
+        self._fail('a.com', 3)
+        time.sleep(0.12)
+
+        assert self.breaker.allow('a.com')
+        assert self.breaker.state('a.com') == HALF_OPEN
+        assert not self.breaker.allow('a.com')  # Only one trial at a time
+
+        self.breaker.record('a.com', failed=False)
+        assert self.breaker.state('a.com') == CLOSED
+        assert self.changes[-2:] == [('a.com', OPEN, HALF_OPEN), ('a.com', HALF_OPEN, CLOSED)]
+
+    def test_half_open_trial_reopens_on_failure(self):
+        """Test that a failed trial restarts the cool-down"""
+        self._fail('a.com', 3)
+        time.sleep(0.12)
+        self._fail('a.com', 1)
+
+        assert self.breaker.state('a.com') == OPEN
+        assert not self.breaker.allow('a.com')
+
+    def test_host_failure_classification(self):
+        """Test which outcomes count against a host"""
+        assert is_host_failure('timeout')
+        assert is_host_failure('connection_error')
+        assert is_host_failure('http_error', 500)
+        assert not is_host_failure('http_error', 404)
+        assert not is_host_failure('http_error', 429)
+        assert not is_host_failure(None, 200)
+
+
+class TestStateChangeCallbacks:
+    """Test per-call state change callbacks"""
+
+    def test_only_the_causing_call_is_notified(self):
+        """Test that on_change hears about the changes its own call made"""
+        breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=60)
+        first, second = [], []
+        breaker.record('a.com', True, lambda *change: first.append(change))
+        breaker.record('a.com', True, lambda *change: second.append(change))
+        assert first == []
+        assert second == [('a.com', CLOSED, OPEN)]
+
+    def test_shared_breaker_does_not_keep_scrapers_alive(self, scraper_factory):
+        """Test that each scraper logs its own changes and can be collected"""
+        with LocalServer() as server:
+            scraping = {"max_retries": 1, "circuit_failure_threshold": 1, "circuit_cooldown_seconds": 60.5}
+            first = scraper_factory(f"{server.base_url}/title/Ok", scraping=scraping)
+            second = scraper_factory(f"{server.base_url}/error", scraping=scraping)
+            assert first.breaker is second.breaker is shared_circuit_breaker(1, 60.5)
+
+            with patch.object(first.logger, 'warning') as first_warning:
+                assert first.check_website() == "Ok"
+            with patch.object(second.logger, 'warning') as second_warning:
+                assert second.check_website() is None
+
+        assert not any('opened' in call.args[0] for call in first_warning.call_args_list)
+        assert any('opened' in call.args[0] for call in second_warning.call_args_list)
+        ref = weakref.ref(first)
+        del first
+        gc.collect()
+        assert ref() is None
+
+
+class TestScraperCircuit:
+    """Test WebScraper with a circuit breaker against a local server"""
+
+    def _scraper(self, scraper_factory, url, **scraping):
+        scraper = scraper_factory(url, scraping={"max_retries": 3, "circuit_failure_threshold": 3,
+                                                 "circuit_cooldown_seconds": 60, **scraping})
+        scraper.breaker = CircuitBreaker(3, 60)
+        return scraper
+
+    def test_dead_host_fails_fast(self, scraper_factory):
+        """Test that URLs on a failing host stop being fetched once the circuit opens"""
+        with LocalServer() as server:
+            scraper = self._scraper(scraper_factory, f"{server.base_url}/error")
+            urls = [f"{server.base_url}/error?{i}" for i in range(20)]
+            with patch.object(scraper.logger, 'warning') as warning:
+                results = list(scraper.check_many(urls, max_workers=1))
+
+        assert all(title is None for _, title in results)
+        assert server.hits['/error'] == 3
+        assert any('opened' in call.args[0] for call in warning.call_args_list)
+
+    def test_open_circuit_defers(self, scraper_factory):
+        """Test that deferred URLs wait for the cool-down and then retry"""
+        with LocalServer() as server:
+            scraper = self._scraper(scraper_factory, f"{server.base_url}/title/Back", circuit_open_action='defer')
+            host = server.base_url.split('://')[1]
+            for _ in range(3):
+                scraper.breaker.record(host, failed=True)
+
+            with patch('src.scraper.time.sleep') as mock_sleep, \
+                 patch.object(scraper.breaker, 'cooldown_seconds', 0):
+                assert scraper.check_website() == "Back"
+
+        mock_sleep.assert_not_called()
+        assert scraper.breaker.state(host) == CLOSED
+
+    def test_open_circuit_defer_sleeps_until_half_open(self, scraper_factory):
+        """Test that deferral waits for the remaining cool-down"""
+        with LocalServer() as server:
+            scraper = self._scraper(scraper_factory, f"{server.base_url}/title/Back", circuit_open_action='defer')
+            host = server.base_url.split('://')[1]
+            for _ in range(3):
+                scraper.breaker.record(host, failed=True)
+
+            with patch('src.scraper.time.sleep') as mock_sleep:
+                assert scraper.check_website() is None
+
+        assert mock_sleep.call_count == 2  # max_retries - 1 deferrals, then give up
+        assert 59 < mock_sleep.call_args_list[0].args[0] <= 60
+        assert server.hits.get('/title/Back') is None
+
+
+if __name__ == "__main__":
+    # Run tests if script is executed directly
+    pytest.main([__file__, "-v"])
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import pytest
+import json
 import os
 import tempfile
 from unittest.mock import patch, mock_open
@@ -9,7 +10,8 @@ import pathlib
 
 # Add parent directory to path to import src modules
 sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
-from src import Config
+from src import Config, WebScraper
+from src.config import shared_config
 
 
 class TestConfig:
@@ -69,15 +71,19 @@ class TestConfig:
         nonexistent = config.get_section('nonexistent_section')
         assert nonexistent == {}
 
-    def test_update_method(self):
+    def test_update_method(self, tmp_path, monkeypatch):
         """Test config update functionality"""
-        original_value = self.config.fetch_config_value('test_section', 'test_key', 'original')
+        # update() saves the file, so work on a copy instead of the repository's config.json
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / 'config.json').write_text(json.dumps(self.config.settings))
+        config = Config()
+        original_value = config.fetch_config_value('test_section', 'test_key', 'original')
 
         # Update config
-        self.config.update('test_section', 'test_key', 'updated_value')
+        config.update('test_section', 'test_key', 'updated_value')
 
         # Verify update
-        updated_value = self.config.fetch_config_value('test_section', 'test_key', 'original')
+        updated_value = config.fetch_config_value('test_section', 'test_key', 'original')
         assert updated_value == 'updated_value'
 
     def test_load_config_with_invalid_json(self):
@@ -115,6 +121,125 @@ class TestConfig:
         assert result == 'default'
 
 
+class TestConfigReload:
+    """Test hot reload, transactions and the shared registry"""
+
+    def _write(self, path, timeout):
+        path.write_text(json.dumps({"scraping": {"timeout": timeout}}))
+        # Make sure the change is visible even on coarse mtime filesystems
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + timeout * 1_000_000_000))
+
+    def test_reloads_when_file_changes(self, tmp_path):
+        """Test that a changed file is picked up after reload_interval"""
+        path = tmp_path / 'config.json'
+        self._write(path, 5)
+        config = Config(str(path), reload_interval=0)
+
+        self._write(path, 7)
+        assert config.fetch_config_value('scraping', 'timeout') == 7
+
+    def test_reload_checks_are_throttled(self, tmp_path):
+        """Test that the file is not checked again within reload_interval"""
+        path = tmp_path / 'config.json'
+        self._write(path, 5)
+        config = Config(str(path), reload_interval=3600)
+
+        self._write(path, 7)
+        assert config.fetch_config_value('scraping', 'timeout') == 5
+        assert config.reload_if_changed() is True
+        assert config.fetch_config_value('scraping', 'timeout') == 7
+
+    def test_invalid_file_keeps_current_settings(self, tmp_path):
+        """Test that a half-written file does not wipe the loaded settings"""
+        path = tmp_path / 'config.json'
+        self._write(path, 5)
+        config = Config(str(path), reload_interval=0)
+
+        path.write_text('{ "scraping": ')
+        assert config.reload_if_changed() is False
+        assert config.fetch_config_value('scraping', 'timeout') == 5
+
+    def test_transaction_writes_once(self, tmp_path):
+        """Test that bulk updates persist in a single atomic write"""
+        path = tmp_path / 'sub' / 'config.json'
+        config = Config(str(path))
+
+        with patch.object(Config, '_save_config', autospec=True, side_effect=Config._save_config) as save:
+            config.update_many({"scraping": {"timeout": 3, "max_retries": 5}, "crawl": {"max_pages": 10}})
+        assert save.call_count == 1
+
+        assert json.loads(path.read_text())["scraping"] == {"timeout": 3, "max_retries": 5}
+        assert os.listdir(path.parent) == ['config.json']  # No temp files left behind
+        assert config.reload_if_changed() is False  # Own write is not a reload
+
+    def test_save_with_bare_file_name(self, tmp_path, monkeypatch):
+        """Test that a config file in the working directory can be saved"""
+        monkeypatch.chdir(tmp_path)
+        config = Config('config.json')
+        config.update_many({"scraping": {"timeout": 3}})
+
+        assert json.loads((tmp_path / 'config.json').read_text())["scraping"] == {"timeout": 3}
+        assert os.listdir(tmp_path) == ['config.json']
+
+    def test_transaction_rolls_back_on_error(self, tmp_path):
+        """Test that a failed transaction restores settings and writes nothing"""
+        path = tmp_path / 'config.json'
+        self._write(path, 5)
+        config = Config(str(path))
+
+        with pytest.raises(RuntimeError):
+            with config.transaction():
+                config.update('scraping', 'timeout', 99)
+                raise RuntimeError("abort")
+
+        assert config.fetch_config_value('scraping', 'timeout') == 5
+        assert json.loads(path.read_text())["scraping"]["timeout"] == 5
+
+    def test_overrides_survive_reload_and_are_not_saved(self, tmp_path):
+        """Test in-memory overrides such as command-line flags"""
+        path = tmp_path / 'config.json'
+        self._write(path, 5)
+        config = Config(str(path), reload_interval=0)
+        config.override('scraping', 'timeout', 1)
+        config.override('scraping', 'max_retries', 9)
+
+        self._write(path, 7)
+        assert config.fetch_config_value('scraping', 'timeout') == 1
+        assert config.get_section('scraping') == {'timeout': 1, 'max_retries': 9}
+
+        config.update('crawl', 'max_pages', 10)
+        assert json.loads(path.read_text())['scraping'] == {'timeout': 7}
+
+    def test_shared_config_is_parsed_once(self, tmp_path):
+        """Test that scrapers share one Config and see file changes on creation"""
+        path = tmp_path / 'config.json'
+        self._write(path, 5)
+
+        with patch('src.config.json.load', side_effect=json.load) as load:
+            first = WebScraper("https://example.com", config_file=str(path))
+            second = WebScraper("https://example.org", config_file=str(path))
+        assert first.config is second.config
+        assert load.call_count == 1
+
+        self._write(path, 8)
+        assert shared_config(str(path)).fetch_config_value('scraping', 'timeout') == 8
+
+    def test_running_scraper_picks_up_new_limits(self, tmp_path):
+        """Test that politeness and circuit limits follow config changes"""
+        path = tmp_path / 'config.json'
+        path.write_text(json.dumps({"politeness": {"max_concurrent_per_host": 2}}))
+        scraper = WebScraper("http://127.0.0.1:9", config_file=str(path))
+        assert scraper.scheduler.max_concurrent_per_host == 2
+        assert scraper.breaker is None
+
+        scraper.config.update_many({"politeness": {"max_concurrent_per_host": 5},
+                                    "scraping": {"circuit_failure_threshold": 3, "max_retries": 1, "timeout": 1}})
+        scraper.check_website()
+
+        assert scraper.scheduler.max_concurrent_per_host == 5
+        assert scraper.breaker is not None and scraper.breaker.failure_threshold == 3
+
+
 if __name__ == "__main__":
     # Run tests if script is executed directly
     pytest.main([__file__, "-v"])
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+import pytest
+import sys
+import pathlib
+from unittest.mock import patch
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+from src.extraction import ExtractionRules, FieldRule
+from tests.local_server import LocalServer
+
+QUOTES_RULES = {
+    "item_selector": "div.quote",
+    "fields": {
+        "text": {"selector": "span.text"},
+        "author": "small.author",
+        "author_url": {"selector": "a[href^='/author/']", "attr": "href", "absolute": True},
+        "tags": {"selector": "a.tag", "many": True},
+        "missing": {"selector": "span.nope", "default": "n/a"}
+    },
+    "next_page": {"selector": "li.next a"}
+}
+
+PAGE = """
+<html><body>
+<div class="quote"><span class="text"> First </span><small class="author">A</small>
+<a href="/author/a">about</a><a class="tag">x</a><a class="tag">y</a></div>
+<div class="quote"><span class="text">Second</span><small class="author">B</small>
+<a href="/author/b">about</a></div>
+<ul><li class="next"><a href="/page/2/">Next</a></li></ul>
+</body></html>
+"""
+
+
+class TestExtractionRules:
+    """Test suite for ExtractionRules class"""
+
+    def setup_method(self):
+        """Setup before each test"""
+        self.rules = ExtractionRules.from_config(QUOTES_RULES)
+
+    def test_extracts_record_per_item(self):
+        """Test fields, lists, attributes and defaults"""
+        records, _ = self.rules.extract(PAGE, 'https://quotes.example/')
+
+        assert records == [
+            {"text": "First", "author": "A", "author_url": "https://quotes.example/author/a",
+             "tags": ["x", "y"], "missing": "n/a"},
+            {"text": "Second", "author": "B", "author_url": "https://quotes.example/author/b",
+             "tags": [], "missing": "n/a"},
+        ]
+
+    def test_next_page_is_absolute(self):
+        """Test next page link extraction"""
+        _, next_url = self.rules.extract(PAGE, 'https://quotes.example/page/1/')
+        assert next_url == 'https://quotes.example/page/2/'
+
+    def test_single_record_per_page_without_item_selector(self):
+        """Test that rules without item_selector produce one record per page"""
+        rules = ExtractionRules.from_config({"fields": {"heading": "span.text"}})
+        records, next_url = rules.extract(PAGE, 'https://quotes.example/')
+
+        assert records == [{"heading": "First"}]
+        assert next_url is None
+
+    def test_selectors_are_compiled_once(self):
+        """Test that applying rules does not recompile selectors"""
+        with patch('soupsieve.compile') as mock_compile:
+            for _ in range(3):
+                self.rules.extract(PAGE, 'https://quotes.example/')
+        mock_compile.assert_not_called()
+
+    def test_invalid_config_is_rejected(self):
+        """Test that broken configs fail at compile time"""
+        with pytest.raises(ValueError):
+            ExtractionRules.from_config({})
+        with pytest.raises(ValueError):
+            FieldRule.compile('bad', {"selector": "div[["})
+        with pytest.raises(ValueError):
+            FieldRule.compile('empty', {})
+        with pytest.raises(ValueError, match='item_selector'):
+            ExtractionRules.from_config({"item_selector": "div[[", "fields": {"text": "span"}})
+
+
+class TestScraperExtraction:
+    """Test WebScraper.extract_records against a local server"""
+
+    def test_follows_pagination_and_streams_records(self, scraper_factory):
+        """Test that all pages of a paginated site are extracted"""
+        with LocalServer() as server:
+            scraper = scraper_factory(f"{server.base_url}/quotes/1", extraction=dict(QUOTES_RULES, max_pages=10))
+            records = list(scraper.extract_records())
+
+        assert len(records) == 6
+        assert {r["text"] for r in records} == {f"Quote {n}.{i}" for n in range(1, 4) for i in range(2)}
+        assert records[0]["author_url"].startswith(server.base_url)
+
+    def test_max_pages_limits_chain(self, scraper_factory):
+        """Test that pagination stops after max_pages"""
+        with LocalServer() as server:
+            scraper = scraper_factory(f"{server.base_url}/quotes/1", extraction=QUOTES_RULES)
+            records = list(scraper.extract_records(max_pages=2))
+
+        assert len(records) == 4
+
+
+if __name__ == "__main__":
+    # Run tests if script is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+
+import pytest
+import sys
+import pathlib
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+from src import WebScraper
+from src.fingerprint import FingerprintIndex, page_fingerprint, simhash
+from tests.local_server import LocalServer
+
+ARTICLE = ' '.join(f'word{i % 53} text{i % 17} more{i % 7}' for i in range(300))
+
+
+def _page(token: str, article: str = ARTICLE, title: str = 'T') -> bytes:
+    return (f'<html><head><title>{title}</title><script>var s = "{token}";</script></head>'
+            f'<body><p>{article}</p><span>Generated {token}</span></body></html>').encode()
+
+
+class TestFingerprint:
+    """Test suite for page fingerprints"""
+
+    def test_simhash_is_deterministic_majority_vote(self):
+        """Test that each bit follows the majority of feature hashes"""
+        features = [b'a', b'b', b'c']
+        assert simhash(features) == simhash(list(features))
+        assert simhash([b'a']) == simhash([b'a', b'a', b'a'])
+        assert simhash([]) == 0
+
+    def test_boilerplate_changes_stay_close(self):
+        """Test that pages differing in a token are close, different pages are far apart"""
+        a = page_fingerprint(_page('2025-01-01T10:00:00 abc'))
+        b = page_fingerprint(_page('2025-03-04T11:12:13 xyz'))
+        other = page_fingerprint(_page('abc', ' '.join(f'other{i}' for i in range(900))))
+
+        assert a.exact != b.exact
+        assert bin(a.simhash ^ b.simhash).count('1') <= 6
+        assert bin(a.simhash ^ other.simhash).count('1') > 12
+
+    def test_markup_is_ignored(self):
+        """Test that the near-duplicate signature only covers visible text"""
+        plain = page_fingerprint(b'<p>Hello big world</p>')
+        styled = page_fingerprint(b'<div class="x"><b>hello</b> BIG <i>world</i></div><style>p{}</style>')
+        assert plain.simhash == styled.simhash
+        assert plain.words == 3
+
+
+class TestFingerprintIndex:
+    """Test suite for FingerprintIndex class"""
+
+    def test_exact_and_near_hits(self):
+        """Test exact and near-duplicate lookups and hit counters"""
+        index = FingerprintIndex(max_entries=10)
+        index.add('title', page_fingerprint(_page('one')), 'Title')
+
+        assert index.lookup('title', page_fingerprint(_page('one'))) == ('exact', 'Title')
+        assert index.lookup('title', page_fingerprint(_page('two'))) == ('near', 'Title')
+        assert index.lookup('title', page_fingerprint(_page('one', 'completely different words ' * 20))) is None
+        assert index.lookup('records', page_fingerprint(_page('one'))) is None
+
+        stats = index.stats()
+        assert (stats['exact_hits'], stats['near_hits'], stats['misses']) == (1, 1, 2)
+        assert stats['hit_rate'] == 0.5
+
+    def test_near_duplicates_need_the_same_title(self):
+        """Test that pages sharing a body but not a title are not near duplicates"""
+        index = FingerprintIndex(max_entries=10)
+        a = page_fingerprint(_page('one', title='Product A'))
+        b = page_fingerprint(_page('one', title='Product B'))
+        index.add('title', a, 'Product A')
+
+        assert bin(a.simhash ^ b.simhash).count('1') <= index.max_distance
+        assert index.lookup('title', b) is None
+        assert page_fingerprint(b'<title>Product B</title><p>x</p>').head == page_fingerprint(
+            b'<html><head><title>product  b</title></head><body>y</body></html>').head
+
+    def test_near_matching_can_be_disabled(self):
+        """Test that near=False only reuses exact duplicates"""
+        index = FingerprintIndex(max_entries=10)
+        index.add('records', page_fingerprint(_page('one')), 'Records')
+
+        assert index.lookup('records', page_fingerprint(_page('two')), near=False) is None
+        assert index.lookup('records', page_fingerprint(_page('one')), near=False) == ('exact', 'Records')
+
+    def test_short_pages_match_exactly_only(self):
+        """Test that pages below min_words are not near-matched"""
+        index = FingerprintIndex(min_words=50)
+        index.add('title', page_fingerprint(b'<title>page1</title>'), 'page1')
+        assert index.lookup('title', page_fingerprint(b'<title>page2</title>')) is None
+        assert index.lookup('title', page_fingerprint(b'<title>page1</title>')) == ('exact', 'page1')
+
+    def test_least_recently_used_is_evicted(self):
+        """Test that the index stays bounded"""
+        index = FingerprintIndex(max_entries=2)
+        pages = [page_fingerprint(f'<p>{i}</p>'.encode()) for i in range(3)]
+        index.add('title', pages[0], 0)
+        index.add('title', pages[1], 1)
+        index.lookup('title', pages[0])  # Refresh 0, so 1 is evicted next
+        index.add('title', pages[2], 2)
+
+        assert len(index) == 2
+        assert index.lookup('title', pages[1]) is None
+        assert index.lookup('title', pages[0]) == ('exact', 0)
+
+
+class TestScraperFingerprints:
+    """Test WebScraper duplicate detection against a local server"""
+
+    def _scraper(self, scraper_factory, url, **extra) -> WebScraper:
+        scraper = scraper_factory(url, **extra)
+        scraper.fingerprints = FingerprintIndex(max_entries=100)
+        return scraper
+
+    def test_near_duplicates_reuse_title(self, scraper_factory):
+        """Test that mirrored pages are parsed once and unique pages every time"""
+        with LocalServer() as server:
+            scraper = self._scraper(scraper_factory, server.base_url)
+            urls = [f"{server.base_url}/mirror/{i}" for i in range(10)]
+            urls += [f"{server.base_url}/title/page{i}" for i in range(5)]
+            with pytest.MonkeyPatch.context() as mp:
+                parsed = []
+                parse_title = scraper._parse_title
+                mp.setattr(scraper, '_parse_title', lambda html: parsed.append(1) or parse_title(html))
+                results = dict(scraper.check_many(urls, max_workers=1))
+
+        assert all(results[url] == "Mirror" for url in urls[:10])
+        assert all(results[url] == f"page{i}" for i, url in enumerate(urls[10:]))
+        assert len(parsed) == 6
+        assert scraper.fingerprints.stats()['near_hits'] == 9
+
+    def test_duplicate_pages_emit_no_records(self, scraper_factory):
+        """Test that a duplicate start page does not repeat its records"""
+        extraction = {"item_selector": "div.quote", "fields": {"text": "span.text"},
+                      "next_page": {"selector": "li.next a"}}
+        with LocalServer() as server:
+            scraper = self._scraper(scraper_factory, server.base_url, extraction=extraction)
+            records = list(scraper.extract_records([f"{server.base_url}/quotes/1",
+                                                    f"{server.base_url}/quotes/1?copy"], max_workers=1))
+
+        assert len(records) == 6
+        assert scraper.fingerprints.stats()['exact_hits'] == 1
+
+    def test_duplicate_listing_page_still_paginates(self, scraper_factory):
+        """Test that an unchanged first page does not stop the crawl of later pages"""
+        extraction = {"item_selector": "div.quote", "fields": {"text": "span.text"},
+                      "next_page": {"selector": "li.next a"}}
+        with LocalServer() as server:
+            scraper = self._scraper(scraper_factory, server.base_url, extraction=extraction)
+            first = list(scraper.extract_records([f"{server.base_url}/quotes/1"], max_pages=1))
+            rest = list(scraper.extract_records([f"{server.base_url}/quotes/1"], max_workers=1))
+
+        assert len(first) == 2
+        assert [r['text'] for r in rest] == ["Quote 2.0", "Quote 2.1", "Quote 3.0", "Quote 3.1"]
+
+
+if __name__ == "__main__":
+    # Run tests if script is executed directly
+    pytest.main([__file__, "-v"])
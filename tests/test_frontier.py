@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+import pytest
+import os
+import sys
+import pathlib
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+from src import WebScraper
+from src.frontier import BloomFilter, CrawlFrontier, HashedSeenSet, normalize_url
+from src.parsers import extract_links
+from tests.local_server import LocalServer
+
+
+class TestNormalizeUrl:
+    """Test suite for normalize_url"""
+
+    def test_lowercases_and_drops_fragment_and_default_port(self):
+        """Test canonical form of an absolute URL"""
+        assert normalize_url('HTTPS://Example.COM:443/Path?q=1#frag') == 'https://example.com/Path?q=1'
+
+    def test_keeps_non_default_port_and_adds_root_path(self):
+        """Test non-default ports and empty paths"""
+        assert normalize_url('http://example.com:8080') == 'http://example.com:8080/'
+
+    def test_resolves_relative_urls(self):
+        """Test resolving against a base URL"""
+        assert normalize_url('../b?x=1', base='https://example.com/a/c/') == 'https://example.com/a/b?x=1'
+
+    def test_rejects_non_http_urls(self):
+        """Test that mailto, javascript and broken URLs are dropped"""
+        assert normalize_url('mailto:someone@example.com') is None
+        assert normalize_url('javascript:void(0)') is None
+        assert normalize_url('http://[broken') is None
+
+
+class TestSeenSets:
+    """Test suite for BloomFilter and HashedSeenSet"""
+
+    @pytest.mark.parametrize("seen", [BloomFilter(1000, 0.01), HashedSeenSet()])
+    def test_add_reports_new_items(self, seen):
+        """Test that add returns True only for new items"""
+        assert seen.add('https://a.example/') is True
+        assert seen.add('https://a.example/') is False
+        assert 'https://a.example/' in seen
+        assert 'https://b.example/' not in seen
+        assert len(seen) == 1
+
+    def test_bloom_false_positive_rate(self):
+        """Test that false positives stay near the configured rate"""
+        bloom = BloomFilter(10000, 0.01)
+        for i in range(10000):
+            bloom.add(f'https://example.com/{i}')
+
+        false_positives = sum(1 for i in range(10000) if f'https://other.com/{i}' in bloom)
+        assert false_positives < 300
+
+    def test_bloom_is_compact(self):
+        """Test that the bit array is far smaller than the URLs it tracks"""
+        bloom = BloomFilter(1000000, 0.001)
+        assert bloom.size_bytes < 2 * 1024 * 1024
+
+
+class TestCrawlFrontier:
+    """Test suite for CrawlFrontier class"""
+
+    def test_breadth_first_order(self):
+        """Test that shallower URLs are popped first"""
+        frontier = CrawlFrontier(max_depth=5)
+        frontier.push('https://a.example/deep', depth=2)
+        frontier.push('https://a.example/', depth=0)
+        frontier.push('https://a.example/mid', depth=1)
+
+        assert [frontier.pop().url for _ in range(3)] == [
+            'https://a.example/', 'https://a.example/mid', 'https://a.example/deep']
+        assert frontier.pop() is None
+
+    def test_explicit_priority(self):
+        """Test that explicit priority overrides depth"""
+        frontier = CrawlFrontier(max_depth=5)
+        frontier.push('https://a.example/low', depth=0, priority=10)
+        frontier.push('https://a.example/high', depth=3, priority=-1)
+        assert frontier.pop().url == 'https://a.example/high'
+
+    def test_dedup_after_normalization(self):
+        """Test that equivalent URLs are scheduled once"""
+        frontier = CrawlFrontier()
+        assert frontier.push('https://A.example/page#one') is True
+        assert frontier.push('https://a.example:443/page#two') is False
+        assert len(frontier) == 1
+
+    def test_depth_and_domain_limits(self):
+        """Test max_depth, allowed_domains and max_pages_per_domain"""
+        frontier = CrawlFrontier(max_depth=1, allowed_domains=['example.com'], max_pages_per_domain=2)
+
+        assert frontier.push('https://example.com/too-deep', depth=2) is False
+        assert frontier.push('https://other.com/', depth=0) is False
+        assert frontier.push('https://sub.example.com/', depth=0) is True
+        assert frontier.push('https://example.com/1', depth=1) is True
+        assert frontier.push('https://example.com/2', depth=1) is True
+        assert frontier.push('https://example.com/3', depth=1) is False
+
+
+class TestCrawl:
+    """Test WebScraper.crawl against a local server"""
+
+    def test_extract_links_uses_base_href(self):
+        """Test link extraction with a <base> element"""
+        html = '<head><base href="/docs/"></head><a href="intro">x</a><a href="https://x.example/">y</a>'
+        assert extract_links(html, 'https://example.com/index') == [
+            'https://example.com/docs/intro', 'https://x.example/']
+
+    def test_crawl_follows_links_within_depth(self):
+        """Test that crawl visits the link tree breadth first up to max_depth"""
+        test_config_path = os.path.join(os.path.dirname(__file__), 'test_config.json')
+
+        with LocalServer() as server:
+            scraper = WebScraper(f"{server.base_url}/crawl/1", config_file=test_config_path)
+            results = dict(scraper.crawl(max_depth=2, max_pages=100, max_workers=4))
+
+        assert sorted(results.values()) == sorted(f"Page {n}" for n in range(1, 8))
+        assert not any('other.example' in url for url in results)
+
+    def test_crawl_respects_max_pages(self):
+        """Test that crawl stops after max_pages fetches"""
+        test_config_path = os.path.join(os.path.dirname(__file__), 'test_config.json')
+
+        with LocalServer() as server:
+            scraper = WebScraper(f"{server.base_url}/crawl/1", config_file=test_config_path)
+            results = list(scraper.crawl(max_depth=10, max_pages=5, max_workers=2))
+
+        assert len(results) == 5
+
+
+if __name__ == "__main__":
+    # Run tests if script is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+import pytest
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+import sys
+import pathlib
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+from src.jobstore import DONE, FAILED, IN_FLIGHT, PENDING, JobStore
+from tests.local_server import LocalServer
+
+
+class TestJobStore:
+    """Test suite for JobStore class"""
+
+    def test_add_urls_ignores_duplicates(self, tmp_path):
+        """Test that URLs are added once"""
+        with JobStore(str(tmp_path / 'jobs.sqlite')) as store:
+            assert store.add_urls(['a', 'b', 'c']) == 3
+            assert store.add_urls(['b', 'c', 'd']) == 1
+            assert store.counts()[PENDING] == 4
+
+    def test_claim_marks_in_flight_and_counts_attempts(self, tmp_path):
+        """Test claiming pending jobs"""
+        with JobStore(str(tmp_path / 'jobs.sqlite')) as store:
+            store.add_urls(['a', 'b', 'c'])
+
+            claimed = store.claim(2)
+            assert len(claimed) == 2
+            assert store.claim(5) == [u for u in ['a', 'b', 'c'] if u not in claimed]
+            assert store.claim(5) == []
+            assert store.get('a')['status'] == IN_FLIGHT
+            assert store.get('a')['attempts'] == 1
+
+    def test_mark_done_and_failed(self, tmp_path):
+        """Test recording results and errors"""
+        with JobStore(str(tmp_path / 'jobs.sqlite')) as store:
+            store.add_urls(['a', 'b'])
+            store.claim(2)
+            store.mark_done('a', {'title': 'A'})
+            store.mark_failed('b', 'timeout')
+
+            assert store.get('a') == {'status': DONE, 'attempts': 1, 'result': {'title': 'A'}, 'error': None}
+            assert store.get('b')['status'] == FAILED
+            assert store.get('b')['error'] == 'timeout'
+
+    def test_resume_requeues_in_flight_and_retryable_failures(self, tmp_path):
+        """Test that resume picks up exactly the unfinished jobs"""
+        path = str(tmp_path / 'jobs.sqlite')
+        store = JobStore(path)
+        store.add_urls(['done', 'crashed', 'failed', 'exhausted', 'untouched'])
+        store.claim(4)
+        store.mark_done('done', 'ok')
+        store.mark_failed('failed', 'err')
+        store.mark_failed('exhausted', 'err')
+        store.close()
+
+        # Simulate a job that already used up its attempts
+        store = JobStore(path)
+        store._conn.execute("UPDATE jobs SET attempts = 3 WHERE url = 'exhausted'")
+        store._conn.commit()
+
+        assert store.resume(max_attempts=3) == 2
+        assert sorted(store.claim(10)) == ['crashed', 'failed', 'untouched']
+        assert store.get('done')['status'] == DONE
+        assert store.get('exhausted')['status'] == FAILED
+        store.close()
+
+    def test_failed_batch_is_raised_from_flush(self, tmp_path):
+        """Test that a batch the writer cannot commit fails flush() instead of hanging it"""
+        with JobStore(str(tmp_path / 'jobs.sqlite'), flush_interval=0.01) as store:
+            store.add_urls(['a'])
+            store._conn.execute('ALTER TABLE jobs RENAME TO gone')
+            store._conn.commit()
+            store.mark_done('a', 'A')
+
+            with pytest.raises(sqlite3.OperationalError):
+                store.flush()
+            store.flush()  # The error is reported once and the writer keeps running
+
+            store._conn.execute('ALTER TABLE gone RENAME TO jobs')
+            store._conn.commit()
+            store.mark_done('a', 'A')
+            assert store.get('a')['status'] == DONE
+
+    def test_batched_updates_from_concurrent_workers(self, tmp_path):
+        """Test many concurrent status updates are all committed"""
+        urls = [f'https://example.com/{i}' for i in range(20000)]
+        with JobStore(str(tmp_path / 'jobs.sqlite'), batch_size=2000) as store:
+            store.add_urls(urls)
+            claimed = store.claim(len(urls))
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(lambda url: store.mark_done(url, 'ok'), claimed))
+            counts = store.counts()
+            elapsed = time.perf_counter() - start
+
+        assert counts[DONE] == 20000
+        assert elapsed < 10
+
+
+class TestScraperRunJob:
+    """Test WebScraper.run_job against a local server"""
+
+    def test_run_job_and_resume(self, scraper_factory, tmp_path):
+        """Test that an interrupted job resumes without redoing finished URLs"""
+        db_path = str(tmp_path / 'jobs.sqlite')
+
+        with LocalServer() as server:
+            urls = [f"{server.base_url}/title/page{i}" for i in range(20)] + [f"{server.base_url}/error"]
+            scraper = scraper_factory(urls[0], jobs={"max_attempts": 2})
+
+            # First run is interrupted after a few results
+            store = JobStore(db_path)
+            run = scraper.run_job(store, urls, max_workers=2)
+            first = [next(run) for _ in range(5)]
+            run.close()
+            store.close()
+
+            # Second run picks up the rest
+            store = JobStore(db_path)
+            second = list(scraper.run_job(store, max_workers=4))
+            counts = store.counts()
+            store.close()
+
+        finished_first = {url for url, title in first if title is not None}
+        assert not finished_first & {url for url, _ in second}
+        assert counts[DONE] == 20
+        assert counts[FAILED] == 1
+        # URLs finished by the first run were never fetched again
+        assert all(server.hits[url[len(server.base_url):]] == 1 for url in finished_first)
+
+    def test_run_job_uses_configured_store(self, scraper_factory, tmp_path):
+        """Test that run_job without a store opens the one at jobs.path"""
+        db_path = tmp_path / 'state' / 'jobs.sqlite'
+        with LocalServer() as server:
+            scraper = scraper_factory(server.base_url, jobs={"path": str(db_path)})
+            results = dict(scraper.run_job(urls=[f"{server.base_url}/title/a"]))
+
+        assert results == {f"{server.base_url}/title/a": "a"}
+        with JobStore(str(db_path)) as store:
+            assert store.counts()[DONE] == 1
+
+
+if __name__ == "__main__":
+    # Run tests if script is executed directly
+    pytest.main([__file__, "-v"])
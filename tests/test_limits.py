@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+import pytest
+import asyncio
+import threading
+import tracemalloc
+from unittest.mock import Mock
+import sys
+import pathlib
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+from src.limits import ByteBudget, ResponseTooLarge, read_limited
+from tests.local_server import LocalServer
+
+
+def fake_response(chunks, content_length=None):
+    """Streamed response stand-in yielding the given chunks"""
+    consumed = []
+
+    def iter_content(chunk_size):
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+
+    response = Mock()
+    response.headers = {} if content_length is None else {'Content-Length': str(content_length)}
+    response.encoding = 'utf-8'
+    response.iter_content.side_effect = iter_content
+    return response, consumed
+
+
+class TestByteBudget:
+    """Test suite for ByteBudget class"""
+
+    def test_acquire_waits_for_release(self):
+        """Test that new reservations wait while the budget is exhausted"""
+        budget = ByteBudget(100)
+        budget.acquire(80)
+        acquired = threading.Event()
+
+        thread = threading.Thread(target=lambda: (budget.acquire(50), acquired.set()))
+        thread.start()
+        assert not acquired.wait(0.1)
+
+        budget.release(80)
+        assert acquired.wait(1)
+        thread.join()
+        assert budget.in_use == 50
+
+    def test_acquire_async_waits_for_release(self):
+        """Test that async reservations wait without blocking the event loop"""
+        budget = ByteBudget(100)
+        budget.acquire(80)
+
+        async def run():
+            waiter = asyncio.ensure_future(budget.acquire_async(50))
+            await asyncio.sleep(0.05)
+            assert not waiter.done()
+            budget.release(80)
+            await asyncio.wait_for(waiter, 1)
+
+        asyncio.run(run())
+        assert budget.in_use == 50
+
+    def test_oversized_reservation_is_admitted_alone(self):
+        """Test that a reservation above the limit does not wait forever"""
+        budget = ByteBudget(100)
+        budget.acquire(500)
+        assert budget.in_use == 500
+        budget.release(500)
+        assert budget.in_use == 0
+
+
+class TestReadLimited:
+    """Test suite for read_limited"""
+
+    def test_reads_body_and_decodes_lazily(self):
+        """Test the buffered response"""
+        response, _ = fake_response([b'<title>A', b'</title>'])
+        with read_limited(response, max_bytes=100) as buffered:
+            assert buffered.content == b'<title>A</title>'
+            assert buffered._text is None
+            assert buffered.text == '<title>A</title>'
+            assert buffered.encoding == 'utf-8'
+
+    def test_unknown_charset_falls_back_to_utf8(self):
+        """Test that a bogus charset decodes as UTF-8 instead of raising LookupError"""
+        response, _ = fake_response(['<title>Caf\u00e9</title>'.encode('utf-8')])
+        response.encoding = 'x-bogus'
+        with read_limited(response, max_bytes=100) as buffered:
+            assert buffered.text == '<title>Caf\u00e9</title>'
+
+    def test_declared_length_over_limit_aborts_before_reading(self):
+        """Test that Content-Length is checked before any body is read"""
+        response, consumed = fake_response([b'x' * 10], content_length=1000)
+        with pytest.raises(ResponseTooLarge):
+            with read_limited(response, max_bytes=100):
+                pass
+        assert consumed == []
+
+    def test_body_over_limit_aborts_early(self):
+        """Test that reading stops once the body exceeds the limit"""
+        response, consumed = fake_response([b'x' * 60] * 100)
+        with pytest.raises(ResponseTooLarge):
+            with read_limited(response, max_bytes=100):
+                pass
+        assert len(consumed) == 2
+
+    def test_budget_is_held_until_block_exits(self):
+        """Test reservation from Content-Length, growth and release"""
+        budget = ByteBudget(1000)
+        response, _ = fake_response([b'x' * 100], content_length=100)
+        with read_limited(response, budget=budget):
+            assert budget.in_use == 100
+        assert budget.in_use == 0
+
+        response, _ = fake_response([b'x' * 300] * 3)
+        with read_limited(response, budget=budget, chunk_size=300):
+            assert budget.in_use == 900
+        assert budget.in_use == 0
+
+    def test_lying_content_length_does_not_claim_memory(self):
+        """Test that a huge declared length only reserves what is actually received"""
+        budget = ByteBudget(1024 * 1024)
+        response, _ = fake_response([b'<title>Tiny</title>'], content_length=500 * 1024 * 1024)
+        tracemalloc.start()
+        try:
+            with read_limited(response, budget=budget, chunk_size=1024) as buffered:
+                assert buffered.content == b'<title>Tiny</title>'
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert peak < 64 * 1024
+        assert budget.peak == budget.limit_bytes
+        assert budget.in_use == 0
+
+        response, _ = fake_response([b'x' * 10], content_length=500 * 1024 * 1024)
+        with pytest.raises(ResponseTooLarge):
+            with read_limited(response, max_bytes=100):
+                pass
+
+    @pytest.mark.parametrize('content_length', [None, 4, 10, 100])
+    def test_body_is_read_into_one_buffer(self, content_length):
+        """Test that the body is not joined into a second copy, whatever Content-Length says"""
+        # A decoded (e.g. gzip) body can be longer or shorter than Content-Length
+        response, _ = fake_response([b'abc', b'defg', b'hij'], content_length=content_length)
+        with read_limited(response) as buffered:
+            assert isinstance(buffered.content, bytearray)
+            assert buffered.content == b'abcdefghij'
+            assert b''.join(buffered.iter_content(4)) == b'abcdefghij'
+
+
+class TestScraperLimits:
+    """Test WebScraper size caps and budget against a local server"""
+
+    @pytest.mark.parametrize('mode', ['', '/nolength'])
+    def test_oversized_page_is_skipped_without_retries(self, scraper_factory, mode):
+        """Test that a page over max_response_bytes fails fast"""
+        with LocalServer() as server:
+            scraper = scraper_factory(f"{server.base_url}/big/512{mode}",
+                                      scraping={"max_retries": 3, "max_response_bytes": 64 * 1024})
+            assert scraper.check_website() is None
+            assert scraper._scrape(f"{server.base_url}/big/16{mode}") == "Big"
+
+        assert server.hits[f"/big/512{mode}"] == 1
+
+    def test_unknown_charset_does_not_fail_the_batch(self, scraper_factory):
+        """Test that capped reads decode pages with a bogus charset like uncapped ones"""
+        with LocalServer() as server:
+            urls = [f"{server.base_url}/charset/x-bogus", f"{server.base_url}/title/Plain"]
+            scraper = scraper_factory(urls[0], scraping={"max_response_bytes": 100000})
+            results = dict(scraper.check_many(urls))
+
+        assert results == {urls[0]: "Charset", urls[1]: "Plain"}
+
+    def test_budget_bounds_bytes_in_flight(self, scraper_factory):
+        """Test that concurrent fetches stay within the memory budget"""
+        with LocalServer() as server:
+            urls = [f"{server.base_url}/big/100?{i}" for i in range(20)]
+            scraper = scraper_factory(urls[0], scraping={"max_retries": 3, "memory_budget_mb": 0.25})
+            scraper.byte_budget = ByteBudget(256 * 1024)  # Isolate from the shared budget
+
+            titles = [title for _, title in scraper.check_many(urls, max_workers=8)]
+
+        assert titles == ["Big"] * 20
+        assert scraper.byte_budget.peak <= 256 * 1024
+        assert scraper.byte_budget.in_use == 0
+
+
+if __name__ == "__main__":
+    # Run tests if script is executed directly
+    pytest.main([__file__, "-v"])
@@ -2,7 +2,9 @@
 
 import pytest
 import os
+import json
 import logging
+import logging.handlers
 import tempfile
 from unittest.mock import patch, Mock
 import sys
@@ -43,34 +45,93 @@ class TestScraperLogger:
         # Test config has DEBUG level
         assert logger.level == logging.DEBUG
 
+    def test_logger_only_has_queue_handler(self):
+        """Test that the logger itself does no I/O, records go to a queue"""
+        handlers = self.scraper_logger.get_logger().handlers
+        assert len(handlers) == 1
+        assert isinstance(handlers[0], logging.handlers.QueueHandler)
+
     def test_logger_has_file_handler(self):
         """Test that logger has file handler configured"""
-        logger = self.scraper_logger.get_logger()
-
         # Najdeme FileHandler mezi handlery
-        file_handlers = [h for h in logger.handlers if isinstance(h, logging.FileHandler)]
+        file_handlers = [h for h in self.scraper_logger.handlers if isinstance(h, logging.FileHandler)]
         assert len(file_handlers) == 1
 
     def test_logger_has_console_handler_when_enabled(self):
         """Test that logger has console handler when enabled in config"""
         # Test config has console_output=true
-        logger = self.scraper_logger.get_logger()
-
         # Najdeme StreamHandler (console) mezi handlery
-        console_handlers = [h for h in logger.handlers
+        console_handlers = [h for h in self.scraper_logger.handlers
                           if isinstance(h, logging.StreamHandler) and not isinstance(h, logging.FileHandler)]
         assert len(console_handlers) == 1
 
     def test_logger_no_console_handler_when_disabled(self):
         """Test that logger file path is correctly configured"""
         # Test that file path from config is used
-        expected_path = 'logs/test_scraper.log'
-        file_handlers = [h for h in self.scraper_logger.get_logger().handlers
+        expected_path = os.path.abspath('logs/test_scraper.log')
+        file_handlers = [h for h in self.scraper_logger.handlers
                         if isinstance(h, logging.FileHandler)]
 
         # Check that file handler exists and uses correct path
         assert len(file_handlers) == 1
-        # Note: We can't easily check the exact path without accessing private attributes
+        assert file_handlers[0].baseFilename == expected_path
+
+    def test_file_handler_rotates_at_max_file_size(self, tmp_path):
+        """Test that max_file_size_mb is enforced through rotation"""
+        config_path = tmp_path / 'config.json'
+        config_path.write_text(json.dumps({"logging": {
+            "level": "INFO", "console_output": False, "max_file_size_mb": 0.001, "backup_count": 2,
+            "file_path": str(tmp_path / 'logs' / 'rotating.log')}}))
+        scraper_logger = ScraperLogger("rotating_logger", Config(str(config_path)))
+
+        file_handler = scraper_logger.handlers[0]
+        assert isinstance(file_handler, logging.handlers.RotatingFileHandler)
+        assert file_handler.maxBytes == 1048
+
+        logger = scraper_logger.get_logger()
+        for i in range(100):
+            logger.info(f"Message number {i} with some padding to fill the file")
+        ScraperLogger.shutdown()
+
+        assert (tmp_path / 'logs' / 'rotating.log.1').exists()
+        assert not (tmp_path / 'logs' / 'rotating.log.3').exists()
+
+    def test_records_are_formatted_by_listener(self, tmp_path):
+        """Test that log calls only merge args, timestamps and tracebacks are formatted on the listener"""
+        config_path = tmp_path / 'config.json'
+        config_path.write_text(json.dumps({"logging": {
+            "level": "INFO", "console_output": False, "file_log_format": "%(asctime)s %(levelname)s %(message)s",
+            "file_path": str(tmp_path / 'deferred.log')}}))
+        logger = ScraperLogger("deferred_logger", Config(str(config_path))).get_logger()
+
+        args = ['first']
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logger.makeRecord(logger.name, logging.ERROR, __file__, 0, "value %s", (args,), sys.exc_info())
+        prepared = logger.handlers[0].prepare(record)
+        args.append('second')
+
+        assert prepared.msg == "value ['first']" and prepared.args is None
+        assert prepared.exc_info is not None and prepared.exc_text is None
+        assert not hasattr(prepared, 'asctime')
+
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Failed %s", "here")
+        ScraperLogger.shutdown()
+
+        text = (tmp_path / 'deferred.log').read_text()
+        assert "ERROR Failed here" in text and "ValueError: boom" in text
+
+    def test_instances_share_handlers(self):
+        """Test that loggers with the same config share one set of handlers"""
+        test_config_path = os.path.join(os.path.dirname(__file__), 'test_config.json')
+        other = ScraperLogger("other_logger", Config(test_config_path))
+
+        assert other.handlers is self.scraper_logger.handlers
+        assert other.get_logger().handlers[0] is self.scraper_logger.get_logger().handlers[0]
 
     def test_logs_directory_creation(self):
         """Test that logs directory is created if it doesn't exist"""
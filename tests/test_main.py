@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+import pytest
+import io
+import json
+import sys
+import pathlib
+from unittest.mock import patch
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+import main
+from src.config import shared_config
+from tests.local_server import LocalServer
+
+
+class TestReadUrls:
+    """Test suite for read_urls"""
+
+    def test_skips_blank_lines_and_comments(self, tmp_path):
+        """Test parsing of URL list files"""
+        path = tmp_path / 'urls.txt'
+        path.write_text("# seeds\nhttps://a.example/\n\n  https://b.example/  \n")
+        assert list(main.read_urls([str(path)])) == ['https://a.example/', 'https://b.example/']
+
+    def test_reads_lazily_from_stdin(self):
+        """Test that lines are only read as URLs are consumed"""
+        stdin = io.StringIO("".join(f"https://example.com/{i}\n" for i in range(1000)))
+        with patch('sys.stdin', stdin):
+            urls = main.read_urls(['-'])
+            assert next(urls) == 'https://example.com/0'
+            assert stdin.tell() < len(stdin.getvalue())
+
+
+class TestProgressReporter:
+    """Test suite for ProgressReporter class"""
+
+    def test_summary_reports_rate_and_errors(self):
+        """Test the final summary line"""
+        stream = io.StringIO()
+        progress = main.ProgressReporter(interval=0, stream=stream).start()
+        for ok in [True, True, True, False]:
+            progress.record(ok)
+        progress.stop()
+
+        assert "done: 4 urls" in stream.getvalue()
+        assert "failed: 1 (25.0%)" in stream.getvalue()
+
+
+class TestMain:
+    """Test the command line end to end against a local server"""
+
+    def test_batch_to_output_sink(self, write_config, tmp_path, capsys):
+        """Test streaming a URL file through the engine into a JSONL sink"""
+        config_path = write_config(logging={"console_output": True})
+        output = tmp_path / 'out' / 'titles.jsonl'
+
+        with LocalServer() as server:
+            urls = tmp_path / 'urls.txt'
+            urls.write_text("".join(f"{server.base_url}/title/p{i}\n" for i in range(10)) + f"{server.base_url}/error\n")
+            code = main.main([str(urls), '-c', config_path, '-o', str(output),
+                              '--workers', '4', '--per-host', '2', '--stats-interval', '0', '--quiet'])
+
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        assert code == 0
+        assert len(records) == 11
+        assert {r['title'] for r in records if r['ok']} == {f"p{i}" for i in range(10)}
+        assert "failed: 1" in capsys.readouterr().err
+
+        # Flags are applied in memory, never written to the config file
+        config = shared_config(config_path)
+        assert config.fetch_config_value('politeness', 'max_concurrent_per_host') == 2
+        assert 'politeness' not in json.loads(pathlib.Path(config_path).read_text())
+
+    def test_existing_output_needs_append_or_overwrite(self, write_config, tmp_path, capsys):
+        """Test that an existing output file is refused unless --append or --overwrite is given"""
+        config_path = write_config()
+        output = tmp_path / 'titles.jsonl'
+        output.write_text('{"url": "earlier"}\n')
+
+        with LocalServer() as server:
+            urls = tmp_path / 'urls.txt'
+            urls.write_text(f"{server.base_url}/title/p0\n")
+            args = [str(urls), '-c', config_path, '-o', str(output), '--stats-interval', '0']
+            assert main.main(args) == 2
+            assert "--append or --overwrite" in capsys.readouterr().err
+            assert main.main(args + ['--append']) == 0
+
+        assert len(output.read_text().splitlines()) == 2
+
+    def test_sitemap_seeding(self, write_config, capsys):
+        """Test that sitemap URLs changed since --since are checked"""
+        with LocalServer() as server:
+            code = main.main(['--sitemap', server.base_url, '--since', '2024-06-01', '-c', write_config(),
+                              '--stats-interval', '0'])
+
+        lines = capsys.readouterr().out.splitlines()
+        assert code == 0
+        assert sorted(line.split('\t')[1] for line in lines) == ["new", "unknown"]
+
+    def test_incremental_sitemap_state_is_committed_after_batch(self, write_config, capsys, tmp_path):
+        """Test that the sitemap state is recorded once the pages were checked"""
+        from src.sitemap import SitemapState
+
+        state = SitemapState(str(tmp_path / 'state.json'))
+        config = write_config(sitemap={"incremental": True, "state_path": state.path})
+        with LocalServer() as server:
+            assert main.main(['--sitemap', server.base_url, '-c', config, '--stats-interval', '0']) == 0
+
+        assert len(capsys.readouterr().out.splitlines()) == 4
+        assert state.last_run(server.base_url) is not None
+
+    def test_invalid_since_is_rejected(self):
+        """Test that a malformed --since date is a usage error"""
+        with pytest.raises(SystemExit):
+            main.parse_args(['--sitemap', 'https://example.com', '--since', 'last week'])
+
+    def test_since_without_sitemap_is_rejected(self, capsys):
+        """Test that --since alone is a usage error instead of being ignored"""
+        with pytest.raises(SystemExit):
+            main.parse_args(['urls.txt', '--since', '2025-01-01'])
+        assert "--since requires --sitemap" in capsys.readouterr().err
+
+    def test_capture_then_replay(self, write_config, tmp_path, capsys):
+        """Test that a captured run can be replayed without the server"""
+        config_path = write_config(pipeline={"parse_workers": 1})
+        archive = tmp_path / 'run.arc'
+
+        with LocalServer() as server:
+            urls = tmp_path / 'urls.txt'
+            urls.write_text("".join(f"{server.base_url}/title/p{i}\n" for i in range(5)))
+            assert main.main([str(urls), '-c', config_path, '--capture', str(archive),
+                              '--stats-interval', '0']) == 0
+        capsys.readouterr()
+
+        assert main.main(['--replay', str(archive), '-c', config_path, '--stats-interval', '0']) == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert sorted(line.split('\t')[1] for line in lines) == [f"p{i}" for i in range(5)]
+
+
+if __name__ == "__main__":
+    # Run tests if script is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+
+import pytest
+import time
+import sys
+import pathlib
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+from src.metrics import Histogram, MetricsRegistry, PrometheusFileExporter, shared_metrics_registry, stop_exporters
+from tests.local_server import LocalServer
+
+
+class TestHistogram:
+    """Test suite for Histogram class"""
+
+    def test_observe_and_quantiles(self):
+        """Test bucket counts and quantile estimates"""
+        histogram = Histogram((0.1, 1.0, 10.0))
+        for value in [0.05] * 90 + [0.5] * 9 + [20.0]:
+            histogram.observe(value)
+
+        assert histogram.counts == [90, 9, 0, 1]
+        assert histogram.count == 100
+        assert histogram.quantile(0.5) == 0.1
+        assert histogram.quantile(0.95) == 1.0
+        assert histogram.quantile(1.0) == float('inf')
+
+    def test_empty_histogram(self):
+        """Test that an empty histogram has no quantiles"""
+        assert Histogram().quantile(0.5) is None
+        assert Histogram().as_dict()['mean'] is None
+
+
+class TestMetricsRegistry:
+    """Test suite for MetricsRegistry class"""
+
+    def setup_method(self):
+        """Setup before each test"""
+        self.registry = MetricsRegistry()
+        self.registry.observe_attempt('a.com', status=200, bytes_received=100, ttfb=0.02, total=0.03)
+        self.registry.observe_attempt('a.com', error='timeout', total=10.0)
+        self.registry.observe_request('a.com', retries=1)
+
+    def test_snapshot_aggregates_per_host(self):
+        """Test snapshot contents"""
+        snapshot = self.registry.snapshot()['a.com']
+
+        assert snapshot['requests'] == 1
+        assert snapshot['attempts'] == 2
+        assert snapshot['bytes_received'] == 100
+        assert snapshot['status_codes'] == {200: 1}
+        assert snapshot['errors'] == {'timeout': 1}
+        assert snapshot['phases']['total']['count'] == 2
+        assert snapshot['phases']['parse']['count'] == 0
+        assert snapshot['retries']['sum'] == 1
+
+    def test_prometheus_text_format(self):
+        """Test Prometheus exposition output"""
+        text = self.registry.to_prometheus()
+
+        assert '# TYPE scraper_phase_seconds histogram' in text
+        assert 'scraper_phase_seconds_bucket{host="a.com",phase="total",le="+Inf"} 2' in text
+        assert 'scraper_phase_seconds_count{host="a.com",phase="ttfb"} 1' in text
+        assert 'scraper_responses_total{host="a.com",status="200"} 1' in text
+        assert 'scraper_errors_total{host="a.com",error="timeout"} 1' in text
+        assert 'scraper_retries_total{host="a.com"} 1' in text
+
+    def test_label_values_are_escaped(self):
+        """Test that quotes in hosts do not break the output"""
+        registry = MetricsRegistry()
+        registry.observe_attempt('bad"host', status=200)
+        assert 'host="bad\\"host"' in registry.to_prometheus()
+
+    def test_file_exporter_writes_periodically(self, tmp_path):
+        """Test that the exporter writes the file and a final snapshot on stop"""
+        path = tmp_path / 'metrics' / 'scraper.prom'
+        exporter = PrometheusFileExporter(self.registry, str(path), interval=0.05).start()
+        time.sleep(0.2)
+        assert path.exists()
+
+        self.registry.observe_attempt('b.com', status=404)
+        exporter.stop()
+        assert 'host="b.com"' in path.read_text()
+
+
+    def test_stopped_exporters_write_final_snapshot(self, tmp_path):
+        """Test that a run shorter than the interval still writes the file at exit"""
+        path = tmp_path / 'short.prom'
+        registry = shared_metrics_registry(str(path), interval=3600)
+        registry.observe_attempt('short.example', status=200)
+        assert not path.exists()
+
+        stop_exporters()
+        assert 'host="short.example"' in path.read_text()
+
+
+class TestScraperMetrics:
+    """Test WebScraper instrumentation against a local server"""
+
+    def _scraper(self, scraper_factory, url, enabled=True, **scraping):
+        scraper = scraper_factory(url, scraping={"max_retries": 2, **scraping}, metrics={"enabled": enabled})
+        if enabled:
+            scraper.metrics = MetricsRegistry()  # Isolate from the process-wide registry
+        return scraper
+
+    def test_disabled_by_default(self, scraper_factory):
+        """Test that no registry is attached unless enabled"""
+        assert self._scraper(scraper_factory, 'http://example.com', enabled=False).metrics is None
+
+    def test_records_phases_status_and_retries(self, scraper_factory):
+        """Test metrics for successful and failed requests"""
+        with LocalServer() as server:
+            host = server.base_url.split('://')[1]
+            scraper = self._scraper(scraper_factory, f"{server.base_url}/title/Metrics")
+            assert scraper.check_website() == "Metrics"
+            assert scraper._scrape(f"{server.base_url}/error") is None
+
+        snapshot = scraper.metrics.snapshot()[host]
+        assert snapshot['requests'] == 2
+        assert snapshot['attempts'] == 3
+        assert snapshot['status_codes'] == {200: 1, 500: 2}
+        assert snapshot['errors'] == {'http_error': 2}
+        assert snapshot['bytes_received'] > 0
+        assert snapshot['retries']['sum'] == 1
+        for phase in ('ttfb', 'download', 'parse'):
+            assert snapshot['phases'][phase]['count'] == 1
+
+    def test_close_writes_prometheus_file(self, scraper_factory, tmp_path):
+        """Test that closing the scraper writes the current snapshot"""
+        path = tmp_path / 'scraper.prom'
+        with LocalServer() as server:
+            scraper = scraper_factory(f"{server.base_url}/title/Closed",
+                                      metrics={"enabled": True, "prometheus_path": str(path), "export_interval": 3600})
+            assert scraper.check_website() == "Closed"
+            scraper.close()
+
+        assert f'host="{server.base_url.split("://")[1]}"' in path.read_text()
+
+    def test_streamed_title_counts_bytes_read(self, scraper_factory):
+        """Test that streaming mode reports download without a parse phase"""
+        with LocalServer() as server:
+            host = server.base_url.split('://')[1]
+            scraper = self._scraper(scraper_factory, f"{server.base_url}/title/Stream", stream_title=True)
+            assert scraper.check_website() == "Stream"
+
+        snapshot = scraper.metrics.snapshot()[host]
+        assert snapshot['bytes_received'] > 0
+        assert snapshot['phases']['download']['count'] == 1
+        assert snapshot['phases']['parse']['count'] == 0
+
+
+if __name__ == "__main__":
+    # Run tests if script is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+import pytest
+import subprocess
+import sys
+import pathlib
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+import src
+
+ROOT = pathlib.Path(__file__).parent.parent
+
+
+def loaded_modules(statement: str) -> set:
+    """Run statement in a fresh interpreter and return the loaded module names"""
+    code = f"{statement}\nimport sys\nprint(' '.join(sys.modules))"
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, cwd=ROOT, check=True)
+    return set(result.stdout.split())
+
+
+class TestLazyImports:
+    """Test that the package loads heavy dependencies only when needed"""
+
+    def test_config_does_not_load_scraper_dependencies(self):
+        """Test that importing Config skips requests and the HTML parsers"""
+        modules = loaded_modules("from src import Config")
+        assert 'src.config' in modules
+        assert not modules & {'src.scraper', 'requests', 'bs4', 'aiohttp'}
+
+    def test_scraper_defers_parsers_and_asyncio_engine(self):
+        """Test that bs4, soupsieve and aiohttp wait for first use"""
+        modules = loaded_modules("from src import WebScraper")
+        assert 'requests' in modules
+        assert not modules & {'bs4', 'soupsieve', 'aiohttp', 'lxml'}
+
+    def test_scraper_defers_feature_dependencies(self):
+        """Test that asyncio, sqlite3, xml.etree and mmap wait for the features using them"""
+        modules = loaded_modules("from src import WebScraper")
+        assert not modules & {'asyncio', 'sqlite3', 'xml.etree', 'mmap', 'src.archive', 'src.jobstore', 'src.sitemap'}
+
+    def test_lazy_feature_names(self):
+        """Test that deferred names of src.scraper resolve on access"""
+        import src.scraper
+        from src.jobstore import JobStore
+        assert src.scraper.JobStore is JobStore
+        with pytest.raises(AttributeError):
+            src.scraper.NoSuchThing
+
+    def test_public_names(self):
+        """Test lazy attributes, __all__ and unknown names"""
+        assert src.__all__ == ["WebScraper", "ScraperLogger", "Config"]
+        assert src.Config is src.config.Config
+        assert set(src.__all__) <= set(dir(src))
+        with pytest.raises(AttributeError):
+            src.NoSuchThing
+
+
+if __name__ == "__main__":
+    # Run tests if script is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+import pytest
+import sys
+import pathlib
+from unittest.mock import patch
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+from src.parsers import TITLE_PARSERS, TitleParser, resolve_title_parser, scan_title
+
+
+def chunked(data: bytes, size: int):
+    """Split bytes into fixed size chunks"""
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+class TestScanTitle:
+    """Test suite for streaming title extraction"""
+
+    def test_scan_title_finds_title(self):
+        """Test that title is found and stripped"""
+        html = b'<html><head><title>  Hello World </title></head><body></body></html>'
+        assert scan_title(chunked(html, 7)) == "Hello World"
+
+    def test_scan_title_decodes_entities_and_encoding(self):
+        """Test that character references and encodings are handled"""
+        html = '<html><head><title>Café &amp; Bar</title></head></html>'.encode('cp1250')
+        assert scan_title(chunked(html, 3), encoding='cp1250') == "Café & Bar"
+
+    def test_scan_title_handles_multibyte_split_across_chunks(self):
+        """Test that UTF-8 characters split across chunk boundaries decode correctly"""
+        html = '<title>Žluťoučký kůň</title>'.encode('utf-8')
+        assert scan_title(chunked(html, 1)) == "Žluťoučký kůň"
+
+    def test_scan_title_stops_after_title(self):
+        """Test that no chunks are consumed after </title>"""
+        consumed = []
+
+        def source():
+            for chunk in [b'<html><head><title>Early</title>', b'<meta>', b'x' * 1000, b'y' * 1000]:
+                consumed.append(chunk)
+                yield chunk
+
+        assert scan_title(source()) == "Early"
+        assert len(consumed) == 1
+
+    def test_scan_title_stops_at_body(self):
+        """Test that scanning stops at <body> when there is no title"""
+        consumed = []
+
+        def source():
+            for chunk in [b'<html><head></head>', b'<body>', b'<title>Not in head</title>']:
+                consumed.append(chunk)
+                yield chunk
+
+        assert scan_title(source()) is None
+        assert len(consumed) == 1
+
+    def test_scan_title_respects_max_bytes(self):
+        """Test that scanning gives up after max_bytes"""
+        html = b'<html><head>' + b'<meta name="x">' * 1000 + b'<title>Too late</title>'
+        assert scan_title(chunked(html, 512), max_bytes=1024) is None
+
+    def test_scan_title_empty_title(self):
+        """Test that an empty title is reported as missing"""
+        assert scan_title([b'<title>   </title>']) is None
+
+    def test_title_parser_marks_done(self):
+        """Test TitleParser state after the title closes"""
+        parser = TitleParser()
+        parser.feed('<head><title>Done</title>')
+        assert parser.done is True
+        assert parser.title == "Done"
+
+
+
+class TestTitleParserBackends:
+    """Test suite for pluggable title parser backends"""
+
+    @pytest.mark.parametrize("name", list(TITLE_PARSERS))
+    def test_backends_agree_on_simple_page(self, name):
+        """Test that every backend extracts the same title"""
+        _, parse = resolve_title_parser(name)
+        html = '<html><head><meta charset="utf-8"><title> Quotes &amp; More </title></head><body><p>x</p></body></html>'
+        assert parse(html) == "Quotes & More"
+
+    @pytest.mark.parametrize("name", list(TITLE_PARSERS))
+    def test_backends_return_none_without_title(self, name):
+        """Test that every backend reports a missing title as None"""
+        _, parse = resolve_title_parser(name)
+        assert parse('<html><head></head><body>No title here</body></html>') is None
+        assert parse('') is None
+
+    @pytest.mark.parametrize("name", list(TITLE_PARSERS))
+    def test_backends_handle_title_attributes_and_case(self, name):
+        """Test titles with attributes and upper case tags"""
+        _, parse = resolve_title_parser(name)
+        assert parse('<HTML><HEAD><TITLE lang="en">Upper</TITLE></HEAD></HTML>') == "Upper"
+
+    def test_resolve_unknown_parser_raises(self):
+        """Test that unknown backend names are rejected"""
+        with pytest.raises(ValueError):
+            resolve_title_parser('nonexistent')
+
+    def test_resolve_lxml_falls_back_when_missing(self):
+        """Test that lxml falls back to the strainer backend when not installed"""
+        with patch('src.parsers._lxml_available', return_value=False):
+            name, parse = resolve_title_parser('lxml')
+
+        assert name == 'strainer'
+        assert parse('<title>Fallback</title>') == "Fallback"
+
+
+if __name__ == "__main__":
+    # Run tests if script is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+import pytest
+import os
+from unittest.mock import patch
+import sys
+import pathlib
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+from src import WebScraper
+from src.fingerprint import FingerprintIndex
+from src.pipeline import FetchParsePipeline, StageStats, parse_page
+from tests.local_server import LocalServer
+
+
+class TestParsePage:
+    """Test suite for the worker-side parse function"""
+
+    def test_parse_page_decodes_and_extracts_title(self):
+        """Test decoding raw bytes and extracting the title"""
+        content = '<html><head><title>Příliš</title></head></html>'.encode('utf-8')
+        url, title, busy = parse_page('https://a.example', content, 'utf-8', 'html.parser')
+
+        assert url == 'https://a.example'
+        assert title == 'Příliš'
+        assert busy >= 0
+
+    def test_parse_page_unknown_encoding_falls_back_to_utf8(self):
+        """Test that a bogus charset does not break parsing"""
+        _, title, _ = parse_page('u', b'<title>Ok</title>', 'no-such-charset', 'fast')
+        assert title == 'Ok'
+
+
+class TestStageStats:
+    """Test suite for StageStats class"""
+
+    def test_record_and_snapshot(self):
+        """Test counters and throughput snapshot"""
+        stats = StageStats('fetch')
+        stats.record(0.5)
+        stats.record(0.25)
+        stats.observe_queue(7)
+        stats.observe_queue(3)
+
+        snapshot = stats.as_dict()
+        assert snapshot['items'] == 2
+        assert snapshot['busy_seconds'] == 0.75
+        assert snapshot['max_queue_depth'] == 7
+        assert snapshot['items_per_sec'] > 0
+
+
+class TestFetchParsePipeline:
+    """Test FetchParsePipeline against a local server"""
+
+    def setup_method(self):
+        """Setup before each test"""
+        test_config_path = os.path.join(os.path.dirname(__file__), 'test_config.json')
+        self.server = LocalServer().__enter__()
+        self.scraper = WebScraper(self.server.base_url, config_file=test_config_path)
+
+    def teardown_method(self):
+        """Stop the local server after each test"""
+        self.server.__exit__(None, None, None)
+
+    def test_pipeline_returns_all_results(self):
+        """Test that every URL comes out of the pipeline exactly once"""
+        urls = [f"{self.server.base_url}/title/page{i}" for i in range(30)]
+        urls.append(f"{self.server.base_url}/error")
+
+        pipeline = FetchParsePipeline(self.scraper, fetch_workers=4, parse_workers=2, queue_size=4)
+        results = dict(pipeline.run(iter(urls)))
+
+        assert len(results) == len(urls)
+        assert results[f"{self.server.base_url}/error"] is None
+        assert all(results[url] == f"page{i}" for i, url in enumerate(urls[:-1]))
+
+        stats = pipeline.stats()
+        assert stats['fetch']['items'] == len(urls)
+        assert stats['parse']['items'] == 30
+        assert stats['fetch']['max_queue_depth'] <= 4
+
+    def test_unexpected_fetch_error_fails_only_that_url(self):
+        """Test that an exception other than a request error is reported as a failed URL"""
+        urls = [f"{self.server.base_url}/title/page{i}" for i in range(5)]
+        scrape = self.scraper._scrape
+
+        def flaky_scrape(url, *args):
+            if url == urls[1]:
+                raise ValueError("broken extractor")
+            return scrape(url, *args)
+
+        pipeline = FetchParsePipeline(self.scraper, fetch_workers=1, parse_workers=1, queue_size=2)
+        with patch.object(self.scraper, '_scrape', side_effect=flaky_scrape), \
+             patch.object(self.scraper.logger, 'exception') as log_exception:
+            results = dict(pipeline.run(iter(urls)))
+
+        assert results == {url: (None if url == urls[1] else f"page{i}") for i, url in enumerate(urls)}
+        log_exception.assert_called_once()
+
+    def test_duplicate_pages_skip_parse_stage(self):
+        """Test that pages matching a fingerprint are not sent to the parser pool"""
+        self.scraper.fingerprints = FingerprintIndex(max_entries=100)
+        pipeline = FetchParsePipeline(self.scraper, fetch_workers=2, parse_workers=1, queue_size=2)
+        assert dict(pipeline.run([f"{self.server.base_url}/mirror/first"])) == {
+            f"{self.server.base_url}/mirror/first": "Mirror"}
+
+        urls = [f"{self.server.base_url}/mirror/{i}" for i in range(8)]
+        results = dict(pipeline.run(iter(urls)))
+
+        assert set(results.values()) == {"Mirror"}
+        assert pipeline.stats()['parse']['items'] == 0
+        assert self.scraper.fingerprints.stats()['near_hits'] == len(urls)
+
+    def test_pipeline_can_be_closed_early(self):
+        """Test that abandoning the generator shuts the stages down"""
+        urls = (f"{self.server.base_url}/title/p{i}" for i in range(1000))
+        pipeline = FetchParsePipeline(self.scraper, fetch_workers=2, parse_workers=1, queue_size=2)
+
+        results = pipeline.run(urls)
+        first = next(results)
+        results.close()
+
+        assert first[1] is not None
+        assert pipeline.stats()['fetch']['items'] < 1000
+
+
+if __name__ == "__main__":
+    # Run tests if script is executed directly
+    pytest.main([__file__, "-v"])
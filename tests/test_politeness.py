@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+
+import pytest
+import asyncio
+import os
+import threading
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from unittest.mock import Mock, patch
+import sys
+import pathlib
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+from src import WebScraper
+from src.politeness import (HostScheduler, TokenBucket, backoff_delay, host_of,
+                            interleave_by_host, parse_retry_after)
+from tests.local_server import LocalServer
+
+
+class TestRetryHelpers:
+    """Test suite for backoff and Retry-After helpers"""
+
+    def test_parse_retry_after_seconds(self):
+        """Test delay-seconds form"""
+        assert parse_retry_after('120') == 120.0
+
+    def test_parse_retry_after_fractional_seconds(self):
+        """Test that fractional delays (as sent by bench_server) are honored"""
+        assert parse_retry_after('0.05') == 0.05
+        assert parse_retry_after('-1') is None
+        assert parse_retry_after('nan') is None
+
+    def test_parse_retry_after_http_date(self):
+        """Test HTTP-date form"""
+        delay = parse_retry_after(formatdate(time.time() + 60, usegmt=True))
+        assert 55 <= delay <= 61
+
+    def test_parse_retry_after_invalid(self):
+        """Test missing and garbage values"""
+        assert parse_retry_after(None) is None
+        assert parse_retry_after('soon') is None
+
+    def test_backoff_grows_exponentially(self):
+        """Test backoff without jitter"""
+        delays = [backoff_delay(attempt, 1, 2, 30, jitter=False) for attempt in range(6)]
+        assert delays == [1, 2, 4, 8, 16, 30]
+
+    def test_backoff_jitter_stays_in_range(self):
+        """Test that jittered delays stay between half and full delay"""
+        for _ in range(100):
+            assert 2 <= backoff_delay(2, 1, 2, 30, jitter=True) <= 4
+
+    def test_host_of(self):
+        """Test host extraction"""
+        assert host_of('https://Example.COM:8080/path?q=1') == 'example.com:8080'
+
+
+class TestInterleaveByHost:
+    """Test suite for interleave_by_host"""
+
+    def test_round_robin_across_hosts(self):
+        """Test that URLs from different hosts alternate"""
+        urls = ['http://a/1', 'http://a/2', 'http://a/3', 'http://b/1', 'http://c/1']
+        assert list(interleave_by_host(urls)) == [
+            'http://a/1', 'http://b/1', 'http://c/1', 'http://a/2', 'http://a/3']
+
+    def test_keeps_every_url(self):
+        """Test that no URL is lost or duplicated with a small window"""
+        urls = [f'http://h{i % 7}/{i}' for i in range(100)]
+        result = list(interleave_by_host(urls, window=5))
+        assert sorted(result) == sorted(urls)
+
+
+class TestHostScheduler:
+    """Test suite for HostScheduler and TokenBucket"""
+
+    def test_token_bucket_allows_burst_then_waits(self):
+        """Test reservations beyond the burst size have to wait"""
+        bucket = TokenBucket(rate=10, capacity=2)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+
+    def test_rate_limit_per_host(self):
+        """Test that requests to one host are paced"""
+        scheduler = HostScheduler(requests_per_second=20, burst=1)
+
+        start = time.perf_counter()
+        for _ in range(5):
+            with scheduler.slot('a'):
+                pass
+        assert time.perf_counter() - start >= 0.15
+
+    def test_hosts_are_limited_independently(self):
+        """Test that other hosts are not slowed down"""
+        scheduler = HostScheduler(requests_per_second=1, burst=1)
+
+        start = time.perf_counter()
+        for host in ['a', 'b', 'c', 'd']:
+            with scheduler.slot(host):
+                pass
+        assert time.perf_counter() - start < 0.5
+
+    def test_max_concurrent_per_host(self):
+        """Test that concurrency per host is capped"""
+        scheduler = HostScheduler(max_concurrent_per_host=2)
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def work():
+            with scheduler.slot('a'):
+                with lock:
+                    active.append(1)
+                    peak.append(len(active))
+                time.sleep(0.05)
+                with lock:
+                    active.pop()
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            for _ in range(6):
+                executor.submit(work)
+
+        assert max(peak) == 2
+
+    def test_async_slots_share_limits_with_threads(self):
+        """Test that slot_async caps concurrency without blocking the event loop"""
+        scheduler = HostScheduler(max_concurrent_per_host=2)
+        active = []
+        peak = []
+
+        async def work():
+            async with scheduler.slot_async('a'):
+                active.append(1)
+                peak.append(len(active))
+                await asyncio.sleep(0.05)
+                active.pop()
+
+        async def run():
+            with scheduler.slot('a'):  # A thread holds one of the two slots
+                await asyncio.gather(*(work() for _ in range(4)))
+
+        start = time.perf_counter()
+        asyncio.run(run())
+        assert max(peak) == 1
+        assert time.perf_counter() - start >= 0.2
+
+    def test_defer_pauses_host(self):
+        """Test that defer holds back the next request"""
+        scheduler = HostScheduler()
+        scheduler.defer('a', 0.2)
+
+        start = time.perf_counter()
+        with scheduler.slot('a'):
+            pass
+        assert time.perf_counter() - start >= 0.15
+
+
+class TestScraperRetryAfter:
+    """Test that WebScraper honors Retry-After"""
+
+    def test_retry_after_is_used_as_delay(self):
+        """Test that a 429 with Retry-After waits the server-provided delay"""
+        test_config_path = os.path.join(os.path.dirname(__file__), 'test_config.json')
+        scraper = WebScraper("https://throttled.example", config_file=test_config_path)
+
+        throttled = Mock()
+        throttled.status_code = 429
+        throttled.headers = {'Retry-After': '3'}
+        error = requests.HTTPError("429 Too Many Requests", response=throttled)
+
+        ok = Mock()
+        ok.raise_for_status.return_value = None
+        ok.text = '<title>Back</title>'
+
+        with patch('src.scraper.requests.get', side_effect=[error, ok]), \
+             patch('src.scraper.time.sleep') as mock_sleep, \
+             patch.object(scraper.scheduler, 'defer') as mock_defer:
+            assert scraper.check_website() == "Back"
+
+        mock_sleep.assert_called_once_with(3.0)
+        mock_defer.assert_called_once_with('throttled.example', 3.0)
+
+    def test_retry_after_host_pause_is_capped(self, scraper_factory):
+        """Test that a day-long Retry-After pauses the host for at most max_retry_delay"""
+        with LocalServer() as server:
+            scraper = scraper_factory(f"{server.base_url}/throttled/86400", scraping={"max_retry_delay": 0.5})
+            scraper.scheduler = HostScheduler()  # Isolate from the shared scheduler
+            assert scraper.check_website() is None
+            # Checked before the server shuts down, which can take longer than the pause
+            delay = scraper.scheduler._start_delay(scraper.scheduler._state(host_of(server.base_url)))
+
+        assert 0 < delay <= 0.5
+
+    def test_async_retry_after_host_pause_is_capped(self, scraper_factory):
+        """Test that the asyncio engine caps the host pause the same way"""
+        pytest.importorskip("aiohttp")
+        with LocalServer() as server:
+            scraper = scraper_factory(server.base_url, scraping={"max_retry_delay": 0.5})
+            scraper.scheduler = HostScheduler()
+            assert asyncio.run(scraper.check_website_async(f"{server.base_url}/throttled/86400")) is None
+            delay = scraper.scheduler._start_delay(scraper.scheduler._state(host_of(server.base_url)))
+
+        assert 0 < delay <= 0.5
+
+
+if __name__ == "__main__":
+    # Run tests if script is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+import pytest
+import threading
+import sys
+import pathlib
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+from src.registry import pop_shared, shared_instance
+
+
+class TestSharedInstance:
+    """Test suite for the process-wide instance registry"""
+
+    def test_same_kind_and_key_share_one_instance(self):
+        """Test that the factory runs once per kind and key"""
+        first = shared_instance('test_share', 1, object)
+        assert shared_instance('test_share', 1, object) is first
+        assert shared_instance('test_share', 2, object) is not first
+        assert shared_instance('test_share_other', 1, object) is not first
+
+    def test_concurrent_first_calls_create_one_instance(self):
+        """Test that racing callers get the same instance"""
+        created = []
+        barrier = threading.Barrier(8)
+
+        def get():
+            barrier.wait()
+            return shared_instance('test_race', 'key', lambda: created.append(object()) or created[-1])
+
+        threads = [threading.Thread(target=get) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(created) == 1
+
+    def test_pop_shared_removes_only_that_kind(self):
+        """Test that popped instances are recreated on next use"""
+        kept = shared_instance('test_keep', 1, object)
+        popped = [shared_instance('test_pop', key, object) for key in range(3)]
+
+        assert sorted(map(id, pop_shared('test_pop'))) == sorted(map(id, popped))
+        assert pop_shared('test_pop') == []
+        assert shared_instance('test_pop', 0, object) is not popped[0]
+        assert shared_instance('test_keep', 1, object) is kept
+
+
+if __name__ == "__main__":
+    # Run tests if script is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+import pytest
+import time
+import requests
+from unittest.mock import Mock, patch
+import sys
+import pathlib
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+from src.robots import RobotsCache, RobotsRules
+from tests.local_server import LocalServer
+
+ROBOTS_TXT = """
+# Example robots.txt
+User-agent: *
+Disallow: /private
+Allow: /private/public
+Disallow: /*.pdf$
+Crawl-delay: 2
+
+User-agent: BasicScraper
+User-agent: OtherBot
+Disallow: /no-scrapers
+Crawl-delay: 5
+
+Sitemap: https://example.com/sitemap.xml
+"""
+
+
+class TestRobotsRules:
+    """Test suite for RobotsRules parsing and matching"""
+
+    def setup_method(self):
+        """Setup before each test"""
+        self.rules = RobotsRules.parse(ROBOTS_TXT, 'GenericBot/1.0')
+
+    def test_disallow_and_allow_precedence(self):
+        """Test that the longest matching rule wins"""
+        assert self.rules.can_fetch('https://example.com/') is True
+        assert self.rules.can_fetch('https://example.com/private/data') is False
+        assert self.rules.can_fetch('https://example.com/private/public/page') is True
+
+    def test_wildcards_and_end_anchor(self):
+        """Test * and $ patterns"""
+        assert self.rules.can_fetch('https://example.com/docs/file.pdf') is False
+        assert self.rules.can_fetch('https://example.com/docs/file.pdf?download=1') is True
+
+    def test_crawl_delay_and_sitemaps(self):
+        """Test Crawl-delay and Sitemap fields"""
+        assert self.rules.crawl_delay == 2
+        assert self.rules.sitemaps == ['https://example.com/sitemap.xml']
+
+    def test_specific_user_agent_group(self):
+        """Test that a matching user agent group replaces the * group"""
+        rules = RobotsRules.parse(ROBOTS_TXT, 'Mozilla/5.0 (compatible; BasicScraper/1.0)')
+
+        assert rules.can_fetch('https://example.com/private/data') is True
+        assert rules.can_fetch('https://example.com/no-scrapers') is False
+        assert rules.crawl_delay == 5
+
+    def test_robots_txt_itself_is_always_allowed(self):
+        """Test that robots.txt can always be fetched"""
+        assert RobotsRules.disallow_all().can_fetch('https://example.com/robots.txt') is True
+
+
+class TestRobotsCache:
+    """Test suite for RobotsCache class"""
+
+    def make_response(self, status, text=''):
+        response = Mock()
+        response.status_code = status
+        response.text = text
+        return response
+
+    def test_fetches_once_per_host_within_ttl(self):
+        """Test that robots.txt is fetched once and reused"""
+        cache = RobotsCache('TestBot', ttl_seconds=60)
+        get = Mock(return_value=self.make_response(200, ROBOTS_TXT))
+
+        assert cache.can_fetch('https://example.com/a', get) is True
+        assert cache.can_fetch('https://example.com/private', get) is False
+        get.assert_called_once()
+        assert get.call_args.args[0] == 'https://example.com/robots.txt'
+
+    def test_refetches_after_ttl(self):
+        """Test that rules expire after the TTL"""
+        cache = RobotsCache('TestBot', ttl_seconds=10)
+        get = Mock(return_value=self.make_response(200, ROBOTS_TXT))
+
+        cache.can_fetch('https://example.com/a', get)
+        with patch('src.robots.time.monotonic', return_value=time.monotonic() + 60):
+            cache.can_fetch('https://example.com/a', get)
+        assert get.call_count == 2
+
+    def test_missing_robots_allows_all(self):
+        """Test that a 404 robots.txt allows everything"""
+        cache = RobotsCache('TestBot')
+        assert cache.can_fetch('https://example.com/private', Mock(return_value=self.make_response(404))) is True
+
+    def test_unreachable_robots_disallows_all(self):
+        """Test that server errors and connection errors disallow everything"""
+        cache = RobotsCache('TestBot')
+        assert cache.can_fetch('https://a.example/x', Mock(return_value=self.make_response(503))) is False
+        assert cache.can_fetch('https://b.example/x', Mock(side_effect=requests.ConnectionError())) is False
+
+
+class TestScraperRobots:
+    """Test robots.txt enforcement in WebScraper against a local server"""
+
+    def make_scraper(self, scraper_factory, url):
+        return scraper_factory(url, scraping={"user_agent": "TestBot/1.0"}, robots={"enabled": True, "ttl_seconds": 60})
+
+    def test_disallowed_url_is_rejected_before_connecting(self, scraper_factory):
+        """Test that a disallowed URL is never requested"""
+        with LocalServer() as server:
+            scraper = self.make_scraper(scraper_factory, f"{server.base_url}/private/page")
+            assert scraper.check_website() is None
+            assert '/private/page' not in server.hits
+
+    def test_allowed_urls_share_one_robots_fetch(self, scraper_factory):
+        """Test that robots.txt is fetched once for many URLs and scrapers"""
+        with LocalServer() as server:
+            urls = [f"{server.base_url}/title/page{i}" for i in range(5)]
+            scraper = self.make_scraper(scraper_factory, urls[0])
+            results = dict(scraper.check_many(urls, max_workers=3))
+            assert self.make_scraper(scraper_factory, urls[0]).check_website() == "page0"
+
+        assert all(results[url] == f"page{i}" for i, url in enumerate(urls))
+        assert server.hits['/robots.txt'] == 1
+
+    def test_crawl_delay_paces_requests(self, scraper_factory):
+        """Test that Crawl-delay is applied to the host scheduler"""
+        with LocalServer() as server:
+            urls = [f"{server.base_url}/title/paced{i}" for i in range(4)]
+            scraper = self.make_scraper(scraper_factory, urls[0])
+
+            start = time.perf_counter()
+            list(scraper.check_many(urls, max_workers=4))
+            elapsed = time.perf_counter() - start
+
+        assert elapsed >= 0.15
+
+
+if __name__ == "__main__":
+    # Run tests if script is executed directly
+    pytest.main([__file__, "-v"])
@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 
 import pytest
+import json
 import os
 import logging
+import logging.handlers
 import requests
 from unittest.mock import patch, Mock, MagicMock
 import sys
@@ -10,7 +12,7 @@ import pathlib
 
 # Add parent directory to path to import src modules
 sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
-from src import WebScraper
+from src import ScraperLogger, WebScraper
 
 
 class TestWebScraper:
@@ -32,13 +34,15 @@ class TestWebScraper:
         assert isinstance(self.scraper.logger, logging.Logger)
 
     def test_logger_has_correct_handlers(self):
-        """Test that logger has both file and console handlers"""
+        """Test that logger queues records for shared file and console handlers"""
         handlers = self.scraper.logger.handlers
-        assert len(handlers) == 2
+        assert len(handlers) == 1
+        assert isinstance(handlers[0], logging.handlers.QueueHandler)
 
-        # Check handler types
-        handler_types = [type(handler).__name__ for handler in handlers]
-        assert 'FileHandler' in handler_types
+        # Check handler types behind the queue
+        listener = next(l for q, l in ScraperLogger._pipelines.values() if q is handlers[0])
+        handler_types = [type(handler).__name__ for handler in listener.handlers]
+        assert 'RotatingFileHandler' in handler_types
         assert 'StreamHandler' in handler_types
 
     def test_logger_level_is_debug(self):
@@ -147,16 +151,124 @@ class TestWebScraper:
             assert mock_get.call_count == max_retries
             assert mock_sleep.call_count == max_retries - 1  # Sleep called between retries
 
-    def test_multiple_scrapers_have_different_loggers(self):
-        """Test that multiple scrapers have unique loggers"""
+    def test_get_session_is_pooled_and_reused(self):
+        """Test that batch workers share one pooled session"""
+        session = self.scraper.get_session()
+
+        assert session is self.scraper.get_session()
+        assert isinstance(session, requests.Session)
+
+        self.scraper.close()
+        assert self.scraper.get_session() is not session
+
+    def test_check_many_returns_all_results(self):
+        """Test that check_many yields a result for every URL"""
+        urls = [f"https://example.com/page{i}" for i in range(10)]
+
+        def fake_get(url, timeout):
+            response = Mock()
+            response.raise_for_status.return_value = None
+            response.text = f'<html><head><title>{url}</title></head></html>'
+            return response
+
+        session = self.scraper.get_session()
+        with patch.object(session, 'get', side_effect=fake_get) as mock_get:
+            results = dict(self.scraper.check_many(urls, max_workers=3))
+
+        assert results == {url: url for url in urls}
+        assert mock_get.call_count == len(urls)
+
+    def test_check_many_reports_failures_as_none(self):
+        """Test that failed URLs are yielded with None title"""
+        session = self.scraper.get_session()
+        with patch.object(session, 'get', side_effect=requests.ConnectionError("down")), \
+             patch('src.scraper.time.sleep'):
+            results = list(self.scraper.check_many(["https://down.example"], max_workers=2))
+
+        assert results == [("https://down.example", None)]
+
+    def test_check_many_consumes_input_lazily(self):
+        """Test that check_many does not exhaust a generator up front"""
+        consumed = []
+
+        def url_source():
+            for i in range(10000):
+                consumed.append(i)
+                yield f"https://example.com/{i}"
+
+        session = self.scraper.get_session()
+        with patch.object(session, 'get', side_effect=requests.ConnectionError("down")), \
+             patch('src.scraper.time.sleep'):
+            results = self.scraper.check_many(url_source(), max_workers=2)
+            next(results)
+            assert len(consumed) < 10000
+            results.close()
+
+    def test_check_website_stream_title_stops_early(self):
+        """Test that streaming mode stops reading after </title>"""
+        consumed = []
+
+        def body():
+            for chunk in [b'<html><head><title>Streamed</title></head>', b'x' * 8192, b'y' * 8192]:
+                consumed.append(chunk)
+                yield chunk
+
+        # Config is shared by all scrapers using the file, so patch it only for this test
+        with patch.dict(self.scraper.config.settings['scraping'], {'stream_title': True}), \
+             patch('src.scraper.requests.get') as mock_get:
+            mock_response = MagicMock()
+            mock_response.__enter__.return_value = mock_response
+            mock_response.raise_for_status.return_value = None
+            mock_response.encoding = 'utf-8'
+            mock_response.iter_content.return_value = body()
+            mock_get.return_value = mock_response
+
+            result = self.scraper.check_website()
+
+        assert result == "Streamed"
+        assert len(consumed) == 1
+        assert mock_get.call_args.kwargs['stream'] is True
+        mock_response.__exit__.assert_called_once()
+
+    def test_parser_backend_selected_from_config(self):
+        """Test that scraping.parser selects the parser backend"""
+        test_config_path = os.path.join(os.path.dirname(__file__), 'test_config.json')
+        with patch('src.config.Config.fetch_config_value',
+                   side_effect=lambda section, key, default=None: 'fast' if key == 'parser' else default):
+            scraper = WebScraper(self.test_url, config_file=test_config_path)
+
+        assert scraper.parser_name == 'fast'
+        assert scraper._extract_title('<title>Fast</title>') == "Fast"
+
+    def test_multiple_scrapers_share_logger(self):
+        """Test that multiple scrapers share one logger instead of leaking new ones"""
         test_config_path = os.path.join(os.path.dirname(__file__), 'test_config.json')
         scraper1 = WebScraper("https://site1.com", config_file=test_config_path)
         scraper2 = WebScraper("https://site2.com", config_file=test_config_path)
 
-        # Logger names should be different
-        assert scraper1.logger.name != scraper2.logger.name
+        # Logger and handlers are shared
+        assert scraper1.logger is scraper2.logger
+        assert len(scraper1.logger.handlers) == 1
         assert scraper1.url != scraper2.url
 
+    def test_scrapers_with_different_configs_keep_their_loggers(self, tmp_path):
+        """Test that a scraper with another config does not reconfigure an existing logger"""
+        loggers = []
+        for name, level in [('a', 'DEBUG'), ('b', 'ERROR')]:
+            config_path = tmp_path / f'{name}.json'
+            config_path.write_text(json.dumps({"logging": {
+                "level": level, "console_output": False, "file_path": str(tmp_path / f'{name}.log')}}))
+            loggers.append(WebScraper("https://example.com", config_file=str(config_path)).logger)
+
+        a, b = loggers
+        assert a is not b
+        assert (a.level, b.level) == (logging.DEBUG, logging.ERROR)
+
+        a.warning("written by a")
+        ScraperLogger.shutdown()
+        assert "written by a" in (tmp_path / 'a.log').read_text()
+        assert "written by a" not in (tmp_path / 'b.log').read_text()
+
 
 if __name__ == "__main__":
     # Run tests if script is executed directly
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+
+import pytest
+import csv
+import gzip
+import json
+import os
+import sys
+import pathlib
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+from src import Config
+from src.sinks import CsvSink, GzipJsonlSink, JsonlSink, RecordSink, open_sink, sink_from_config
+
+
+def records(count):
+    """Generate sample records"""
+    for i in range(count):
+        yield {"url": f"https://example.com/{i}", "title": f"Title {i}", "tags": ["a", "b"]}
+
+
+class TestSinks:
+    """Test suite for record sinks"""
+
+    def test_jsonl_sink_writes_all_records(self, tmp_path):
+        """Test JSON Lines output"""
+        path = tmp_path / 'out.jsonl'
+        with JsonlSink(str(path), flush_size=10) as sink:
+            sink.write_many(records(25))
+
+        lines = path.read_text(encoding='utf-8').splitlines()
+        assert len(lines) == 25
+        assert json.loads(lines[3]) == {"url": "https://example.com/3", "title": "Title 3", "tags": ["a", "b"]}
+
+    def test_records_are_buffered_until_flush_size(self, tmp_path):
+        """Test that nothing is written before flush_size records"""
+        path = tmp_path / 'out.jsonl'
+        sink = JsonlSink(str(path), flush_size=10)
+        sink.write_many(records(9))
+        assert not path.exists()
+
+        sink.write({"url": "last"})
+        assert len(path.read_text().splitlines()) == 10
+        sink.close()
+
+    def test_gzip_sink(self, tmp_path):
+        """Test gzip-compressed JSON Lines output"""
+        path = tmp_path / 'out.jsonl.gz'
+        with GzipJsonlSink(str(path), flush_size=7) as sink:
+            sink.write_many(records(20))
+
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            assert len(f.read().splitlines()) == 20
+
+    def test_csv_sink(self, tmp_path):
+        """Test CSV output with header and joined lists"""
+        path = tmp_path / 'out.csv'
+        with CsvSink(str(path), flush_size=4) as sink:
+            sink.write_many(records(5))
+
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 5
+        assert rows[0] == {"url": "https://example.com/0", "title": "Title 0", "tags": "a|b"}
+
+    @pytest.mark.parametrize("name", ['out.jsonl', 'out.csv', 'out.jsonl.gz'])
+    def test_rotation_by_size(self, tmp_path, name):
+        """Test that files are rotated once they reach rotate_bytes"""
+        path = tmp_path / name
+        with open_sink(str(path), flush_size=10, rotate_bytes=500) as sink:
+            sink.write_many(records(200))
+
+        assert len(sink.paths) > 1
+        assert sink.paths[0] == str(path)
+        assert sink.paths[1] == str(tmp_path / name.replace('out.', 'out.1.'))
+        assert all(os.path.exists(p) for p in sink.paths)
+        assert sink.records_written == 200
+
+    def test_rotated_csv_files_have_headers(self, tmp_path):
+        """Test that every rotated CSV file is readable on its own"""
+        with CsvSink(str(tmp_path / 'out.csv'), flush_size=10, rotate_bytes=300) as sink:
+            sink.write_many(records(50))
+
+        total = 0
+        for p in sink.paths:
+            with open(p, newline='', encoding='utf-8') as f:
+                total += len(list(csv.DictReader(f)))
+        assert total == 50
+
+    def test_open_sink_infers_format(self, tmp_path):
+        """Test format detection from the file extension"""
+        assert isinstance(open_sink(str(tmp_path / 'a.csv')), CsvSink)
+        assert isinstance(open_sink(str(tmp_path / 'a.jsonl.gz')), GzipJsonlSink)
+        assert isinstance(open_sink(str(tmp_path / 'a.jsonl')), JsonlSink)
+        with pytest.raises(ValueError):
+            open_sink(str(tmp_path / 'a.out'), format='xml')
+
+    def test_existing_file_is_not_overwritten_by_default(self, tmp_path):
+        """Test that mode 'x' refuses an existing file before anything is buffered"""
+        path = tmp_path / 'out.jsonl'
+        path.write_text('{"url": "kept"}\n')
+        with pytest.raises(FileExistsError):
+            JsonlSink(str(path))
+        with pytest.raises(ValueError):
+            JsonlSink(str(tmp_path / 'new.jsonl'), mode='r')
+
+        with JsonlSink(str(path), mode='w') as sink:
+            sink.write({"url": "new"})
+        assert path.read_text() == '{"url": "new"}\n'
+
+    @pytest.mark.parametrize("name", ['out.jsonl', 'out.jsonl.gz'])
+    def test_append_mode(self, tmp_path, name):
+        """Test that a second run adds to the existing output"""
+        path = tmp_path / name
+        for _ in range(2):
+            with open_sink(str(path), flush_size=4, mode='a') as sink:
+                sink.write_many(records(5))
+
+        opener = gzip.open if name.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            assert len(f.read().splitlines()) == 10
+
+    def test_csv_append_keeps_one_header(self, tmp_path):
+        """Test that appending to a CSV reuses its header instead of writing another"""
+        path = tmp_path / 'out.csv'
+        with CsvSink(str(path)) as sink:
+            sink.write_many(records(2))
+        with CsvSink(str(path), mode='a') as sink:
+            sink.write({"title": "Appended", "url": "https://example.com/x"})
+
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 3
+        assert rows[2] == {"url": "https://example.com/x", "title": "Appended", "tags": ""}
+
+    def test_csv_rejects_unknown_keys(self, tmp_path):
+        """Test that keys missing from the header fail instead of being dropped"""
+        path = tmp_path / 'out.csv'
+        sink = CsvSink(str(path), flush_size=2)
+        sink.write({"url": "a"})
+        with pytest.raises(ValueError, match='extra'):
+            sink.write({"url": "b", "extra": 1})
+        assert path.read_text() == ''  # Nothing of the failed batch, not even the header, was written
+
+        with CsvSink(str(tmp_path / 'ignore.csv'), flush_size=1, extrasaction='ignore') as sink:
+            sink.write_many([{"url": "a"}, {"url": "b", "extra": 1}])
+        assert (tmp_path / 'ignore.csv').read_text().splitlines() == ['url', 'a', 'b']
+
+    def test_sink_needs_write_batch(self, tmp_path):
+        """Test that RecordSink is abstract"""
+        with pytest.raises(TypeError):
+            RecordSink(str(tmp_path / 'out.txt'))
+
+    def test_sink_from_config(self, tmp_path):
+        """Test creating a sink from the output config section"""
+        config_path = tmp_path / 'config.json'
+        config_path.write_text(json.dumps({
+            "output": {"path": str(tmp_path / 'results.csv'), "flush_size": 5, "rotate_mb": 1}
+        }))
+        sink = sink_from_config(Config(str(config_path)))
+
+        assert isinstance(sink, CsvSink)
+        assert sink.flush_size == 5
+        assert sink.rotate_bytes == 1024 * 1024
+        assert sink.mode == 'x'
+
+
+if __name__ == "__main__":
+    # Run tests if script is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+
+import pytest
+import gzip
+import io
+import sys
+import pathlib
+import tracemalloc
+from datetime import datetime, timezone
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+from src.sitemap import SitemapReader, SitemapState, _ChunkStream, iter_sitemap, parse_lastmod
+from tests.local_server import LocalServer
+
+URLSET = ('<?xml version="1.0" encoding="UTF-8"?>'
+          '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+          '<url><loc> https://example.com/a </loc><lastmod>2025-01-31</lastmod><priority>0.5</priority></url>'
+          '<url><loc>https://example.com/b</loc></url>'
+          '<url><lastmod>2025-01-31</lastmod></url>'
+          '</urlset>').encode('utf-8')
+
+
+def _generated_sitemap(n: int):
+    """Sitemap of n URLs produced on the fly, never held in memory as a whole"""
+    yield b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+    for start in range(0, n, 1000):
+        yield b''.join(b'<url><loc>https://example.com/%d</loc></url>' % i for i in range(start, min(start + 1000, n)))
+    yield b'</urlset>'
+
+
+class TestParsing:
+    """Test suite for sitemap parsing"""
+
+    def test_parse_lastmod_formats(self):
+        """Test W3C datetime precisions and time zones"""
+        assert parse_lastmod('2025-01-31') == datetime(2025, 1, 31, tzinfo=timezone.utc)
+        assert parse_lastmod('2025-01-31T10:00:00Z') == datetime(2025, 1, 31, 10, tzinfo=timezone.utc)
+        assert parse_lastmod('2025-01-31T12:00:00+02:00') == datetime(2025, 1, 31, 10, tzinfo=timezone.utc)
+        assert parse_lastmod('2025-01') == datetime(2025, 1, 1, tzinfo=timezone.utc)
+        assert parse_lastmod('2025') == datetime(2025, 1, 1, tzinfo=timezone.utc)
+        assert parse_lastmod('yesterday') is None
+        assert parse_lastmod(None) is None
+
+    def test_iter_sitemap_plain_and_gzip(self):
+        """Test that entries are read from plain and compressed sitemaps alike"""
+        expected = [('url', 'https://example.com/a', datetime(2025, 1, 31, tzinfo=timezone.utc)),
+                    ('url', 'https://example.com/b', None)]
+        assert list(iter_sitemap(io.BytesIO(URLSET))) == expected
+        assert list(iter_sitemap(io.BytesIO(gzip.compress(URLSET)))) == expected
+
+    def test_large_sitemap_streams_in_constant_memory(self):
+        """Test that memory stays flat however many entries a sitemap has"""
+        tracemalloc.start()
+        try:
+            count = sum(1 for _ in iter_sitemap(_ChunkStream(_generated_sitemap(50000))))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert count == 50000
+        assert peak < 2 * 1024 * 1024
+
+
+class TestSitemapReader:
+    """Test SitemapReader against a local server"""
+
+    def test_discover(self):
+        """Test robots.txt sitemaps win over known paths"""
+        reader = SitemapReader(known_paths=['/sitemap.xml', '/sitemap_index.xml'])
+        assert reader.discover('https://example.com/page', ['/s1.xml', 'https://cdn.example/s2.xml']) == [
+            'https://example.com/s1.xml', 'https://cdn.example/s2.xml']
+        assert reader.discover('https://example.com/page') == [
+            'https://example.com/sitemap.xml', 'https://example.com/sitemap_index.xml']
+
+    def test_index_gzip_and_lastmod_filter(self):
+        """Test descending into an index, skipping old pages and whole old child sitemaps"""
+        with LocalServer() as server:
+            reader = SitemapReader()
+            everything = [e.url for e in reader.entries([f"{server.base_url}/sitemap.xml"])]
+
+            reader = SitemapReader()
+            since = datetime(2024, 1, 1, tzinfo=timezone.utc)
+            changed = [e.url for e in reader.entries([f"{server.base_url}/sitemap.xml"], since)]
+            hits = dict(server.hits)
+
+        base = server.base_url
+        assert everything == [f"{base}/title/new", f"{base}/title/old", f"{base}/title/unknown",
+                              f"{base}/title/archived"]
+        assert changed == [f"{base}/title/new", f"{base}/title/unknown"]
+        assert (reader.skipped_urls, reader.skipped_sitemaps) == (1, 1)
+        assert hits['/sitemap-old.xml'] == 1  # Only read by the unfiltered run
+
+    def test_missing_sitemap_is_skipped(self):
+        """Test that a 404 sitemap yields nothing"""
+        with LocalServer() as server:
+            reader = SitemapReader()
+            assert list(reader.entries([f"{server.base_url}/nope.xml"])) == []
+
+        assert (reader.read, reader.missing, reader.failed) == (0, 1, 0)
+        assert not reader.complete
+
+    def test_failed_sitemaps_are_reported(self):
+        """Test that server errors leave the read incomplete"""
+        with LocalServer() as server:
+            reader = SitemapReader()
+            entries = list(reader.entries([f"{server.base_url}/sitemap-old.xml", f"{server.base_url}/error"]))
+
+        assert len(entries) == 1
+        assert (reader.read, reader.failed) == (1, 1)
+        assert not reader.complete
+
+    def test_date_only_lastmod_on_since_day_is_kept(self):
+        """Test that since is compared at the day precision of date-only lastmod values"""
+        sitemap = (b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                   b'<url><loc>https://example.com/today</loc><lastmod>2025-01-31</lastmod></url>'
+                   b'<url><loc>https://example.com/yesterday</loc><lastmod>2025-01-30</lastmod></url>'
+                   b'</urlset>')
+
+        class Response(io.BytesIO):
+            status_code = 200
+
+            def iter_content(self, chunk_size):
+                return iter(lambda: self.read(chunk_size), b'')
+
+        reader = SitemapReader(get=lambda url, **kwargs: Response(sitemap))
+        since = datetime(2025, 1, 31, 15, 30, tzinfo=timezone.utc)
+        assert [e.url for e in reader.entries(['https://example.com/sitemap.xml'], since)] == [
+            'https://example.com/today']
+
+
+class TestScraperSitemaps:
+    """Test WebScraper.sitemap_entries end to end"""
+
+    def test_incremental_runs_skip_unchanged_pages(self, scraper_factory, tmp_path):
+        """Test that the second run only yields pages changed since the first"""
+        with LocalServer() as server:
+            scraper = scraper_factory(server.base_url,
+                                      sitemap={"incremental": True, "state_path": str(tmp_path / 'state.json')})
+            first = [e.url for e in scraper.sitemap_entries()]
+            assert scraper.commit_sitemap_state() == [server.base_url]
+            second = [e.url for e in scraper.sitemap_entries()]
+            titles = dict(scraper.check_many(e.url for e in scraper.sitemap_entries()))
+
+        assert len(first) == 4
+        assert second == [f"{server.base_url}/title/new", f"{server.base_url}/title/unknown"]
+        assert titles == {f"{server.base_url}/title/new": "new", f"{server.base_url}/title/unknown": "unknown"}
+        assert SitemapState(str(tmp_path / 'state.json')).last_run(server.base_url) is not None
+
+    def test_state_waits_for_commit(self, scraper_factory, tmp_path):
+        """Test that reading the sitemaps alone does not mark the site as done"""
+        state = SitemapState(str(tmp_path / 'state.json'))
+        with LocalServer() as server:
+            scraper = scraper_factory(server.base_url,
+                                      sitemap={"incremental": True, "state_path": state.path})
+            first = [e.url for e in scraper.sitemap_entries()]
+            assert state.last_run(server.base_url) is None
+            assert [e.url for e in scraper.sitemap_entries()] == first
+
+    def test_failed_pages_are_not_committed(self, scraper_factory, tmp_path):
+        """Test that a site with a failed page is read in full next time"""
+        state = SitemapState(str(tmp_path / 'state.json'))
+        with LocalServer() as server:
+            scraper = scraper_factory(server.base_url,
+                                      sitemap={"incremental": True, "state_path": state.path})
+            urls = [e.url for e in scraper.sitemap_entries()]
+            assert scraper.commit_sitemap_state(failed_urls=[urls[0]]) == []
+
+        assert state.last_run(server.base_url) is None
+        assert scraper.commit_sitemap_state() == []  # The pending read was consumed
+
+    def test_failed_read_does_not_mark_state(self, scraper_factory, tmp_path):
+        """Test that a site whose sitemaps could not be fetched is read in full next time"""
+        # Nothing listens on port 9, so robots.txt and every sitemap fail
+        scraper = scraper_factory("http://127.0.0.1:9",
+                                  sitemap={"incremental": True, "state_path": str(tmp_path / 'state.json')})
+        assert list(scraper.sitemap_entries()) == []
+        assert scraper.commit_sitemap_state() == []
+        assert SitemapState(str(tmp_path / 'state.json')).last_run("http://127.0.0.1:9") is None
+
+
+if __name__ == "__main__":
+    # Run tests if script is executed directly
+    pytest.main([__file__, "-v"])